@@ -19,23 +19,22 @@
 #    OTHER AUTHORS   - MACROSCOPIC CHANGES
 from __future__ import annotations
 
-import json
 from os.path import dirname
 from os.path import join
+from time import perf_counter
 
 import streamlit as st
-from PIL import Image
+from gemseo_web_study.warmup import report_first_render
+from gemseo_web_study.warmup import start_warm_up
 
-# this is to keep the widget values between pages
-for k, v in st.session_state.items():
-    st.session_state[k] = v
+start_time = perf_counter()
+start_warm_up()
 
 st.set_page_config(page_title="GEMSEO Study", layout="wide")
 
 st.title("GEMSEO Study analysis and prototyping")
 
-logo = Image.open(join(dirname(__file__), "logo-small.png"))
-st.image(logo, width=300)
+st.image(join(dirname(__file__), "logo-small.png"), width=300)
 
 st.markdown(
     """
@@ -65,27 +64,60 @@ st.subheader("Saving and loading a study")
 st.markdown(
     """
     You can download the study configuration as a JSON text file and load it in the future.
+    The file only contains the disciplines and the scenario definition;
+    it can be compressed with gzip.
     """
 )
-# Handle data saving
 
 
-uploaded_file = st.file_uploader("Load existing study")
-if uploaded_file is not None:
-    state = json.loads(uploaded_file.read())
-    for k, v in state.items():
-        st.session_state[k] = v
+def load_study() -> None:
+    """Loads the study from the uploaded study file.
 
-download_data = {}
+    The state of the study of the session is replaced,
+    from which the pages initialize their widgets.
+    """
+    from gemseo_web_study import StudyState
+    from gemseo_web_study.study_file import read_study
+
+    uploaded_file = st.session_state["Study file"]
+    if uploaded_file is None:
+        return
+
+    try:
+        study = read_study(uploaded_file)
+    except ValueError as err:
+        st.error(f"The study cannot be loaded: {err}")
+        return
 
+    state = st.session_state["study_state"] = StudyState(study)
+    state.update(disciplines_editor="Table")
+
+
+st.file_uploader(
+    "Load existing study",
+    type=["json", "gz"],
+    key="Study file",
+    on_change=load_study,
+)
+
+
+def handle_study_download() -> None:
+    """Handles the download of the study file.
+
+    The modules of the study are imported here
+    so that the warm-up starts before importing them.
+    """
+    from gemseo_web_study.study_file import dump_study
+    from pages._common.helpers import get_study
+
+    compress = st.checkbox("Compress the study file", value=True)
+    st.download_button(
+        "Save current study",
+        dump_study(get_study(), compress=compress),
+        file_name="gemseo_study.json.gz" if compress else "gemseo_study.json",
+    )
 
-def update_download_data():
-    download_data.clear()
-    for k, v in st.session_state.items():
-        if k.startswith("#"):
-            download_data[k] = v
 
+handle_study_download()
 
-update_download_data()
-st.download_button("Save current study", json.dumps(download_data), file_name="gemseo_study.json",
-                   on_click=update_download_data)
+report_first_render("welcome", perf_counter() - start_time)
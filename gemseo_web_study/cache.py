@@ -0,0 +1,239 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""Caches shared by all the sessions of a server process.
+
+The entries are identified by a canonical hash of the descriptions of the disciplines
+so that the sessions opening the same study share the same artifacts.
+
+The budget of the caches can be set with the environment variables
+``GEMSEO_WEB_STUDY_CACHE_MAX_ENTRIES`` (number of entries per cache)
+and ``GEMSEO_WEB_STUDY_CACHE_MAX_MEMORY`` (memory per cache in MiB).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Final
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+
+MAX_ENTRIES: Final[int] = int(os.environ.get("GEMSEO_WEB_STUDY_CACHE_MAX_ENTRIES", 64))
+"""The default maximum number of entries of a cache."""
+
+MAX_MEMORY: Final[int] = (
+    int(os.environ.get("GEMSEO_WEB_STUDY_CACHE_MAX_MEMORY", 512)) * 2**20
+)
+"""The default maximum memory of a cache in bytes."""
+
+
+def hash_disc_desc(disc_desc: Iterable[Iterable]) -> str:
+    """Compute the canonical hash of the descriptions of disciplines.
+
+    The order of the disciplines is taken into account
+    as it defines the order of the disciplines in the diagrams
+    while the order of the input and output names of a discipline is not.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+
+    Returns:
+        The hash of the descriptions of the disciplines.
+    """
+    canonical_desc = [
+        (name, sorted(input_names), sorted(output_names))
+        for name, input_names, output_names in disc_desc
+    ]
+    return hashlib.sha256(
+        json.dumps(canonical_desc, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def estimate_disciplines_size(disc_desc: Iterable[Iterable]) -> int:
+    """Estimate roughly the memory used by the disciplines created from descriptions.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+
+    Returns:
+        The estimated memory in bytes.
+    """
+    size = 0
+    for _, input_names, output_names in disc_desc:
+        n_inputs = len(input_names)
+        n_outputs = len(output_names)
+        # The discipline itself, the grammar elements and the coefficients matrix.
+        size += 10_000 + 2_000 * (n_inputs + n_outputs) + 8 * n_inputs * n_outputs
+
+    return size
+
+
+CACHES: Final[dict[str, LRUCache]] = {}
+"""The named caches of the process bound to their names."""
+
+
+class LRUCache:
+    """A thread-safe cache evicting the least recently used entries.
+
+    The cache is bounded by a number of entries and by a memory budget,
+    the size of an entry being given when it is stored.
+    """
+
+    hits: int
+    """The number of times a requested entry was in the cache."""
+
+    misses: int
+    """The number of times a requested entry was not in the cache."""
+
+    __entries: OrderedDict[Hashable, tuple[Any, int]]
+    """The values and sizes of the entries, from the least to the most recently used."""
+
+    __lock: Lock
+    """The lock protecting the entries."""
+
+    __max_entries: int
+    """The maximum number of entries."""
+
+    __max_memory: int
+    """The maximum memory in bytes."""
+
+    __memory: int
+    """The memory used by the entries in bytes."""
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        max_memory: int = MAX_MEMORY,
+        name: str = "",
+    ) -> None:
+        """
+        Args:
+            max_entries: The maximum number of entries.
+            max_memory: The maximum memory in bytes.
+            name: The name of the cache.
+                If not empty, the cache is registered in :attr:`.CACHES`.
+        """  # noqa: D205 D212 D415
+        if name:
+            CACHES[name] = self
+
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+        self.__max_entries = max_entries
+        self.__max_memory = max_memory
+        self.__memory = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__entries
+
+    @property
+    def memory(self) -> int:
+        """The memory used by the entries in bytes."""
+        return self.__memory
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value of an entry and mark it as the most recently used.
+
+        Args:
+            key: The key of the entry.
+            default: The value to return if the entry is not in the cache.
+
+        Returns:
+            The value of the entry.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self.__entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """Store an entry and evict the least recently used ones if needed.
+
+        An entry larger than the memory budget is not stored.
+
+        Args:
+            key: The key of the entry.
+            value: The value of the entry.
+            size: The size of the entry in bytes.
+        """
+        if size > self.__max_memory:
+            return
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__memory -= self.__entries.pop(key)[1]
+
+            self.__entries[key] = (value, size)
+            self.__memory += size
+            while (
+                len(self.__entries) > self.__max_entries
+                or self.__memory > self.__max_memory
+            ):
+                self.__memory -= self.__entries.popitem(last=False)[1][1]
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Any], size: int = 0
+    ) -> Any:
+        """Return the value of an entry, computing and storing it if it is missing.
+
+        The value is computed outside the lock
+        so that a long computation does not block the other sessions.
+
+        Args:
+            key: The key of the entry.
+            compute: The function computing the value.
+            size: The size of the entry in bytes.
+
+        Returns:
+            The value of the entry.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.set(key, value, size)
+
+        return value
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__memory = 0
+
+
+COUPLING_STRUCTURES: Final[LRUCache] = LRUCache(name="coupling_structures")
+"""The coupling structures bound to the hashes of the descriptions of disciplines."""
@@ -0,0 +1,207 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The command line interface rendering the diagrams of study files.
+
+For each study file,
+the N2 chart (PNG image and interactive HTML file)
+and the XDSM diagram (HTML file)
+are written to a subdirectory of the output directory named after the study file;
+the names of the study files must be unique once their extensions are removed.
+The files of a study are written once all its diagrams are rendered,
+so that a study failing to render leaves no partial output.
+The study files are processed in parallel processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from gemseo_web_study.study_file import read_study
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_study_name(file_path: Path) -> str:
+    """Return the name of a study file without its extensions.
+
+    Args:
+        file_path: The path to the study file.
+
+    Returns:
+        The name of the study file without its format and compression extensions.
+    """
+    return file_path.stem if file_path.suffix != ".gz" else Path(file_path.stem).stem
+
+
+def render_study(
+    file_path: Path, output_directory: Path, n2: bool = True, xdsm: bool = True
+) -> list[Path]:
+    """Render the diagrams of a study file.
+
+    The XDSM diagram is not rendered
+    when the study has no objective or no design variables.
+    No file is written when a diagram cannot be rendered.
+
+    Args:
+        file_path: The path to the study file.
+        output_directory: The directory in which to create the directory of the study.
+        n2: Whether to render the N2 chart.
+        xdsm: Whether to render the XDSM diagram.
+
+    Returns:
+        The paths to the written files.
+    """
+    study = read_study(file_path)
+    contents = {}
+    if n2:
+        contents["n2.png"] = study.get("n2_image")
+        contents["n2.html"] = study.get("n2_html").encode("utf-8")
+
+    if xdsm and study.inputs["objective"] and study.inputs["design_variables"]:
+        contents["xdsm.html"] = study.get("xdsm_html").encode("utf-8")
+
+    directory_path = output_directory / get_study_name(file_path)
+    directory_path.mkdir(parents=True, exist_ok=True)
+    file_paths = []
+    for file_name, content in contents.items():
+        file_path = directory_path / file_name
+        file_path.write_bytes(content)
+        file_paths.append(file_path)
+
+    return file_paths
+
+
+def render_studies(
+    file_paths: Sequence[Path],
+    output_directory: Path,
+    n2: bool = True,
+    xdsm: bool = True,
+    n_jobs: int = 1,
+) -> dict[Path, list[Path] | Exception]:
+    """Render the diagrams of study files in parallel processes.
+
+    Args:
+        file_paths: The paths to the study files.
+        output_directory: The directory in which to create the directories of the
+            studies.
+        n2: Whether to render the N2 charts.
+        xdsm: Whether to render the XDSM diagrams.
+        n_jobs: The number of processes.
+
+    Returns:
+        For each study file,
+        either the paths to the written files or the error raised when rendering.
+
+    Raises:
+        ValueError: When study files have the same name once their extensions
+            are removed, as they would be written to the same directory.
+    """
+    file_paths = list(dict.fromkeys(file_paths))
+    names = {}
+    for file_path in file_paths:
+        names.setdefault(get_study_name(file_path), []).append(str(file_path))
+
+    duplicates = [paths for paths in names.values() if len(paths) > 1]
+    if duplicates:
+        msg = "The study files must have different names: " + "; ".join(
+            ", ".join(paths) for paths in duplicates
+        )
+        raise ValueError(msg)
+
+    results = {}
+    with ProcessPoolExecutor(n_jobs) as executor:
+        futures = {
+            file_path: executor.submit(
+                render_study, file_path, output_directory, n2, xdsm
+            )
+            for file_path in file_paths
+        }
+        for file_path, future in futures.items():
+            error = future.exception()
+            results[file_path] = future.result() if error is None else error
+
+    return results
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    """Render the diagrams of study files.
+
+    Args:
+        args: The command line arguments.
+            If ``None``, use the arguments of the command line.
+
+    Returns:
+        The exit status, 1 if a study file could not be rendered.
+    """
+    parser = argparse.ArgumentParser(
+        prog="gemseo-web-study",
+        description="Render the N2 and XDSM diagrams of GEMSEO study files.",
+    )
+    parser.add_argument("studies", nargs="+", type=Path, help="The study files.")
+    parser.add_argument(
+        "-o",
+        "--output-directory",
+        type=Path,
+        default=Path(),
+        help="The directory in which to write a directory per study.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="The number of parallel processes.",
+    )
+    parser.add_argument("--no-n2", action="store_true", help="Do not render the N2.")
+    parser.add_argument(
+        "--no-xdsm", action="store_true", help="Do not render the XDSM."
+    )
+    options = parser.parse_args(args)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)8s - %(message)s")
+
+    try:
+        results = render_studies(
+            options.studies,
+            options.output_directory,
+            n2=not options.no_n2,
+            xdsm=not options.no_xdsm,
+            n_jobs=max(1, min(options.jobs, len(options.studies))),
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    n_failures = 0
+    for file_path, result in results.items():
+        if isinstance(result, Exception):
+            n_failures += 1
+            LOGGER.error("%s: %s", file_path, result)
+        else:
+            LOGGER.info("%s: %s", file_path, ", ".join(map(str, result)))
+
+    n_successes = len(results) - n_failures
+    LOGGER.info("%s studies rendered, %s failed.", n_successes, n_failures)
+    return int(n_failures > 0)
@@ -0,0 +1,518 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The coupling graph of disciplines built from their input and output names only.
+
+Contrary to :class:`~gemseo.core.coupling_structure.MDOCouplingStructure`,
+no discipline is instantiated:
+the producer/consumer relations are stored as sparse matrices
+and the coupling analysis is made of vectorized operations,
+which scales to thousands of disciplines.
+
+The definitions of the strong and weak couplings are the ones of GEMSEO.
+
+A coupling graph can be updated when the inputs and outputs of a discipline change:
+only the edges of this discipline
+and the strongly connected components containing it before and after the change
+are recomputed.
+"""
+
+from __future__ import annotations
+
+from copy import copy
+from typing import TYPE_CHECKING
+
+from numpy import append
+from numpy import arange
+from numpy import array
+from numpy import bincount
+from numpy import concatenate
+from numpy import cumsum
+from numpy import diff
+from numpy import flatnonzero
+from numpy import full
+from numpy import int64
+from numpy import intersect1d
+from numpy import isin
+from numpy import lexsort
+from numpy import ones
+from numpy import repeat
+from numpy import setdiff1d
+from numpy import unique
+from scipy.sparse import coo_matrix
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order
+from scipy.sparse.csgraph import connected_components
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from numpy.typing import NDArray
+
+Coupling = tuple[str, str, str]
+"""A coupling: the name of the producer, the name of the consumer and the name of
+the variable."""
+
+
+class CouplingGraph:
+    """The coupling graph of disciplines built from their names only.
+
+    The disciplines are identified by their positions in the descriptions
+    and the variables by their positions in :attr:`.variable_names`.
+    """
+
+    added_couplings: list[Coupling]
+    """The couplings added by the update creating this graph, if any."""
+
+    adjacency: csr_matrix
+    """The number of variables produced by a discipline and consumed by another one.
+
+    The row ``i`` is the producer and the column ``j`` the consumer;
+    the diagonal contains the self-couplings.
+    """
+
+    discipline_names: list[str]
+    """The names of the disciplines."""
+
+    group_labels: NDArray[int]
+    """The index of the strongly connected component of each discipline."""
+
+    inputs: csr_matrix
+    """Whether a discipline consumes a variable, shaped as disciplines by variables."""
+
+    n_groups: int
+    """The number of strongly connected components."""
+
+    outputs: csr_matrix
+    """Whether a discipline produces a variable, shaped as disciplines by variables."""
+
+    removed_couplings: list[Coupling]
+    """The couplings removed by the update creating this graph, if any."""
+
+    variable_names: NDArray[str]
+    """The names of the variables.
+
+    They are sorted when the graph is created
+    and the new ones are appended when it is updated.
+    """
+
+    __variable_indices: dict[str, int] | None
+    """The positions of the variables in :attr:`.variable_names`, if computed."""
+
+    def __init__(self, disc_desc: Iterable[Iterable]) -> None:
+        """
+        Args:
+            disc_desc: The descriptions of the disciplines,
+                each one being the name, the input names and the output names.
+        """  # noqa: D205 D212 D415
+        disc_desc = list(disc_desc)
+        n_disciplines = len(disc_desc)
+        self.discipline_names = [name for name, _, _ in disc_desc]
+        input_names = [list(names) for _, names, _ in disc_desc]
+        output_names = [list(names) for _, _, names in disc_desc]
+        n_inputs = array([len(names) for names in input_names], dtype=int64)
+        n_outputs = array([len(names) for names in output_names], dtype=int64)
+        flat_inputs = [name for names in input_names for name in names]
+        flat_outputs = [name for names in output_names for name in names]
+        self.variable_names, positions = unique(
+            array(flat_inputs + flat_outputs, dtype=str), return_inverse=True
+        )
+        positions = positions.ravel()
+        n_variables = len(self.variable_names)
+        shape = (n_disciplines, n_variables)
+        self.inputs = self.__create_incidence_matrix(
+            repeat(range(n_disciplines), n_inputs),
+            positions[: len(flat_inputs)],
+            shape,
+        )
+        self.outputs = self.__create_incidence_matrix(
+            repeat(range(n_disciplines), n_outputs),
+            positions[len(flat_inputs) :],
+            shape,
+        )
+        self.adjacency = (self.outputs @ self.inputs.T).tocsr()
+        self.n_groups, self.group_labels = connected_components(
+            self.adjacency, directed=True, connection="strong"
+        )
+        self.added_couplings = []
+        self.removed_couplings = []
+        self.__variable_indices = None
+
+    @staticmethod
+    def __create_incidence_matrix(
+        rows: NDArray[int], columns: NDArray[int], shape: tuple[int, int]
+    ) -> csr_matrix:
+        """Create a boolean incidence matrix from the positions of its non-zeros.
+
+        Args:
+            rows: The row indices of the non-zeros.
+            columns: The column indices of the non-zeros.
+            shape: The shape of the matrix.
+
+        Returns:
+            The incidence matrix, whose duplicated entries are merged.
+        """
+        matrix = csr_matrix(
+            (ones(len(rows), dtype=int64), (rows, columns)), shape=shape
+        )
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return matrix
+
+    @property
+    def n_disciplines(self) -> int:
+        """The number of disciplines."""
+        return len(self.discipline_names)
+
+    @property
+    def self_coupled(self) -> NDArray[bool]:
+        """Whether a discipline has an input which is also one of its outputs."""
+        return self.adjacency.diagonal() > 0
+
+    @property
+    def strongly_coupled(self) -> NDArray[bool]:
+        """Whether a discipline lies in a cycle of the coupling graph.
+
+        A self-coupled discipline is strongly coupled.
+        """
+        group_sizes = bincount(self.group_labels, minlength=self.n_groups)
+        return (group_sizes[self.group_labels] > 1) | self.self_coupled
+
+    @property
+    def strongly_coupled_groups(self) -> list[NDArray[int]]:
+        """The indices of the disciplines of each group of strongly coupled ones.
+
+        The groups are sorted by their first discipline.
+        """
+        indices = flatnonzero(self.strongly_coupled)
+        labels = self.group_labels[indices]
+        _, first_positions = unique(labels, return_index=True)
+        return [indices[labels == label] for label in labels[sorted(first_positions)]]
+
+    @property
+    def group_indices(self) -> NDArray[int]:
+        """The index of the group of strongly coupled disciplines of each discipline.
+
+        The groups are indexed as in :attr:`.strongly_coupled_groups`;
+        the index of a discipline which is not strongly coupled is -1.
+        """
+        group_indices = full(self.n_disciplines, -1)
+        for index, group in enumerate(self.strongly_coupled_groups):
+            group_indices[group] = index
+
+        return group_indices
+
+    @property
+    def all_couplings(self) -> list[str]:
+        """The inputs of disciplines that are also outputs of disciplines."""
+        is_coupling = (self.inputs.getnnz(axis=0) > 0) & (
+            self.outputs.getnnz(axis=0) > 0
+        )
+        return sorted(self.variable_names[is_coupling].tolist())
+
+    @property
+    def strong_couplings(self) -> list[str]:
+        """The variables produced and consumed in a same group of strongly coupled
+        disciplines."""  # noqa: D205 D209
+        strongly_coupled = self.strongly_coupled
+        groups = csr_matrix(
+            (
+                ones(strongly_coupled.sum(), dtype=int64),
+                (
+                    flatnonzero(strongly_coupled),
+                    self.group_labels[strongly_coupled],
+                ),
+            ),
+            shape=(self.n_disciplines, self.n_groups),
+        )
+        produced = self.outputs.T @ groups
+        consumed = self.inputs.T @ groups
+        is_strong = produced.multiply(consumed).getnnz(axis=1) > 0
+        return sorted(self.variable_names[is_strong].tolist())
+
+    @property
+    def weak_couplings(self) -> list[str]:
+        """The outputs of the disciplines that are not strongly coupled."""
+        is_weak = self.outputs[~self.strongly_coupled].getnnz(axis=0) > 0
+        return sorted(self.variable_names[is_weak].tolist())
+
+    @property
+    def couplings(self) -> tuple[NDArray[int], NDArray[int], NDArray[int]]:
+        """The couplings of the disciplines, including the self-couplings.
+
+        They are the indices of the producers, of the consumers and of the variables,
+        sorted by producer, consumer and variable.
+        """
+        outputs = self.outputs.tocsc()
+        inputs = self.inputs.tocsc()
+        # Each output of a variable is paired with each input of this variable.
+        output_variables = repeat(
+            arange(len(self.variable_names)), diff(outputs.indptr)
+        )
+        n_pairs = diff(inputs.indptr)[output_variables]
+        producers = repeat(outputs.indices, n_pairs)
+        variables = repeat(output_variables, n_pairs)
+        pair_positions = arange(n_pairs.sum()) - repeat(
+            cumsum(n_pairs) - n_pairs, n_pairs
+        )
+        consumers = inputs.indices[inputs.indptr[variables] + pair_positions]
+        order = lexsort((variables, consumers, producers))
+        return producers[order], consumers[order], variables[order]
+
+    @property
+    def n2_matrix(self) -> csr_matrix:
+        """The number of coupling variables in each cell of the N2 chart.
+
+        The diagonal, which represents the disciplines, is empty.
+        """
+        n2_matrix = self.adjacency.tolil()
+        n2_matrix.setdiag(0)
+        n2_matrix = n2_matrix.tocsr()
+        n2_matrix.eliminate_zeros()
+        return n2_matrix
+
+    def get_coupling_variables(self, source: int, target: int) -> list[str]:
+        """Return the variables produced by a discipline and consumed by another one.
+
+        Args:
+            source: The index of the discipline producing the variables.
+            target: The index of the discipline consuming the variables.
+
+        Returns:
+            The names of the coupling variables.
+        """
+        return sorted(
+            self.variable_names[
+                intersect1d(
+                    self.outputs[source].indices,
+                    self.inputs[target].indices,
+                    assume_unique=True,
+                )
+            ].tolist()
+        )
+
+    def __get_couplings(
+        self, index: int
+    ) -> tuple[NDArray[int], NDArray[int], NDArray[int]]:
+        """Return the couplings of a discipline with the others and itself.
+
+        Args:
+            index: The index of the discipline.
+
+        Returns:
+            The indices of the producers, of the consumers and of the variables,
+            a self-coupling appearing once.
+        """
+        outputs = self.outputs.indices
+        inputs = self.inputs.indices
+        start, end = self.outputs.indptr[index : index + 2]
+        is_consumed = isin(inputs, outputs[start:end])
+        consumers = self.__get_row_indices(self.inputs)[is_consumed]
+        start, end = self.inputs.indptr[index : index + 2]
+        is_produced = isin(outputs, inputs[start:end])
+        producers = self.__get_row_indices(self.outputs)[is_produced]
+        is_other = producers != index
+        producers = producers[is_other]
+        return (
+            concatenate((full(len(consumers), index), producers)),
+            concatenate((consumers, full(len(producers), index))),
+            concatenate((inputs[is_consumed], outputs[is_produced][is_other])),
+        )
+
+    @staticmethod
+    def __get_row_indices(matrix: csr_matrix) -> NDArray[int]:
+        """Return the row indices of the non-zeros of a sparse matrix.
+
+        Args:
+            matrix: The sparse matrix.
+
+        Returns:
+            The row indices of the non-zeros.
+        """
+        return repeat(arange(matrix.shape[0]), diff(matrix.indptr))
+
+    def update_discipline(
+        self,
+        index: int,
+        input_names: Iterable[str],
+        output_names: Iterable[str],
+        name: str | None = None,
+    ) -> CouplingGraph:
+        """Create the coupling graph resulting from the change of a discipline.
+
+        This graph is not modified.
+        Only the edges of the discipline are recomputed
+        as well as the strongly connected components containing it
+        before and after the change.
+        The couplings added and removed by the change are stored
+        in :attr:`.added_couplings` and :attr:`.removed_couplings`.
+
+        Args:
+            index: The index of the discipline.
+            input_names: The new input names of the discipline.
+            output_names: The new output names of the discipline.
+            name: The new name of the discipline.
+                If ``None``, do not change the name.
+
+        Returns:
+            The updated coupling graph.
+        """
+        graph = copy(self)
+        if name is not None:
+            graph.discipline_names = list(self.discipline_names)
+            graph.discipline_names[index] = name
+
+        input_names = list(input_names)
+        output_names = list(output_names)
+        if self.__variable_indices is None:
+            self.__variable_indices = {
+                variable_name: position
+                for position, variable_name in enumerate(self.variable_names.tolist())
+            }
+
+        new_names = [
+            variable_name
+            for variable_name in dict.fromkeys(input_names + output_names)
+            if variable_name not in self.__variable_indices
+        ]
+        if new_names:
+            # The positions of the variables of this graph must not change.
+            variable_indices = graph.__variable_indices = dict(self.__variable_indices)
+            for variable_name in new_names:
+                variable_indices[variable_name] = len(variable_indices)
+
+            graph.variable_names = append(self.variable_names, new_names)
+        else:
+            variable_indices = self.__variable_indices
+
+        n_variables = len(graph.variable_names)
+        graph.inputs = self.__replace_row(
+            self.inputs,
+            index,
+            [variable_indices[variable_name] for variable_name in input_names],
+            n_variables,
+        )
+        graph.outputs = self.__replace_row(
+            self.outputs,
+            index,
+            [variable_indices[variable_name] for variable_name in output_names],
+            n_variables,
+        )
+
+        # Replace the row and the column of the discipline in the adjacency matrix.
+        adjacency = self.adjacency.tocoo()
+        is_kept = (adjacency.row != index) & (adjacency.col != index)
+        producers, consumers, variables = graph.__get_couplings(index)
+        n_disciplines = self.n_disciplines
+        graph.adjacency = coo_matrix(
+            (
+                concatenate((adjacency.data[is_kept], ones(len(producers), int64))),
+                (
+                    concatenate((adjacency.row[is_kept], producers)),
+                    concatenate((adjacency.col[is_kept], consumers)),
+                ),
+            ),
+            shape=(n_disciplines, n_disciplines),
+        ).tocsr()
+
+        # The strongly connected component of the discipline is made of the
+        # disciplines both reachable from it and reaching it;
+        # the rest of its former component is split into components of its own.
+        group = intersect1d(
+            breadth_first_order(graph.adjacency, index, return_predecessors=False),
+            breadth_first_order(
+                graph.adjacency.T.tocsr(), index, return_predecessors=False
+            ),
+        )
+        rest = setdiff1d(
+            flatnonzero(self.group_labels == self.group_labels[index]), group
+        )
+        group_labels = self.group_labels.copy()
+        group_labels[group] = self.n_groups
+        if rest.size:
+            _, rest_labels = connected_components(
+                graph.adjacency[rest][:, rest], directed=True, connection="strong"
+            )
+            group_labels[rest] = self.n_groups + 1 + rest_labels
+
+        _, graph.group_labels = unique(group_labels, return_inverse=True)
+        graph.n_groups = int(graph.group_labels.max()) + 1
+
+        new_couplings = set(
+            zip(producers.tolist(), consumers.tolist(), variables.tolist())
+        )
+        old_couplings = set(
+            zip(*(indices.tolist() for indices in self.__get_couplings(index)))
+        )
+        graph.added_couplings = self.__name_couplings(
+            new_couplings - old_couplings, graph
+        )
+        graph.removed_couplings = self.__name_couplings(
+            old_couplings - new_couplings, self
+        )
+        return graph
+
+    @staticmethod
+    def __name_couplings(
+        couplings: Iterable[tuple[int, int, int]], graph: CouplingGraph
+    ) -> list[Coupling]:
+        """Return the names of couplings.
+
+        Args:
+            couplings: The couplings as the indices of the producer, of the consumer
+                and of the variable.
+            graph: The coupling graph defining the indices.
+
+        Returns:
+            The sorted couplings as names.
+        """
+        discipline_names = graph.discipline_names
+        variable_names = graph.variable_names
+        return sorted(
+            (
+                discipline_names[producer],
+                discipline_names[consumer],
+                str(variable_names[variable]),
+            )
+            for producer, consumer, variable in couplings
+        )
+
+    @staticmethod
+    def __replace_row(
+        matrix: csr_matrix, index: int, columns: list[int], n_columns: int
+    ) -> csr_matrix:
+        """Replace a row of an incidence matrix.
+
+        Args:
+            matrix: The incidence matrix.
+            index: The index of the row.
+            columns: The column indices of the non-zeros of the row.
+            n_columns: The number of columns of the new matrix.
+
+        Returns:
+            The new incidence matrix.
+        """
+        columns = unique(array(columns, dtype=matrix.indices.dtype))
+        start, end = matrix.indptr[index : index + 2]
+        indices = concatenate((matrix.indices[:start], columns, matrix.indices[end:]))
+        indptr = matrix.indptr.copy()
+        indptr[index + 1 :] += len(columns) - (end - start)
+        return csr_matrix(
+            (ones(len(indices), dtype=int64), indices, indptr),
+            shape=(matrix.shape[0], n_columns),
+        )
@@ -0,0 +1,193 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""Import of the descriptions of disciplines from tabular files.
+
+A table has the columns ``name``, ``inputs`` and ``outputs``
+where a cell of the last two columns contains variable names
+separated by commas, semicolons or blanks.
+The supported formats are CSV, Excel and JSON;
+a JSON file contains either a list of records with these keys
+or a list of ``[name, inputs, outputs]`` items.
+The Excel files require the ``excel`` extra,
+i.e. ``pip install gemseo-web-study[excel]``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from importlib.util import find_spec
+from pathlib import Path
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from gemseo_web_study.study import DisciplineDescription
+
+COLUMNS: Final[tuple[str, str, str]] = ("name", "inputs", "outputs")
+"""The names of the columns of a table of disciplines."""
+
+FILE_FORMATS: Final[tuple[str, ...]] = ("csv", "json", "xlsx", "xls")
+"""The supported file formats, identified by their extensions."""
+
+EXCEL_ENGINES: Final[dict[str, str]] = {"xlsx": "openpyxl", "xls": "xlrd"}
+"""The packages reading the Excel file formats."""
+
+_SEPARATOR: Final[re.Pattern] = re.compile(r"[,;\s]+")
+"""The separator of the variable names in a cell."""
+
+
+def split_names(names: str | Iterable[str] | None) -> tuple[str, ...]:
+    """Split the content of a cell into variable names.
+
+    Args:
+        names: Either the variable names or a string of variable names
+            separated by commas, semicolons or blanks.
+
+    Returns:
+        The variable names.
+    """
+    if names is None or names != names:  # noqa: PLR0124 missing cells are NaN.
+        return ()
+
+    if isinstance(names, str):
+        return tuple(name for name in _SEPARATOR.split(names) if name)
+
+    return tuple(str(name).strip() for name in names if str(name).strip())
+
+
+def join_names(names: Iterable[str]) -> str:
+    """Join variable names into the content of a cell.
+
+    Args:
+        names: The variable names.
+
+    Returns:
+        The variable names separated by commas.
+    """
+    return ", ".join(names)
+
+
+def records_to_disc_desc(
+    records: Iterable[dict | list | tuple],
+) -> tuple[DisciplineDescription, ...]:
+    """Convert the records of a table into descriptions of disciplines.
+
+    Args:
+        records: The records,
+            either mappings with the keys :attr:`.COLUMNS`
+            or sequences ``(name, inputs, outputs)``.
+
+    Returns:
+        The descriptions of the disciplines.
+
+    Raises:
+        ValueError: When a record has no name or a wrong structure.
+    """
+    disc_desc = []
+    for index, record in enumerate(records):
+        if isinstance(record, dict):
+            record = {str(key).strip().lower(): value for key, value in record.items()}
+            missing = set(COLUMNS) - set(record)
+            if missing:
+                msg = f"The record {index} has no column {', '.join(sorted(missing))}."
+                raise ValueError(msg)
+            record = [record[column] for column in COLUMNS]
+        elif not isinstance(record, (list, tuple)) or len(record) != len(COLUMNS):
+            msg = f"The record {index} is not of the form (name, inputs, outputs)."
+            raise ValueError(msg)
+
+        name, inputs, outputs = record
+        if name is None or name != name or not str(name).strip():  # noqa: PLR0124
+            msg = f"The record {index} has no name."
+            raise ValueError(msg)
+
+        for column, names in zip(COLUMNS[1:], (inputs, outputs)):
+            if not (
+                names is None
+                or names != names  # noqa: PLR0124 missing cells are NaN.
+                or isinstance(names, (str, list, tuple))
+            ):
+                msg = f"The {column} of the record {index} are not names."
+                raise ValueError(msg)
+
+        disc_desc.append((str(name).strip(), split_names(inputs), split_names(outputs)))
+
+    return tuple(disc_desc)
+
+
+def read_disciplines(
+    file: str | Path | IO, file_format: str = ""
+) -> tuple[DisciplineDescription, ...]:
+    """Read the descriptions of disciplines from a file.
+
+    Args:
+        file: The file path or a binary file-like object.
+        file_format: The format of the file, one of :attr:`.FILE_FORMATS`.
+            If empty, use the extension of the file name.
+
+    Returns:
+        The descriptions of the disciplines.
+
+    Raises:
+        ValueError: When the file format is not supported
+            or the file does not contain descriptions of disciplines.
+        ImportError: When the package reading an Excel file format is not installed.
+    """
+    if not file_format:
+        file_format = Path(getattr(file, "name", str(file))).suffix
+
+    file_format = file_format.lower().lstrip(".")
+    if file_format not in FILE_FORMATS:
+        msg = (
+            f"The file format {file_format!r} is not supported; "
+            f"use one of {', '.join(FILE_FORMATS)}."
+        )
+        raise ValueError(msg)
+
+    if file_format == "json":
+        if isinstance(file, (str, Path)):
+            records = json.loads(Path(file).read_text(encoding="utf-8"))
+        else:
+            records = json.load(file)
+        if not isinstance(records, list):
+            msg = "The JSON file does not contain a list of records."
+            raise ValueError(msg)
+
+        return records_to_disc_desc(records)
+
+    import pandas as pd
+
+    if file_format == "csv":
+        data_frame = pd.read_csv(file, dtype=str, skipinitialspace=True)
+    else:
+        engine = EXCEL_ENGINES[file_format]
+        if find_spec(engine) is None:
+            msg = (
+                f"Reading {file_format} files requires {engine}; "
+                "install gemseo-web-study[excel]."
+            )
+            raise ImportError(msg)
+
+        data_frame = pd.read_excel(file, dtype=str, engine=engine)
+
+    return records_to_disc_desc(data_frame.to_dict("records"))
@@ -0,0 +1,433 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The dry runs of the scenario of a study.
+
+A dry run executes the scenario of a study
+with the scalable linear disciplines generated from their descriptions,
+either as a short DOE or as a few iterations of an optimizer,
+to rank the MDO formulations and the MDA settings by cost
+before plugging in the real disciplines.
+It records the wall time, the numbers of calls of the disciplines,
+of evaluations of their Jacobians and of iterations of the MDAs.
+
+The design variables are bounded by 0 and 1 and start at 0.5;
+the coupling variables are added to the design variables of the IDF formulation,
+which requires them.
+
+The dry runs of a comparison are executed one after the other by a single job
+of the worker pool of the server process,
+so that their wall times are not distorted by each other,
+and cached by definition;
+the failure of a dry run does not prevent the others from being executed.
+"""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Final
+
+from gemseo_web_study.cache import LRUCache
+from gemseo_web_study.jobs import JOB_POOL
+from gemseo_web_study.jobs import Job
+from gemseo_web_study.scenario import build_scenario
+from gemseo_web_study.scenario import create_disciplines
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from gemseo.core.base_formulation import BaseFormulation
+    from gemseo.mda.mda import MDA
+
+    from gemseo_web_study.study import DisciplineDescription
+
+DOE: Final[str] = "DOE"
+"""The dry run evaluating the scenario on a Latin hypercube sampling."""
+
+OPTIMIZATION: Final[str] = "optimization"
+"""The dry run executing a few iterations of a gradient-based optimizer."""
+
+MODES: Final[tuple[str, ...]] = (DOE, OPTIMIZATION)
+"""The modes of the dry runs."""
+
+DOE_ALGORITHM: Final[str] = "LHS"
+"""The name of the DOE algorithm of the dry runs."""
+
+OPTIMIZATION_ALGORITHM: Final[str] = "SLSQP"
+"""The name of the optimization algorithm of the dry runs."""
+
+GAUSS_SEIDEL: Final[str] = "Gauss-Seidel"
+"""The serial MDA solving the couplings of a group one discipline after the other."""
+
+JACOBI: Final[str] = "Jacobi"
+"""The serial MDA solving the couplings of a group with all the disciplines at once."""
+
+JACOBI_THREADS: Final[str] = "Jacobi with threads"
+"""The Jacobi MDA executing the disciplines of a group in parallel threads."""
+
+JACOBI_PROCESSES: Final[str] = "Jacobi with processes"
+"""The Jacobi MDA executing the disciplines of a group in parallel processes."""
+
+MDA_SETTINGS: Final[tuple[str, ...]] = (
+    GAUSS_SEIDEL,
+    JACOBI,
+    JACOBI_THREADS,
+    JACOBI_PROCESSES,
+)
+"""The MDA settings of the dry runs."""
+
+MDA_FORMULATIONS: Final[tuple[str, ...]] = ("MDF", "BiLevel")
+"""The MDO formulations solving the couplings with MDAs."""
+
+WALL_TIME: Final[str] = "Wall time"
+"""The duration of the execution of the scenario in seconds."""
+
+DISCIPLINE_CALLS: Final[str] = "Discipline calls"
+"""The number of executions of the disciplines."""
+
+JACOBIAN_EVALUATIONS: Final[str] = "Jacobian evaluations"
+"""The number of linearizations of the disciplines."""
+
+MDA_ITERATIONS: Final[str] = "MDA iterations"
+"""The number of iterations of the MDAs."""
+
+EVALUATIONS: Final[str] = "Evaluations"
+"""The number of design points evaluated by the driver."""
+
+ERROR: Final[str] = "Error"
+"""The error raised by a failed dry run."""
+
+FORMULATION: Final[str] = "Formulation"
+"""The name of the MDO formulation of a dry run."""
+
+MDA: Final[str] = "MDA"
+"""The MDA settings of a dry run."""
+
+COLUMNS: Final[tuple[str, ...]] = (
+    FORMULATION,
+    MDA,
+    WALL_TIME,
+    DISCIPLINE_CALLS,
+    JACOBIAN_EVALUATIONS,
+    MDA_ITERATIONS,
+    EVALUATIONS,
+    ERROR,
+)
+"""The fields of the results of the dry runs."""
+
+DRY_RUNS: Final[LRUCache] = LRUCache(name="dry_runs")
+"""The results of the comparisons of dry runs bound to their definitions."""
+
+
+def get_formulation_options(
+    formulation: str, mda_settings: str, n_processes: int
+) -> dict[str, Any]:
+    """Return the options of an MDO formulation implementing MDA settings.
+
+    The formulations of :attr:`.MDA_FORMULATIONS` use the MDA of the settings;
+    the IDF formulation executes the disciplines in parallel
+    with the parallel settings;
+    the settings have no effect on the other formulations.
+
+    Args:
+        formulation: The name of the MDO formulation.
+        mda_settings: The MDA settings, one of :attr:`.MDA_SETTINGS`.
+        n_processes: The number of threads or processes of the parallel settings.
+
+    Returns:
+        The options of the MDO formulation.
+
+    Raises:
+        ValueError: When the MDA settings are not supported.
+    """
+    if mda_settings not in MDA_SETTINGS:
+        msg = f"The MDA settings {mda_settings!r} are not supported."
+        raise ValueError(msg)
+
+    if mda_settings in {JACOBI_THREADS, JACOBI_PROCESSES}:
+        options = {
+            "n_processes": n_processes,
+            "use_threading": mda_settings == JACOBI_THREADS,
+        }
+    else:
+        options = {"n_processes": 1}
+
+    if formulation in MDA_FORMULATIONS:
+        if mda_settings == GAUSS_SEIDEL:
+            return {"inner_mda_name": "MDAGaussSeidel"}
+
+        return {"inner_mda_name": "MDAJacobi", **options}
+
+    if formulation == "IDF":
+        return options
+
+    return {}
+
+
+def dry_run(
+    disc_desc: Sequence[DisciplineDescription],
+    formulation: str,
+    objective: str,
+    maximize_objective: bool,
+    design_variables: Iterable[str],
+    constraints: Iterable[tuple[str, str]],
+    formulation_options: Mapping[str, Any],
+    mode: str = DOE,
+    n_iterations: int = 5,
+) -> dict[str, float]:
+    """Execute the scenario of a study with scalable linear disciplines.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+        formulation: The name of the MDO formulation.
+        objective: The name of the objective.
+        maximize_objective: Whether to maximize the objective.
+        design_variables: The names of the design variables.
+        constraints: The names of the constraints and their types.
+        formulation_options: The options of the MDO formulation.
+        mode: The mode of the dry run, one of :attr:`.MODES`.
+        n_iterations: The number of samples of the DOE
+            or the maximum number of iterations of the optimizer.
+
+    Returns:
+        The wall time, the numbers of calls of the disciplines,
+        of evaluations of their Jacobians, of iterations of the MDAs
+        and of design points evaluated by the driver.
+
+    Raises:
+        ValueError: When the mode is not supported.
+    """
+    from numpy import full
+
+    from gemseo_web_study.coupling_graph import CouplingGraph
+
+    if mode not in MODES:
+        msg = f"The dry run mode {mode!r} is not one of {', '.join(MODES)}."
+        raise ValueError(msg)
+
+    design_variables = list(design_variables)
+    if formulation == "IDF":
+        design_variables.extend(
+            name
+            for name in CouplingGraph(disc_desc).all_couplings
+            if name not in design_variables
+        )
+
+    disciplines = create_disciplines(disc_desc)
+    scenario = build_scenario(
+        disciplines,
+        formulation,
+        objective,
+        maximize_objective,
+        design_variables,
+        constraints,
+        scenario_type="DOE" if mode == DOE else "MDO",
+        **formulation_options,
+    )
+    design_space = scenario.design_space
+    for name in design_space.variable_names:
+        size = design_space.get_size(name)
+        design_space.set_lower_bound(name, full(size, 0.0))
+        design_space.set_upper_bound(name, full(size, 1.0))
+        design_space.set_current_variable(name, full(size, 0.5))
+
+    if mode == DOE:
+        settings = {"algo": DOE_ALGORITHM, "n_samples": n_iterations}
+    else:
+        settings = {"algo": OPTIMIZATION_ALGORITHM, "max_iter": n_iterations}
+
+    start = perf_counter()
+    scenario.execute(settings)
+    return {
+        WALL_TIME: perf_counter() - start,
+        DISCIPLINE_CALLS: sum(discipline.n_calls for discipline in disciplines),
+        JACOBIAN_EVALUATIONS: sum(
+            discipline.n_calls_linearize for discipline in disciplines
+        ),
+        MDA_ITERATIONS: sum(
+            len(mda.residual_history) for mda in _get_mda_solvers(scenario.formulation)
+        ),
+        EVALUATIONS: len(scenario.formulation.opt_problem.database),
+    }
+
+
+def _get_mda_solvers(formulation: BaseFormulation) -> list[MDA]:
+    """Return the MDAs of an MDO formulation solving couplings.
+
+    The MDAs made of other MDAs, e.g. an MDA chain, are replaced by the latter.
+
+    Args:
+        formulation: The MDO formulation.
+
+    Returns:
+        The MDAs solving couplings.
+    """
+    mdas = [
+        mda
+        for name in ("mda", "mda1", "mda2")
+        if (mda := getattr(formulation, name, None)) is not None
+    ]
+    solvers = []
+    while mdas:
+        mda = mdas.pop()
+        sub_mdas = [*getattr(mda, "inner_mdas", ()), *getattr(mda, "mda_sequence", ())]
+        if sub_mdas:
+            mdas.extend(sub_mdas)
+        else:
+            solvers.append(mda)
+
+    return solvers
+
+
+def _compare_dry_runs(
+    disc_desc: Sequence[DisciplineDescription],
+    objective: str,
+    maximize_objective: bool,
+    design_variables: Sequence[str],
+    constraints: Sequence[tuple[str, str]],
+    runs: Sequence[tuple[str, str, Mapping[str, Any]]],
+    mode: str,
+    n_iterations: int,
+) -> list[dict[str, Any]]:
+    """Execute dry runs one after the other.
+
+    This function is executed in a worker process.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+        objective: The name of the objective.
+        maximize_objective: Whether to maximize the objective.
+        design_variables: The names of the design variables.
+        constraints: The names of the constraints and their types.
+        runs: The names of the MDO formulations, the MDA settings
+            and the options of the MDO formulations of the dry runs.
+        mode: The mode of the dry runs.
+        n_iterations: The number of samples of the DOE
+            or the maximum number of iterations of the optimizer.
+
+    Returns:
+        The results of the dry runs,
+        with the error instead of the results when a dry run fails.
+    """
+    results = []
+    for formulation, mda_settings, formulation_options in runs:
+        try:
+            result = dry_run(
+                disc_desc,
+                formulation,
+                objective,
+                maximize_objective,
+                design_variables,
+                constraints,
+                formulation_options,
+                mode,
+                n_iterations,
+            )
+        except Exception as error:  # A dry run fails independently.
+            result = {ERROR: str(error)}
+
+        results.append({FORMULATION: formulation, MDA: mda_settings, **result})
+
+    return results
+
+
+def submit_dry_runs(
+    disc_desc: Sequence[DisciplineDescription],
+    study_hash: str,
+    formulations: Iterable[str],
+    mda_settings: Iterable[str],
+    objective: str,
+    maximize_objective: bool,
+    design_variables: Sequence[str],
+    constraints: Sequence[tuple[str, str]],
+    n_processes: int = 4,
+    mode: str = DOE,
+    n_iterations: int = 5,
+    owner: Hashable = None,
+) -> Job:
+    """Submit the comparison of dry runs of a scenario to the worker pool.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+        study_hash: The hash of the descriptions of the disciplines.
+        formulations: The names of the MDO formulations.
+        mda_settings: The MDA settings, some of :attr:`.MDA_SETTINGS`.
+        objective: The name of the objective.
+        maximize_objective: Whether to maximize the objective.
+        design_variables: The names of the design variables.
+        constraints: The names of the constraints and their types.
+        n_processes: The number of threads or processes of the parallel settings.
+        mode: The mode of the dry runs, one of :attr:`.MODES`.
+        n_iterations: The number of samples of the DOE
+            or the maximum number of iterations of the optimizer.
+        owner: The identifier of the session submitting the job.
+
+    Returns:
+        The job executing the dry runs of each MDO formulation with each MDA settings,
+        already done when they are cached.
+
+    Raises:
+        ValueError: When MDA settings are not supported.
+        RuntimeError: When the queue of the worker pool is full.
+    """
+    runs = tuple(
+        (
+            formulation,
+            settings,
+            get_formulation_options(formulation, settings, n_processes),
+        )
+        for formulation in formulations
+        for settings in mda_settings
+    )
+    key = (
+        "dry_runs",
+        study_hash,
+        objective,
+        maximize_objective,
+        tuple(design_variables),
+        tuple(tuple(constraint) for constraint in constraints),
+        tuple(
+            (formulation, settings, tuple(options.items()))
+            for formulation, settings, options in runs
+        ),
+        mode,
+        n_iterations,
+    )
+    results = DRY_RUNS.get(key)
+    if results is not None:
+        return Job.from_result(key, results)
+
+    return JOB_POOL.submit(
+        key,
+        _compare_dry_runs,
+        disc_desc,
+        objective,
+        maximize_objective,
+        design_variables,
+        constraints,
+        runs,
+        mode,
+        n_iterations,
+        owner=owner,
+        callback=lambda results: DRY_RUNS.set(key, results),
+    )
@@ -0,0 +1,291 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The analytic cost model of the MDO formulations.
+
+The sizes of the optimization problems of the MDO formulations
+are derived from the coupling graph, the design variables and the constraints,
+without creating any discipline nor executing anything,
+as an instant alternative to the dry runs.
+The variables of the scalable disciplines are of size 1,
+so that a size is a number of variables.
+
+The number of discipline evaluations per iteration of the driver
+depends on the number of iterations of the MDAs,
+which is an estimate:
+the MDA of a group of strongly coupled disciplines
+executes them at each of its iterations
+while the disciplines which are not strongly coupled are executed once.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from numpy.typing import NDArray
+    from pandas import DataFrame
+
+    from gemseo_web_study.coupling_graph import CouplingGraph
+
+FORMULATIONS: Final[tuple[str, ...]] = ("MDF", "IDF", "BiLevel", "DisciplinaryOpt")
+"""The names of the MDO formulations of the cost model."""
+
+DEFAULT_MDA_ITERATIONS: Final[int] = 10
+"""The estimated number of iterations of an MDA,
+i.e. the maximum number of iterations of the MDAs of GEMSEO by default."""
+
+FORMULATION: Final[str] = "Formulation"
+"""The name of the MDO formulation."""
+
+VIABLE: Final[str] = "Viable"
+"""Whether the MDO formulation can solve the scenario of the study."""
+
+OPTIMIZATION_VARIABLES: Final[str] = "Optimization variables"
+"""The number of variables of the optimization problem."""
+
+CONSISTENCY_CONSTRAINTS: Final[str] = "Consistency constraints"
+"""The number of equality constraints ensuring the consistency of the couplings."""
+
+CONSTRAINTS: Final[str] = "Constraints"
+"""The number of constraints of the optimization problem."""
+
+MDA_UNKNOWNS: Final[str] = "MDA unknowns"
+"""The number of coupling variables solved by the MDAs."""
+
+EVALUATIONS_PER_ITERATION: Final[str] = "Evaluations per iteration"
+"""The expected number of discipline evaluations per evaluation of the functions."""
+
+REMARK: Final[str] = "Remark"
+"""The remark about the MDO formulation."""
+
+GROUP: Final[str] = "Group"
+"""The index of a group of strongly coupled disciplines, starting at 1."""
+
+DISCIPLINES: Final[str] = "Disciplines"
+"""The number of disciplines of a group of strongly coupled disciplines."""
+
+COUPLING_VARIABLES: Final[str] = "Coupling variables"
+"""The number of variables produced and consumed in a group."""
+
+
+class FormulationCostModel:
+    """The analytic cost model of the MDO formulations."""
+
+    couplings: frozenset[str]
+    """The inputs of disciplines that are also outputs of disciplines."""
+
+    group_coupling_sizes: NDArray[int]
+    """The number of coupling variables solved by the MDA of each group.
+
+    The groups are the ones of :attr:`.CouplingGraph.strongly_coupled_groups`.
+    """
+
+    group_sizes: NDArray[int]
+    """The number of disciplines of each group of strongly coupled disciplines."""
+
+    n_disciplines: int
+    """The number of disciplines."""
+
+    def __init__(self, coupling_graph: CouplingGraph) -> None:
+        """
+        Args:
+            coupling_graph: The coupling graph of the disciplines.
+        """  # noqa: D205 D212 D415
+        from numpy import bincount
+        from numpy import int64
+        from numpy import unique
+
+        self.couplings = frozenset(coupling_graph.all_couplings)
+        self.n_disciplines = coupling_graph.n_disciplines
+        group_indices = coupling_graph.group_indices
+        n_groups = int(group_indices.max()) + 1 if self.n_disciplines else 0
+        self.group_sizes = bincount(
+            group_indices[group_indices >= 0], minlength=n_groups
+        )
+
+        # A strong coupling variable is produced and consumed in a same group.
+        producers, consumers, variables = coupling_graph.couplings
+        groups = group_indices[producers]
+        is_strong = (groups >= 0) & (groups == group_indices[consumers])
+        n_variables = len(coupling_graph.variable_names)
+        pairs = unique(
+            groups[is_strong].astype(int64) * n_variables + variables[is_strong]
+        )
+        self.group_coupling_sizes = bincount(pairs // n_variables, minlength=n_groups)
+
+    @property
+    def n_strongly_coupled(self) -> int:
+        """The number of strongly coupled disciplines."""
+        return int(self.group_sizes.sum())
+
+    @property
+    def n_strong_couplings(self) -> int:
+        """The number of coupling variables solved by the MDAs."""
+        return int(self.group_coupling_sizes.sum())
+
+    def get_mda_evaluations(self, mda_iterations: int) -> int:
+        """Return the number of discipline evaluations of an MDA chain.
+
+        Args:
+            mda_iterations: The estimated number of iterations of an MDA.
+
+        Returns:
+            The number of discipline evaluations
+            to execute the disciplines which are not strongly coupled once
+            and the MDAs of the groups of strongly coupled disciplines.
+        """
+        return self.n_disciplines + self.n_strongly_coupled * (mda_iterations - 1)
+
+    def estimate(
+        self,
+        formulation: str,
+        design_variables: Iterable[str],
+        constraints: Iterable[tuple[str, str]],
+        mda_iterations: int = DEFAULT_MDA_ITERATIONS,
+    ) -> dict[str, Any]:
+        """Estimate the cost of an MDO formulation.
+
+        Args:
+            formulation: The name of the MDO formulation, one of :attr:`.FORMULATIONS`.
+            design_variables: The names of the design variables.
+            constraints: The names of the constraints and their types.
+            mda_iterations: The estimated number of iterations of an MDA.
+
+        Returns:
+            The sizes of the optimization problem of the MDO formulation,
+            the expected number of discipline evaluations per iteration,
+            whether the MDO formulation is viable and a remark.
+
+        Raises:
+            ValueError: When the MDO formulation is not supported.
+        """
+        if formulation not in FORMULATIONS:
+            msg = f"The cost model does not support the MDO formulation {formulation}."
+            raise ValueError(msg)
+
+        design_variables = set(design_variables)
+        n_constraints = len(list(constraints))
+        n_consistency_constraints = 0
+        n_optimization_variables = len(design_variables)
+        mda_unknowns = self.n_strong_couplings
+        viable = True
+        remark = ""
+        if formulation == "MDF":
+            evaluations = self.get_mda_evaluations(mda_iterations)
+        elif formulation == "IDF":
+            n_consistency_constraints = len(self.couplings)
+            n_optimization_variables = len(design_variables | self.couplings)
+            mda_unknowns = 0
+            evaluations = self.n_disciplines
+            # GEMSEO requires the coupling variables as design variables.
+            n_missing_couplings = len(self.couplings - design_variables)
+            viable = not n_missing_couplings
+            remark = (
+                f"{n_missing_couplings} coupling variables are not design variables."
+                if n_missing_couplings
+                else "The disciplines can be executed in parallel."
+            )
+        elif formulation == "BiLevel":
+            evaluations = 2 * self.get_mda_evaluations(mda_iterations)
+            viable = not n_constraints
+            remark = (
+                "The constraints must be outputs of sub-scenarios."
+                if n_constraints
+                else "The system level executes an MDA before and after the "
+                "sub-scenarios."
+            )
+        else:
+            mda_unknowns = 0
+            evaluations = self.n_disciplines
+            viable = not self.n_strongly_coupled
+            if not viable:
+                remark = "The strong couplings are not solved."
+
+        return {
+            FORMULATION: formulation,
+            VIABLE: viable,
+            OPTIMIZATION_VARIABLES: n_optimization_variables,
+            CONSISTENCY_CONSTRAINTS: n_consistency_constraints,
+            CONSTRAINTS: n_constraints + n_consistency_constraints,
+            MDA_UNKNOWNS: mda_unknowns,
+            EVALUATIONS_PER_ITERATION: evaluations,
+            REMARK: remark,
+        }
+
+    def get_costs(
+        self,
+        design_variables: Iterable[str],
+        constraints: Iterable[tuple[str, str]],
+        mda_iterations: int = DEFAULT_MDA_ITERATIONS,
+        formulations: Iterable[str] = FORMULATIONS,
+    ) -> DataFrame:
+        """Estimate the costs of MDO formulations.
+
+        Args:
+            design_variables: The names of the design variables.
+            constraints: The names of the constraints and their types.
+            mda_iterations: The estimated number of iterations of an MDA.
+            formulations: The names of the MDO formulations,
+                some of :attr:`.FORMULATIONS`.
+
+        Returns:
+            The costs of the MDO formulations, with a row per MDO formulation,
+            the viable ones first, sorted by number of evaluations per iteration
+            and then by number of optimization variables.
+
+        Raises:
+            ValueError: When an MDO formulation is not supported.
+        """
+        from pandas import DataFrame
+
+        design_variables = list(design_variables)
+        constraints = list(constraints)
+        costs = DataFrame([
+            self.estimate(formulation, design_variables, constraints, mda_iterations)
+            for formulation in formulations
+        ])
+        if costs.empty:
+            return costs
+
+        return costs.sort_values(
+            [VIABLE, EVALUATIONS_PER_ITERATION, OPTIMIZATION_VARIABLES],
+            ascending=[False, True, True],
+            kind="stable",
+            ignore_index=True,
+        )
+
+    def get_mda_sizes(self) -> DataFrame:
+        """Return the sizes of the MDAs of the groups of strongly coupled disciplines.
+
+        Returns:
+            The number of disciplines and of coupling variables of each group,
+            with a row per group.
+        """
+        from numpy import arange
+        from pandas import DataFrame
+
+        return DataFrame({
+            GROUP: arange(1, len(self.group_sizes) + 1),
+            DISCIPLINES: self.group_sizes,
+            COUPLING_VARIABLES: self.group_coupling_sizes,
+        })
@@ -0,0 +1,424 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The pool of worker processes running the heavy jobs of a server process.
+
+The rendering of the N2 and XDSM diagrams is sent to a pool of worker processes
+shared by all the sessions of a server
+so that a large study does not block the reruns of the other sessions.
+
+The jobs wait in a bounded queue:
+a job is refused when the queue is full
+and a session cannot run more than a given number of jobs at the same time,
+its other jobs waiting in the queue.
+Identical jobs, i.e. with the same key, are only run once.
+A queued job is cancelled when all its submissions are cancelled;
+a running job cannot be interrupted and its result is cached.
+
+The pool can be configured with the environment variables
+``GEMSEO_WEB_STUDY_WORKERS`` (number of worker processes),
+``GEMSEO_WEB_STUDY_MAX_QUEUED_JOBS`` (number of jobs waiting in the queue)
+and ``GEMSEO_WEB_STUDY_MAX_SESSION_JOBS`` (number of running jobs per session).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import RLock
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Final
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+WORKERS: Final[int] = int(
+    os.environ.get("GEMSEO_WEB_STUDY_WORKERS", os.cpu_count() or 1)
+)
+"""The default number of worker processes."""
+
+MAX_QUEUED_JOBS: Final[int] = int(
+    os.environ.get("GEMSEO_WEB_STUDY_MAX_QUEUED_JOBS", 32)
+)
+"""The default maximum number of jobs waiting for a worker process."""
+
+MAX_SESSION_JOBS: Final[int] = int(
+    os.environ.get("GEMSEO_WEB_STUDY_MAX_SESSION_JOBS", 2)
+)
+"""The default maximum number of running jobs per session."""
+
+
+class Job:
+    """A job of the worker pool."""
+
+    QUEUED: Final[str] = "queued"
+    """The status of a job waiting for a worker process."""
+
+    RUNNING: Final[str] = "running"
+    """The status of a job run by a worker process."""
+
+    DONE: Final[str] = "done"
+    """The status of a finished job, successful or not."""
+
+    future: Future
+    """The future holding the result of the job or the error it raised."""
+
+    key: Hashable
+    """The key identifying the job."""
+
+    n_submissions: int
+    """The number of submissions of the job that have not been cancelled."""
+
+    owner: Hashable
+    """The identifier of the session owning the job."""
+
+    start_time: float | None
+    """The time at which a worker process started the job, if any."""
+
+    def __init__(self, key: Hashable, owner: Hashable = None) -> None:
+        """
+        Args:
+            key: The key identifying the job.
+            owner: The identifier of the session owning the job.
+        """  # noqa: D205 D212 D415
+        self.future = Future()
+        self.key = key
+        self.n_submissions = 1
+        self.owner = owner
+        self.start_time = None
+
+    @classmethod
+    def from_result(cls, key: Hashable, result: Any) -> Job:
+        """Create a finished job, e.g. from a cached result.
+
+        Args:
+            key: The key identifying the job.
+            result: The result of the job.
+
+        Returns:
+            The finished job.
+        """
+        job = cls(key)
+        job.future.set_result(result)
+        return job
+
+    @classmethod
+    def from_error(cls, key: Hashable, error: BaseException) -> Job:
+        """Create a failed job, e.g. from an error raised when submitting it.
+
+        Args:
+            key: The key identifying the job.
+            error: The error raised by the job.
+
+        Returns:
+            The failed job.
+        """
+        job = cls(key)
+        job.future.set_exception(error)
+        return job
+
+    @property
+    def status(self) -> str:
+        """The status of the job."""
+        if self.future.done():
+            return self.DONE
+
+        if self.start_time is None:
+            return self.QUEUED
+
+        return self.RUNNING
+
+    @property
+    def elapsed_time(self) -> float:
+        """The time elapsed since a worker process started the job, in seconds."""
+        if self.start_time is None:
+            return 0.0
+
+        return perf_counter() - self.start_time
+
+
+class JobPool:
+    """A pool of worker processes with a bounded queue and per-session limits.
+
+    The worker processes are spawned when the first jobs are submitted.
+    """
+
+    max_queued_jobs: int
+    """The maximum number of jobs waiting for a worker process."""
+
+    max_session_jobs: int
+    """The maximum number of running jobs per session."""
+
+    max_workers: int
+    """The number of worker processes."""
+
+    __executor: ProcessPoolExecutor | None
+    """The executor of the worker processes, if spawned."""
+
+    __jobs: dict[Hashable, Job]
+    """The queued and running jobs bound to their keys."""
+
+    __lock: RLock
+    """The lock protecting the queue.
+
+    It is reentrant as a job finishing immediately is finished while dispatching it.
+    """
+
+    __queue: deque[tuple[Job, Callable[..., Any], tuple[Any, ...], Callable | None]]
+    """The jobs waiting for a worker process with their functions, arguments and
+    callbacks."""
+
+    __running: dict[Hashable, int]
+    """The number of running jobs bound to the identifiers of the sessions."""
+
+    def __init__(
+        self,
+        max_workers: int = WORKERS,
+        max_queued_jobs: int = MAX_QUEUED_JOBS,
+        max_session_jobs: int = MAX_SESSION_JOBS,
+    ) -> None:
+        """
+        Args:
+            max_workers: The number of worker processes.
+            max_queued_jobs: The maximum number of jobs waiting for a worker process.
+            max_session_jobs: The maximum number of running jobs per session.
+        """  # noqa: D205 D212 D415
+        self.max_queued_jobs = max_queued_jobs
+        self.max_session_jobs = max_session_jobs
+        self.max_workers = max_workers
+        self.__executor = None
+        self.__jobs = {}
+        self.__lock = RLock()
+        self.__queue = deque()
+        self.__running = {}
+
+    @property
+    def n_queued_jobs(self) -> int:
+        """The number of jobs waiting for a worker process."""
+        return len(self.__queue)
+
+    @property
+    def n_running_jobs(self) -> int:
+        """The number of jobs run by the worker processes."""
+        return sum(self.__running.values())
+
+    def submit(
+        self,
+        key: Hashable,
+        function: Callable[..., Any],
+        *args: Any,
+        owner: Hashable = None,
+        callback: Callable[[Any], None] | None = None,
+    ) -> Job:
+        """Submit a job to the pool.
+
+        When a job with the same key is queued or running,
+        this job is returned instead of submitting a new one
+        and its number of submissions is incremented.
+
+        Args:
+            key: The key identifying the job.
+            function: The function run by the worker process,
+                which must be picklable, e.g. defined at the top level of a module.
+            *args: The picklable arguments of the function.
+            owner: The identifier of the session owning the job.
+            callback: The function called in the server process with the result
+                of the job before the job is done, e.g. to cache it.
+
+        Returns:
+            The job.
+
+        Raises:
+            RuntimeError: When the queue is full.
+        """
+        with self.__lock:
+            job = self.__jobs.get(key)
+            if job is not None:
+                job.n_submissions += 1
+                return job
+
+            if len(self.__queue) >= self.max_queued_jobs:
+                msg = (
+                    f"The server is busy with {len(self.__queue)} queued jobs, "
+                    "please retry later."
+                )
+                raise RuntimeError(msg)
+
+            job = self.__jobs[key] = Job(key, owner)
+            self.__queue.append((job, function, args, callback))
+            self.__dispatch()
+
+        return job
+
+    def cancel(self, job: Job) -> bool:
+        """Cancel a submission of a job.
+
+        The job is removed from the queue when all its submissions are cancelled.
+        A running job is not interrupted.
+
+        Args:
+            job: The job.
+
+        Returns:
+            Whether the job has been cancelled.
+        """
+        with self.__lock:
+            if self.__jobs.get(job.key) is not job:
+                return False
+
+            job.n_submissions -= 1
+            if job.n_submissions or job.start_time is not None:
+                return False
+
+            for item in self.__queue:
+                if item[0] is job:
+                    self.__queue.remove(item)
+                    break
+
+            del self.__jobs[job.key]
+
+        return job.future.cancel()
+
+    def get_position(self, job: Job) -> int:
+        """Return the position of a job in the queue.
+
+        Args:
+            job: The job.
+
+        Returns:
+            The position of the job in the queue, starting at 1,
+            or 0 when the job is not queued.
+        """
+        with self.__lock:
+            for position, (queued_job, *_) in enumerate(self.__queue, 1):
+                if queued_job is job:
+                    return position
+
+        return 0
+
+    def __dispatch(self) -> None:
+        """Start the queued jobs as long as there are available worker processes.
+
+        The jobs of a session running the maximum number of jobs are skipped,
+        as well as the jobs removed from the queue while dispatching,
+        e.g. by a job finishing immediately.
+        The lock must be acquired.
+        """
+        for item in list(self.__queue):
+            if self.n_running_jobs >= self.max_workers:
+                return
+
+            job, function, args, callback = item
+            if item not in self.__queue or (
+                self.__running.get(job.owner, 0) >= self.max_session_jobs
+            ):
+                continue
+
+            self.__queue.remove(item)
+            self.__running[job.owner] = self.__running.get(job.owner, 0) + 1
+            job.start_time = perf_counter()
+            if self.__executor is None:
+                # The server process has threads: forking it could deadlock the workers.
+                self.__executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+
+            executor = self.__executor
+            try:
+                future = executor.submit(function, *args)
+            except RuntimeError as error:
+                # The executor is broken or shut down: the job fails.
+                self.__discard_executor(executor)
+                future = Future()
+                future.set_exception(error)
+
+            future.add_done_callback(
+                lambda future, job=job, callback=callback, executor=executor: (
+                    self.__finish(job, future, callback, executor)
+                )
+            )
+
+    def __discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Shut down a broken executor so that the next jobs spawn a new one.
+
+        The queued futures of the executor are cancelled
+        and its remaining worker processes are terminated in the background.
+        The lock must be acquired.
+
+        Args:
+            executor: The broken executor.
+        """
+        executor.shutdown(wait=False, cancel_futures=True)
+        if executor is self.__executor:
+            self.__executor = None
+
+    def __finish(
+        self,
+        job: Job,
+        future: Future,
+        callback: Callable[[Any], None] | None,
+        executor: ProcessPoolExecutor,
+    ) -> None:
+        """Finish a job and start the next queued jobs.
+
+        The job is finished even if the callback raises an error,
+        in which case the job fails with this error.
+
+        Args:
+            job: The job.
+            future: The future of the executor.
+            callback: The function called with the result of the job, if any.
+            executor: The executor which ran the job.
+        """
+        error = future.exception()
+        try:
+            if error is None and callback is not None:
+                # Before removing the job so that an identical job is not submitted
+                # again.
+                callback(future.result())
+        except Exception as callback_error:
+            # The job fails with the error of the callback.
+            error = callback_error
+        finally:
+            with self.__lock:
+                del self.__jobs[job.key]
+                self.__running[job.owner] -= 1
+                if not self.__running[job.owner]:
+                    del self.__running[job.owner]
+
+                if isinstance(error, BrokenProcessPool):
+                    # A worker process died, e.g. killed by the OOM killer.
+                    self.__discard_executor(executor)
+
+                self.__dispatch()
+
+        if error is None:
+            job.future.set_result(future.result())
+        else:
+            job.future.set_exception(error)
+
+
+JOB_POOL: Final[JobPool] = JobPool()
+"""The pool of worker processes shared by the sessions of the server process."""
@@ -0,0 +1,243 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The metrics of the evaluation of the studies in a server process.
+
+The durations of the stages of the studies are gathered
+for the whole process and for the current run of a page,
+the duration of a stage excluding the durations of the stages it evaluates.
+The statistics of the caches and of the worker pool are read from themselves.
+
+When the environment variable ``GEMSEO_WEB_STUDY_METRICS_FILE`` is set,
+the metrics are written to this file at the end of each run of a page:
+either in the Prometheus text format, overwritten,
+when the file has the extension ``.prom``
+so that it can be scraped by the textfile collector of the node exporter,
+or as JSON lines, one per run, otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from threading import get_ident
+from threading import local
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Final
+
+from gemseo_web_study.cache import CACHES
+from gemseo_web_study.jobs import JOB_POOL
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+METRICS_FILE: Final[str] = os.environ.get("GEMSEO_WEB_STUDY_METRICS_FILE", "")
+"""The path to the file to write the metrics to, if any."""
+
+_PREFIX: Final[str] = "gemseo_web_study"
+"""The prefix of the names of the Prometheus metrics."""
+
+
+class StageMetrics:
+    """The durations of the evaluations of the stages of the studies."""
+
+    __lock: Lock
+    """The lock protecting the statistics."""
+
+    __statistics: dict[str, dict[str, float]]
+    """The number of evaluations, total duration and maximum duration of the stages."""
+
+    __thread_data: local
+    """The stack of the nested stages and the durations of the current run."""
+
+    def __init__(self) -> None:  # noqa: D107
+        self.__lock = Lock()
+        self.__statistics = {}
+        self.__thread_data = local()
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Measure the duration of the evaluation of a stage.
+
+        The durations of the stages evaluated during this evaluation,
+        in the same thread, are excluded.
+
+        Args:
+            stage: The name of the stage.
+        """
+        stack = self.__thread_data.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            nested_duration = stack.pop()
+            if stack:
+                stack[-1] += duration
+
+            self.record(stage, duration - nested_duration)
+
+    def record(self, stage: str, duration: float) -> None:
+        """Record the duration of the evaluation of a stage.
+
+        Args:
+            stage: The name of the stage.
+            duration: The duration in seconds.
+        """
+        with self.__lock:
+            statistics = self.__statistics.setdefault(
+                stage, {"count": 0, "total": 0.0, "max": 0.0}
+            )
+            statistics["count"] += 1
+            statistics["total"] += duration
+            statistics["max"] = max(statistics["max"], duration)
+
+        run = getattr(self.__thread_data, "run", None)
+        if run is not None:
+            run[stage] = run.get(stage, 0.0) + duration
+
+    def start_run(self) -> None:
+        """Start recording the durations of the stages of a run in this thread."""
+        self.__thread_data.run = {}
+
+    def stop_run(self) -> dict[str, float]:
+        """Stop recording the durations of the stages of a run in this thread.
+
+        Returns:
+            The durations of the stages evaluated during the run.
+        """
+        run = getattr(self.__thread_data, "run", None) or {}
+        self.__thread_data.run = None
+        return run
+
+    @property
+    def statistics(self) -> dict[str, dict[str, float]]:
+        """The number of evaluations, total duration and maximum duration of the
+        stages."""  # noqa: D205 D209
+        with self.__lock:
+            return {
+                stage: dict(statistics)
+                for stage, statistics in self.__statistics.items()
+            }
+
+
+STAGE_METRICS: Final[StageMetrics] = StageMetrics()
+"""The durations of the evaluations of the stages in the process."""
+
+
+def get_cache_statistics() -> dict[str, dict[str, int]]:
+    """Return the statistics of the caches of the process.
+
+    Returns:
+        The numbers of hits, misses and entries and the memory in bytes
+        of the caches bound to their names.
+    """
+    return {
+        name: {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "entries": len(cache),
+            "memory": cache.memory,
+        }
+        for name, cache in CACHES.items()
+    }
+
+
+def to_prometheus() -> str:
+    """Format the metrics of the process in the Prometheus text format.
+
+    Returns:
+        The metrics in the Prometheus text format.
+    """
+    metrics = {
+        "stage_evaluations_total": ("counter", "The number of evaluations."),
+        "stage_duration_seconds_total": ("counter", "The total duration."),
+        "stage_duration_seconds_max": ("gauge", "The maximum duration."),
+        "cache_hits_total": ("counter", "The number of hits."),
+        "cache_misses_total": ("counter", "The number of misses."),
+        "cache_entries": ("gauge", "The number of entries."),
+        "cache_memory_bytes": ("gauge", "The memory used by the entries."),
+        "jobs_queued": ("gauge", "The number of jobs waiting for a worker process."),
+        "jobs_running": ("gauge", "The number of jobs run by the worker processes."),
+    }
+    samples = {name: [] for name in metrics}
+    for stage, statistics in STAGE_METRICS.statistics.items():
+        label = f'{{stage="{stage}"}}'
+        samples["stage_evaluations_total"].append((label, statistics["count"]))
+        samples["stage_duration_seconds_total"].append((label, statistics["total"]))
+        samples["stage_duration_seconds_max"].append((label, statistics["max"]))
+
+    for cache, statistics in get_cache_statistics().items():
+        label = f'{{cache="{cache}"}}'
+        samples["cache_hits_total"].append((label, statistics["hits"]))
+        samples["cache_misses_total"].append((label, statistics["misses"]))
+        samples["cache_entries"].append((label, statistics["entries"]))
+        samples["cache_memory_bytes"].append((label, statistics["memory"]))
+
+    samples["jobs_queued"].append(("", JOB_POOL.n_queued_jobs))
+    samples["jobs_running"].append(("", JOB_POOL.n_running_jobs))
+    lines = []
+    for name, (metric_type, description) in metrics.items():
+        full_name = f"{_PREFIX}_{name}"
+        lines.extend((
+            f"# HELP {full_name} {description}",
+            f"# TYPE {full_name} {metric_type}",
+        ))
+        lines.extend(f"{full_name}{label} {value}" for label, value in samples[name])
+
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(file_path: str | Path, page: str, run: dict[str, float]) -> None:
+    """Write the metrics to a file at the end of the run of a page.
+
+    Args:
+        file_path: The path to the file,
+            in the Prometheus text format if its extension is ``.prom``,
+            as JSON lines otherwise.
+        page: The name of the page.
+        run: The durations of the stages evaluated during the run.
+    """
+    file_path = Path(file_path)
+    if file_path.suffix == ".prom":
+        # The file is replaced atomically so that it is never scraped half written.
+        temporary_path = file_path.with_name(
+            f".{file_path.name}.{os.getpid()}.{get_ident()}"
+        )
+        temporary_path.write_text(to_prometheus(), encoding="utf-8")
+        temporary_path.replace(file_path)
+        return
+
+    line = json.dumps({
+        "time": time.time(),
+        "page": page,
+        "durations": run,
+        "caches": get_cache_statistics(),
+        "jobs": {
+            "queued": JOB_POOL.n_queued_jobs,
+            "running": JOB_POOL.n_running_jobs,
+        },
+    })
+    with file_path.open("a", encoding="utf-8") as file:
+        file.write(line + "\n")
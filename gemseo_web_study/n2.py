@@ -0,0 +1,416 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The N2 charts of a study.
+
+The static N2 chart is drawn from a coupling graph.
+
+The whole matrix is drawn as a single image
+whose pixels are the cells of the N2 chart;
+the names of the disciplines and of the coupling variables are only drawn
+when the number of disciplines is small enough to read them.
+
+The figure is not attached to ``matplotlib.pyplot``
+so that no figure is left open between the reruns.
+
+The interactive N2 chart is the standalone HTML file of GEMSEO
+written to a scratch directory removed right after reading it.
+
+The N2 payload is a compact JSON description of the N2 chart
+drawn in the browser by a canvas component:
+the names of the disciplines and of the coupling variables are stored once
+and the couplings are a sparse list of edges
+with the identifiers of their variables.
+
+Both charts can be rendered by the worker pool of the server process
+instead of the calling thread.
+"""
+
+from __future__ import annotations
+
+import json
+from io import BytesIO
+from math import ceil
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Final
+
+from gemseo_web_study.cache import LRUCache
+from gemseo_web_study.jobs import JOB_POOL
+from gemseo_web_study.jobs import Job
+from gemseo_web_study.scenario import create_disciplines
+from gemseo_web_study.xdsm import scratch_directory
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from collections.abc import Sequence
+
+    from gemseo.core.coupling_structure import MDOCouplingStructure
+
+    from gemseo_web_study.coupling_graph import CouplingGraph
+    from gemseo_web_study.study import DisciplineDescription
+
+MAX_LABELED_DISCIPLINES: Final[int] = 40
+"""The maximum number of disciplines to draw their names."""
+
+MAX_LABELED_COUPLINGS: Final[int] = 12
+"""The maximum number of disciplines to draw the names of the coupling variables."""
+
+N2_IMAGES: Final[LRUCache] = LRUCache(name="n2_images")
+"""The N2 images bound to the hash of the study, the format and the options."""
+
+N2_HTML: Final[LRUCache] = LRUCache(name="n2_html")
+"""The N2 HTML files bound to the hash of the study."""
+
+N2_PAYLOADS: Final[LRUCache] = LRUCache(name="n2_payloads")
+"""The N2 payloads bound to the hash of the study."""
+
+_DISCIPLINE_COLOR: Final[tuple[float, float, float]] = (0.196, 0.804, 0.196)
+"""The color of a discipline (limegreen)."""
+
+_SELF_COUPLED_COLOR: Final[tuple[float, float, float]] = (0.255, 0.412, 0.882)
+"""The color of a self-coupled discipline (royalblue)."""
+
+_COUPLING_COLOR: Final = _SELF_COUPLED_COLOR
+"""The color of a coupling."""
+
+
+def render_n2(
+    coupling_graph: CouplingGraph,
+    image_format: str = "png",
+    show_data_names: bool | None = None,
+    fig_size: tuple[float, float] = (8.0, 8.0),
+) -> bytes:
+    """Render the static N2 chart of a coupling graph.
+
+    The diagonal blocks are the disciplines,
+    in blue when they are self-coupled,
+    and a block ``(i, j)`` is filled when the discipline ``i`` produces
+    an input of the discipline ``j``,
+    with an opacity increasing with the number of coupling variables.
+
+    Args:
+        coupling_graph: The coupling graph.
+        image_format: The format of the image, e.g. ``"png"`` or ``"svg"``.
+        show_data_names: Whether to show the names of the disciplines
+            and coupling variables.
+            If ``None``,
+            show the names of the disciplines
+            up to :attr:`.MAX_LABELED_DISCIPLINES` disciplines
+            and the names of the coupling variables
+            up to :attr:`.MAX_LABELED_COUPLINGS` disciplines.
+        fig_size: The width and height of the figure in inches.
+
+    Returns:
+        The content of the image file.
+    """
+    from matplotlib.figure import Figure
+    from numpy import array
+    from numpy import ones
+
+    n_disciplines = coupling_graph.n_disciplines
+    n2_matrix = coupling_graph.n2_matrix.tocoo()
+    image = ones((n_disciplines, n_disciplines, 3))
+    if n2_matrix.nnz:
+        opacity = 0.35 + 0.65 * n2_matrix.data / n2_matrix.data.max()
+        image[n2_matrix.row, n2_matrix.col] = 1 - opacity[:, None] * (
+            1 - array(_COUPLING_COLOR)
+        )
+
+    diagonal = range(n_disciplines)
+    self_coupled = coupling_graph.self_coupled[:, None]
+    colors = self_coupled * array(_SELF_COUPLED_COLOR) + ~self_coupled * array(
+        _DISCIPLINE_COLOR
+    )
+    image[diagonal, diagonal] = 1 - 0.45 * (1 - colors)
+
+    dpi = min(max(100, ceil(n_disciplines / min(fig_size))), 600)
+    figure = Figure(figsize=fig_size, dpi=dpi)
+    axes = figure.add_axes((0, 0, 1, 1))
+    axes.imshow(
+        image,
+        interpolation="nearest",
+        extent=(0, n_disciplines, n_disciplines, 0),
+    )
+    axes.set_axis_off()
+    if n_disciplines <= MAX_LABELED_DISCIPLINES:
+        axes.hlines(diagonal, 0, n_disciplines, colors="black", linewidth=0.5)
+        axes.vlines(diagonal, 0, n_disciplines, colors="black", linewidth=0.5)
+
+    if show_data_names is None:
+        show_discipline_names = n_disciplines <= MAX_LABELED_DISCIPLINES
+        show_coupling_names = n_disciplines <= MAX_LABELED_COUPLINGS
+    else:
+        show_discipline_names = show_coupling_names = show_data_names
+
+    font_size = min(10, max(4, 240 / max(n_disciplines, 1)))
+    if show_discipline_names:
+        for index, name in enumerate(coupling_graph.discipline_names):
+            axes.text(
+                index + 0.5,
+                index + 0.5,
+                name,
+                ha="center",
+                va="center",
+                fontsize=font_size,
+                clip_on=True,
+            )
+
+    if show_coupling_names:
+        for source, target in zip(n2_matrix.row, n2_matrix.col):
+            axes.text(
+                target + 0.5,
+                source + 0.5,
+                "\n".join(coupling_graph.get_coupling_variables(source, target)),
+                ha="center",
+                va="center",
+                fontsize=font_size,
+                clip_on=True,
+            )
+
+    stream = BytesIO()
+    figure.savefig(stream, format=image_format)
+    return stream.getvalue()
+
+
+def get_n2_image(
+    study_hash: str,
+    coupling_graph: CouplingGraph,
+    image_format: str = "png",
+    show_data_names: bool | None = None,
+) -> bytes:
+    """Return the static N2 chart of a study, rendering it if it is not cached.
+
+    Args:
+        study_hash: The hash of the descriptions of the disciplines of the study.
+        coupling_graph: The coupling graph of the study.
+        image_format: The format of the image, e.g. ``"png"`` or ``"svg"``.
+        show_data_names: Whether to show the names of the disciplines
+            and coupling variables; if ``None``, depending on the number of
+            disciplines.
+
+    Returns:
+        The content of the image file.
+    """
+    key = (study_hash, image_format, show_data_names)
+    image = N2_IMAGES.get(key)
+    if image is None:
+        image = render_n2(coupling_graph, image_format, show_data_names)
+        N2_IMAGES.set(key, image, len(image))
+
+    return image
+
+
+def submit_n2_image(
+    study_hash: str,
+    coupling_graph: CouplingGraph,
+    image_format: str = "png",
+    show_data_names: bool | None = None,
+    owner: Hashable = None,
+) -> Job:
+    """Submit the rendering of the static N2 chart of a study to the worker pool.
+
+    Args:
+        study_hash: The hash of the descriptions of the disciplines of the study.
+        coupling_graph: The coupling graph of the study.
+        image_format: The format of the image, e.g. ``"png"`` or ``"svg"``.
+        show_data_names: Whether to show the names of the disciplines
+            and coupling variables; if ``None``, depending on the number of
+            disciplines.
+        owner: The identifier of the session submitting the job.
+
+    Returns:
+        The job rendering the image, already done when the image is cached.
+
+    Raises:
+        RuntimeError: When the queue of the worker pool is full.
+    """
+    key = (study_hash, image_format, show_data_names)
+    image = N2_IMAGES.get(key)
+    if image is not None:
+        return Job.from_result(("n2_image", key), image)
+
+    return JOB_POOL.submit(
+        ("n2_image", key),
+        render_n2,
+        coupling_graph,
+        image_format,
+        show_data_names,
+        owner=owner,
+        callback=lambda image: N2_IMAGES.set(key, image, len(image)),
+    )
+
+
+def create_n2_payload(coupling_graph: CouplingGraph) -> str:
+    """Create the compact JSON description of the N2 chart of a coupling graph.
+
+    The JSON object has the fields:
+
+    - ``disciplines``: the names of the disciplines,
+    - ``variables``: the names of the coupling variables,
+    - ``self_coupled``: whether a discipline is self-coupled, as 0 or 1,
+    - ``groups``: the index of the group of strongly coupled disciplines
+      of a discipline, -1 if it is not strongly coupled,
+    - ``sources`` and ``targets``: the indices of the disciplines
+      producing and consuming the coupling variables of an edge,
+      sorted by source and target,
+    - ``offsets``: the positions of the variables of the edges in ``variable_ids``,
+      the variables of the edge ``k`` being
+      between the positions ``offsets[k]`` and ``offsets[k + 1]``,
+    - ``variable_ids``: the indices of the variables of the edges in ``variables``.
+
+    Args:
+        coupling_graph: The coupling graph.
+
+    Returns:
+        The JSON description of the N2 chart.
+    """
+    from numpy import concatenate
+    from numpy import flatnonzero
+    from numpy import unique
+
+    producers, consumers, variables = coupling_graph.couplings
+    is_edge = producers != consumers
+    producers = producers[is_edge]
+    consumers = consumers[is_edge]
+    variable_names, variable_ids = unique(variables[is_edge], return_inverse=True)
+    starts = flatnonzero(
+        (producers[1:] != producers[:-1]) | (consumers[1:] != consumers[:-1])
+    )
+    starts = concatenate(([0], starts + 1)) if len(producers) else starts
+    return json.dumps(
+        {
+            "disciplines": coupling_graph.discipline_names,
+            "variables": coupling_graph.variable_names[variable_names].tolist(),
+            "self_coupled": coupling_graph.self_coupled.astype(int).tolist(),
+            "groups": coupling_graph.group_indices.tolist(),
+            "sources": producers[starts].tolist(),
+            "targets": consumers[starts].tolist(),
+            "offsets": [*starts.tolist(), len(producers)],
+            "variable_ids": variable_ids.ravel().tolist(),
+        },
+        separators=(",", ":"),
+    )
+
+
+def get_n2_payload(study_hash: str, coupling_graph: CouplingGraph) -> str:
+    """Return the N2 payload of a study, creating it if it is not cached.
+
+    Args:
+        study_hash: The hash of the descriptions of the disciplines of the study.
+        coupling_graph: The coupling graph of the study.
+
+    Returns:
+        The JSON description of the N2 chart.
+    """
+    payload = N2_PAYLOADS.get(study_hash)
+    if payload is None:
+        payload = create_n2_payload(coupling_graph)
+        N2_PAYLOADS.set(study_hash, payload, len(payload))
+
+    return payload
+
+
+def generate_n2_html(coupling_structure: MDOCouplingStructure) -> str:
+    """Generate the standalone HTML file of the interactive N2 chart.
+
+    The HTML file is written to a scratch directory removed right after reading it.
+
+    Args:
+        coupling_structure: The coupling structure of the disciplines.
+
+    Returns:
+        The source code of the HTML file.
+
+    Raises:
+        ValueError: When there are less than two disciplines.
+    """
+    with scratch_directory() as directory_path:
+        coupling_structure.plot_n2_chart(
+            file_path=directory_path / "n2.pdf", save=False, show_html=False
+        )
+        return (directory_path / "n2.html").read_text(encoding="utf-8")
+
+
+def get_n2_html(
+    study_hash: str, get_coupling_structure: Callable[[], MDOCouplingStructure]
+) -> str:
+    """Return the interactive N2 chart of a study, generating it if it is not cached.
+
+    Args:
+        study_hash: The hash of the descriptions of the disciplines of the study.
+        get_coupling_structure: The function returning the coupling structure
+            of the study,
+            only called when the N2 chart is not cached.
+
+    Returns:
+        The source code of the HTML file.
+    """
+    html = N2_HTML.get(study_hash)
+    if html is None:
+        html = generate_n2_html(get_coupling_structure())
+        N2_HTML.set(study_hash, html, len(html))
+
+    return html
+
+
+def _generate_n2_html_from_desc(disc_desc: Sequence[DisciplineDescription]) -> str:
+    """Generate the interactive N2 chart from the descriptions of the disciplines.
+
+    This function is executed in a worker process.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+
+    Returns:
+        The source code of the HTML file.
+    """
+    from gemseo.core.coupling_structure import MDOCouplingStructure
+
+    return generate_n2_html(MDOCouplingStructure(create_disciplines(disc_desc)))
+
+
+def submit_n2_html(
+    study_hash: str,
+    disc_desc: Sequence[DisciplineDescription],
+    owner: Hashable = None,
+) -> Job:
+    """Submit the generation of the interactive N2 chart of a study to the worker pool.
+
+    Args:
+        study_hash: The hash of the descriptions of the disciplines of the study.
+        disc_desc: The descriptions of the disciplines of the study.
+        owner: The identifier of the session submitting the job.
+
+    Returns:
+        The job generating the HTML file, already done when it is cached.
+
+    Raises:
+        RuntimeError: When the queue of the worker pool is full.
+    """
+    html = N2_HTML.get(study_hash)
+    if html is not None:
+        return Job.from_result(("n2_html", study_hash), html)
+
+    return JOB_POOL.submit(
+        ("n2_html", study_hash),
+        _generate_n2_html_from_desc,
+        disc_desc,
+        owner=owner,
+        callback=lambda html: N2_HTML.set(study_hash, html, len(html)),
+    )
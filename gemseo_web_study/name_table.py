@@ -0,0 +1,396 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""Compact tables of the names of the variables of disciplines.
+
+A name is stored once in a :class:`.NameTable` and identified by an integer;
+the input and output names of the disciplines are stored
+as arrays of these integers in the compressed sparse row format,
+i.e. the identifiers of all the disciplines one after the other
+and the offsets of the disciplines in this array.
+
+The sorted lists of names and the positions of the names in these lists
+are computed once per table,
+so that the widgets selecting names do not search them at each rerun.
+A :class:`.NameIndex` searches these lists by prefix, substring or glob pattern
+and returns the matches page by page,
+so that only a page of names is sent to the browser.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from fnmatch import translate
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import Final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+    from re import Pattern
+
+    from numpy.typing import NDArray
+
+
+class NameTable:
+    """A table of names identified by consecutive integers."""
+
+    names: list[str]
+    """The names ordered by identifier."""
+
+    __ids: dict[str, int]
+    """The identifiers bound to the names."""
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        """
+        Args:
+            names: The names to add to the table.
+        """  # noqa: D205 D212 D415
+        self.names = []
+        self.__ids = {}
+        self.intern_all(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__ids
+
+    def intern(self, name: str) -> int:
+        """Add a name to the table if missing.
+
+        Args:
+            name: The name.
+
+        Returns:
+            The identifier of the name.
+        """
+        name_id = self.__ids.get(name)
+        if name_id is None:
+            name_id = self.__ids[name] = len(self.names)
+            self.names.append(name)
+
+        return name_id
+
+    def intern_all(self, names: Iterable[str]) -> list[int]:
+        """Add names to the table if missing.
+
+        Args:
+            names: The names.
+
+        Returns:
+            The identifiers of the names.
+        """
+        ids = self.__ids
+        n_names = len(ids)
+        setdefault = ids.setdefault
+        # The insertion order of the dictionary is the order of the identifiers.
+        name_ids = [setdefault(name, len(ids)) for name in names]
+        self.names.extend(islice(ids, n_names, None))
+        return name_ids
+
+    def get_id(self, name: str) -> int:
+        """Return the identifier of a name.
+
+        Args:
+            name: The name.
+
+        Returns:
+            The identifier of the name.
+
+        Raises:
+            KeyError: When the name is not in the table.
+        """
+        name_id = self.__ids.get(name)
+        if name_id is None:
+            msg = f"{name} is not in the table."
+            raise KeyError(msg)
+
+        return name_id
+
+    def get_names(self, ids: Iterable[int]) -> list[str]:
+        """Return the names bound to identifiers.
+
+        Args:
+            ids: The identifiers.
+
+        Returns:
+            The names.
+        """
+        names = self.names
+        return [names[name_id] for name_id in ids]
+
+
+class NameIndex:
+    """A sorted list of names searchable by prefix, substring and glob pattern."""
+
+    PREFIX: Final[str] = "prefix"
+    """The search of the names starting with a pattern."""
+
+    SUBSTRING: Final[str] = "substring"
+    """The search of the names containing a pattern."""
+
+    GLOB: Final[str] = "glob"
+    """The search of the names matching a glob pattern, e.g. ``g_*``."""
+
+    MODES: Final[tuple[str, ...]] = (PREFIX, SUBSTRING, GLOB)
+    """The search modes."""
+
+    names: list[str]
+    """The sorted names, without duplicates."""
+
+    __positions: dict[str, int]
+    """The positions of the names in :attr:`.names`."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        """
+        Args:
+            names: The names, possibly duplicated.
+        """  # noqa: D205 D212 D415
+        self.names = sorted(set(names))
+        self.__positions = {name: position for position, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__positions
+
+    def get_position(self, name: str) -> int | None:
+        """Return the position of a name in :attr:`.names`.
+
+        Args:
+            name: The name.
+
+        Returns:
+            The position of the name, if it is in the index.
+        """
+        return self.__positions.get(name)
+
+    def search(self, pattern: str, mode: str = PREFIX) -> list[str]:
+        """Return the names matching a pattern.
+
+        The prefix search and the glob patterns starting with literal characters
+        only scan the range of the sorted names starting with these characters.
+
+        Args:
+            pattern: The pattern; if empty, all the names match.
+            mode: The search mode, one of :attr:`.MODES`.
+
+        Returns:
+            The sorted names matching the pattern.
+
+        Raises:
+            ValueError: When the search mode is not supported.
+        """
+        if mode not in self.MODES:
+            msg = f"The search mode {mode!r} is not one of {', '.join(self.MODES)}."
+            raise ValueError(msg)
+
+        if not pattern:
+            return list(self.names)
+
+        if mode == self.SUBSTRING:
+            return [name for name in self.names if pattern in name]
+
+        if mode == self.PREFIX:
+            return self.names[slice(*self.__get_prefix_range(pattern))]
+
+        start, end = self.__get_prefix_range(re.split(r"[*?[]", pattern, maxsplit=1)[0])
+        match = self.__compile_glob(pattern).match
+        return [name for name in self.names[start:end] if match(name)]
+
+    def get_page(
+        self, pattern: str, mode: str = PREFIX, page: int = 1, page_size: int = 50
+    ) -> tuple[list[str], int]:
+        """Return a page of the names matching a pattern.
+
+        Args:
+            pattern: The pattern; if empty, all the names match.
+            mode: The search mode, one of :attr:`.MODES`.
+            page: The page, starting at 1.
+            page_size: The number of names per page.
+
+        Returns:
+            The names of the page and the number of names matching the pattern.
+
+        Raises:
+            ValueError: When the search mode is not supported.
+        """
+        names = self.search(pattern, mode)
+        start = (page - 1) * page_size
+        return names[start : start + page_size], len(names)
+
+    def __get_prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Return the range of the names starting with a prefix.
+
+        Args:
+            prefix: The prefix.
+
+        Returns:
+            The start and the end positions of the names in :attr:`.names`.
+        """
+        start = bisect_left(self.names, prefix)
+        if not prefix:
+            return start, len(self.names)
+
+        # The smallest string greater than all the strings starting with the prefix.
+        end = bisect_left(self.names, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo=start)
+        return start, end
+
+    @staticmethod
+    def __compile_glob(pattern: str) -> Pattern:
+        """Compile a case-sensitive glob pattern.
+
+        Args:
+            pattern: The glob pattern.
+
+        Returns:
+            The regular expression matching the whole names.
+        """
+        return re.compile(translate(pattern))
+
+
+class DisciplinesTable:
+    """The input and output names of disciplines stored as arrays of identifiers.
+
+    The disciplines are identified by their positions in the descriptions.
+    """
+
+    discipline_names: list[str]
+    """The names of the disciplines."""
+
+    input_ids: NDArray[int]
+    """The identifiers of the input names of the disciplines one after the other."""
+
+    input_offsets: NDArray[int]
+    """The positions of the input names of the disciplines in :attr:`.input_ids`.
+
+    The input names of the discipline ``i``
+    are between the positions ``input_offsets[i]`` and ``input_offsets[i + 1]``.
+    """
+
+    names: NameTable
+    """The table of the names of the variables."""
+
+    output_ids: NDArray[int]
+    """The identifiers of the output names of the disciplines one after the other."""
+
+    output_offsets: NDArray[int]
+    """The positions of the output names of the disciplines in :attr:`.output_ids`.
+
+    The output names of the discipline ``i``
+    are between the positions ``output_offsets[i]`` and ``output_offsets[i + 1]``.
+    """
+
+    input_index: NameIndex
+    """The index of the names of the inputs of all the disciplines."""
+
+    output_index: NameIndex
+    """The index of the names of the outputs of all the disciplines."""
+
+    def __init__(self, disc_desc: Iterable[Iterable]) -> None:
+        """
+        Args:
+            disc_desc: The descriptions of the disciplines,
+                each one being the name, the input names and the output names.
+        """  # noqa: D205 D212 D415
+        from numpy import array
+        from numpy import int32
+        from numpy import unique
+
+        disc_desc = list(disc_desc)
+        self.names = names = NameTable()
+        self.discipline_names = [name for name, _, _ in disc_desc]
+        self.input_ids = array(
+            names.intern_all(
+                name for _, input_names, _ in disc_desc for name in input_names
+            ),
+            dtype=int32,
+        )
+        self.output_ids = array(
+            names.intern_all(
+                name for _, _, output_names in disc_desc for name in output_names
+            ),
+            dtype=int32,
+        )
+        n_inputs = [len(input_names) for _, input_names, _ in disc_desc]
+        n_outputs = [len(output_names) for _, _, output_names in disc_desc]
+        self.input_offsets = self.__compute_offsets(n_inputs)
+        self.output_offsets = self.__compute_offsets(n_outputs)
+        self.input_index = NameIndex(names.get_names(unique(self.input_ids).tolist()))
+        self.output_index = NameIndex(names.get_names(unique(self.output_ids).tolist()))
+
+    @staticmethod
+    def __compute_offsets(sizes: Sequence[int]) -> NDArray[int]:
+        """Compute the offsets of consecutive blocks from their sizes.
+
+        Args:
+            sizes: The sizes of the blocks.
+
+        Returns:
+            The offsets of the blocks followed by the total size.
+        """
+        from numpy import cumsum
+        from numpy import int32
+        from numpy import zeros
+
+        offsets = zeros(len(sizes) + 1, dtype=int32)
+        cumsum(sizes, out=offsets[1:])
+        return offsets
+
+    @property
+    def n_disciplines(self) -> int:
+        """The number of disciplines."""
+        return len(self.discipline_names)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the arrays of identifiers in bytes."""
+        return (
+            self.input_ids.nbytes
+            + self.input_offsets.nbytes
+            + self.output_ids.nbytes
+            + self.output_offsets.nbytes
+        )
+
+    def get_input_names(self, index: int) -> list[str]:
+        """Return the input names of a discipline.
+
+        Args:
+            index: The index of the discipline.
+
+        Returns:
+            The input names of the discipline.
+        """
+        start, end = self.input_offsets[index : index + 2]
+        return self.names.get_names(self.input_ids[start:end].tolist())
+
+    def get_output_names(self, index: int) -> list[str]:
+        """Return the output names of a discipline.
+
+        Args:
+            index: The index of the discipline.
+
+        Returns:
+            The output names of the discipline.
+        """
+        start, end = self.output_offsets[index : index + 2]
+        return self.names.get_names(self.output_ids[start:end].tolist())
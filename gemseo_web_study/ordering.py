@@ -0,0 +1,455 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The order of the disciplines minimizing the feedback couplings of the N2 chart.
+
+A feedback coupling is an edge of the coupling graph
+from a discipline to a discipline placed before it,
+i.e. a cell below the diagonal of the N2 chart;
+a Gauss-Seidel MDA uses the value of the previous iteration for such a coupling.
+
+The groups of strongly connected disciplines are placed in a topological order
+of the condensed graph, so that no feedback coupling remains between them,
+the order of the descriptions being kept when possible.
+Then the disciplines of a group are ordered
+to minimize the feedback couplings between them,
+which is a minimum feedback arc set problem:
+it is solved exactly by dynamic programming over the subsets of disciplines
+for the groups of at most :attr:`.MAX_EXACT_SIZE` disciplines
+and approximately for the larger groups,
+by the greedy heuristic of Eades, Lin and Smyth
+followed by swaps of adjacent disciplines.
+The order of a group is only changed when it has fewer feedback couplings.
+"""
+
+from __future__ import annotations
+
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+from typing import TYPE_CHECKING
+from typing import Final
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import NDArray
+    from pandas import DataFrame
+
+    from gemseo_web_study.coupling_graph import CouplingGraph
+
+MAX_EXACT_SIZE: Final[int] = 16
+"""The maximum number of disciplines of a group ordered exactly."""
+
+MAX_SWAP_PASSES: Final[int] = 100
+"""The maximum number of passes of swaps of adjacent disciplines of a large group."""
+
+EXACT: Final[str] = "exact"
+"""The method ordering a group exactly."""
+
+HEURISTIC: Final[str] = "heuristic"
+"""The method ordering a group approximately."""
+
+
+class FeedbackOrdering:
+    """The order of the disciplines minimizing the feedback couplings."""
+
+    feedbacks: int
+    """The number of feedback couplings with the optimized order."""
+
+    initial_feedbacks: int
+    """The number of feedback couplings with the order of the descriptions."""
+
+    order: NDArray[int]
+    """The indices of the disciplines in the optimized order."""
+
+    __groups: list[tuple[int, int, int, int, str]]
+    """The index, the size, the initial and optimized numbers of feedback couplings
+    and the ordering method of each group of strongly coupled disciplines."""
+
+    def __init__(self, coupling_graph: CouplingGraph) -> None:
+        """
+        Args:
+            coupling_graph: The coupling graph of the disciplines.
+        """  # noqa: D205 D212 D415
+        from numpy import arange
+        from numpy import array
+        from numpy import concatenate
+
+        n_disciplines = coupling_graph.n_disciplines
+        adjacency = coupling_graph.adjacency.tocoo()
+        is_edge = adjacency.row != adjacency.col
+        producers = adjacency.row[is_edge]
+        consumers = adjacency.col[is_edge]
+        labels = coupling_graph.group_labels
+        self.initial_feedbacks = self.count_feedbacks(
+            producers, consumers, arange(n_disciplines)
+        )
+
+        # The disciplines of each strongly connected component, in initial order.
+        members = [[] for _ in range(coupling_graph.n_groups)]
+        for index, label in enumerate(labels.tolist()):
+            members[label].append(index)
+
+        is_internal = labels[producers] == labels[consumers]
+        successors = [[] for _ in range(n_disciplines)]
+        for producer, consumer in zip(
+            producers[is_internal].tolist(), consumers[is_internal].tolist()
+        ):
+            successors[producer].append(consumer)
+
+        group_indices = coupling_graph.group_indices
+        self.__groups = []
+        for disciplines in members:
+            if len(disciplines) < 2:
+                continue
+
+            order, initial_feedbacks, feedbacks, method = self.__order_group(
+                disciplines, successors
+            )
+            disciplines[:] = order
+            self.__groups.append((
+                int(group_indices[disciplines[0]]),
+                len(disciplines),
+                initial_feedbacks,
+                feedbacks,
+                method,
+            ))
+
+        self.__groups.sort()
+        components = self.__sort_components(
+            labels[producers[~is_internal]], labels[consumers[~is_internal]], members
+        )
+        self.order = (
+            concatenate([array(members[label]) for label in components])
+            if n_disciplines
+            else arange(0)
+        )
+        self.feedbacks = self.count_feedbacks(producers, consumers, self.order)
+
+    @staticmethod
+    def count_feedbacks(
+        producers: NDArray[int], consumers: NDArray[int], order: NDArray[int]
+    ) -> int:
+        """Count the feedback couplings of an order of the disciplines.
+
+        Args:
+            producers: The indices of the disciplines producing coupling variables.
+            consumers: The indices of the disciplines consuming them.
+            order: The indices of the disciplines in order.
+
+        Returns:
+            The number of edges from a discipline to a discipline placed before it.
+        """
+        from numpy import arange
+        from numpy import empty_like
+
+        positions = empty_like(order)
+        positions[order] = arange(len(order))
+        return int((positions[producers] > positions[consumers]).sum())
+
+    @staticmethod
+    def __sort_components(
+        sources: NDArray[int], targets: NDArray[int], members: Sequence[Sequence[int]]
+    ) -> list[int]:
+        """Sort the strongly connected components topologically.
+
+        Among the components ready to be placed,
+        the one with the first discipline in the initial order is placed first.
+
+        Args:
+            sources: The components producing the variables of the edges between them.
+            targets: The components consuming them.
+            members: The disciplines of each component.
+
+        Returns:
+            The components in topological order.
+        """
+        n_components = len(members)
+        successors = [set() for _ in range(n_components)]
+        for source, target in zip(sources.tolist(), targets.tolist()):
+            successors[source].add(target)
+
+        predecessor_counts = [0] * n_components
+        for component_successors in successors:
+            for target in component_successors:
+                predecessor_counts[target] += 1
+
+        first_disciplines = [min(disciplines) for disciplines in members]
+        ready = [
+            (first_disciplines[component], component)
+            for component, count in enumerate(predecessor_counts)
+            if not count
+        ]
+        heapify(ready)
+        components = []
+        while ready:
+            _, component = heappop(ready)
+            components.append(component)
+            for target in successors[component]:
+                predecessor_counts[target] -= 1
+                if not predecessor_counts[target]:
+                    heappush(ready, (first_disciplines[target], target))
+
+        return components
+
+    @classmethod
+    def __order_group(
+        cls, disciplines: Sequence[int], successors: Sequence[Sequence[int]]
+    ) -> tuple[list[int], int, int, str]:
+        """Order the disciplines of a group to minimize its feedback couplings.
+
+        Args:
+            disciplines: The disciplines of the group, in initial order.
+            successors: The disciplines of the same group
+                consuming the outputs of each discipline.
+
+        Returns:
+            The disciplines in optimized order,
+            the initial and optimized numbers of feedback couplings
+            and the ordering method.
+        """
+        positions = {discipline: i for i, discipline in enumerate(disciplines)}
+        local_successors = [
+            [positions[successor] for successor in successors[discipline]]
+            for discipline in disciplines
+        ]
+        n_disciplines = len(disciplines)
+        initial_feedbacks = sum(
+            successor < i
+            for i, group_successors in enumerate(local_successors)
+            for successor in group_successors
+        )
+        if n_disciplines <= MAX_EXACT_SIZE:
+            order, feedbacks = cls.__order_exactly(local_successors)
+            method = EXACT
+        else:
+            order, feedbacks = cls.__order_approximately(local_successors)
+            method = HEURISTIC
+
+        if feedbacks >= initial_feedbacks:
+            return list(disciplines), initial_feedbacks, initial_feedbacks, method
+
+        return [disciplines[i] for i in order], initial_feedbacks, feedbacks, method
+
+    @staticmethod
+    def __order_exactly(successors: Sequence[Sequence[int]]) -> tuple[list[int], int]:
+        """Order the nodes of a graph with the minimum number of feedback edges.
+
+        The minimum number of feedback edges of the subset ``S`` of nodes
+        placed first is the minimum over the node ``v`` of ``S`` placed last
+        of the one of ``S - {v}``
+        plus the number of edges from ``v`` to ``S - {v}``.
+        The subsets are processed by increasing size with vectorized operations.
+
+        Args:
+            successors: The successors of each node.
+
+        Returns:
+            The nodes in optimal order and the number of feedback edges.
+        """
+        from numpy import arange
+        from numpy import full
+        from numpy import int64
+        from numpy import zeros
+
+        n_nodes = len(successors)
+        n_subsets = 1 << n_nodes
+        subsets = arange(n_subsets, dtype=int64)
+        sizes = zeros(n_subsets, dtype=int64)
+        for node in range(n_nodes):
+            sizes += (subsets >> node) & 1
+
+        successor_masks = [
+            sum(1 << successor for successor in node_successors)
+            for node_successors in successors
+        ]
+        costs = full(n_subsets, n_nodes * n_nodes, dtype=int64)
+        costs[0] = 0
+        last_nodes = zeros(n_subsets, dtype=int64)
+        for size in range(1, n_nodes + 1):
+            layer = subsets[sizes == size]
+            # The last node with the highest index wins the ties
+            # so that an order without feedback edges is kept.
+            for node in range(n_nodes):
+                bit = 1 << node
+                layer_subsets = layer[(layer & bit) != 0]
+                previous = layer_subsets ^ bit
+                candidates = costs[previous] + sizes[previous & successor_masks[node]]
+                is_better = candidates <= costs[layer_subsets]
+                costs[layer_subsets[is_better]] = candidates[is_better]
+                last_nodes[layer_subsets[is_better]] = node
+
+        order = []
+        subset = n_subsets - 1
+        while subset:
+            node = int(last_nodes[subset])
+            order.append(node)
+            subset ^= 1 << node
+
+        return order[::-1], int(costs[-1])
+
+    @staticmethod
+    def __order_approximately(
+        successors: Sequence[Sequence[int]],
+    ) -> tuple[list[int], int]:
+        """Order the nodes of a graph with few feedback edges.
+
+        The heuristic of Eades, Lin and Smyth removes the sinks,
+        placed at the end, and the sources, placed at the beginning,
+        and otherwise the node maximizing its out-degree minus its in-degree,
+        placed at the beginning;
+        then two adjacent nodes are swapped
+        when an edge goes from the second one to the first one only.
+
+        Args:
+            successors: The successors of each node.
+
+        Returns:
+            The nodes in order and the number of feedback edges.
+        """
+        n_nodes = len(successors)
+        predecessors = [[] for _ in range(n_nodes)]
+        for node, node_successors in enumerate(successors):
+            for successor in node_successors:
+                predecessors[successor].append(node)
+
+        out_degrees = [len(node_successors) for node_successors in successors]
+        in_degrees = [len(node_predecessors) for node_predecessors in predecessors]
+        is_removed = [False] * n_nodes
+        sinks = [node for node in range(n_nodes) if not out_degrees[node]]
+        sources = [node for node in range(n_nodes) if not in_degrees[node]]
+        # The nodes by decreasing out-degree minus in-degree, updated lazily.
+        nodes = [
+            (in_degrees[node] - out_degrees[node], node) for node in range(n_nodes)
+        ]
+        heapify(nodes)
+        head = []
+        tail = []
+
+        def remove(node: int) -> None:
+            """Remove a node and update the degrees of its neighbors.
+
+            Args:
+                node: The node.
+            """
+            is_removed[node] = True
+            for successor in successors[node]:
+                if not is_removed[successor]:
+                    in_degrees[successor] -= 1
+                    if not in_degrees[successor]:
+                        sources.append(successor)
+                    heappush(
+                        nodes,
+                        (in_degrees[successor] - out_degrees[successor], successor),
+                    )
+
+            for predecessor in predecessors[node]:
+                if not is_removed[predecessor]:
+                    out_degrees[predecessor] -= 1
+                    if not out_degrees[predecessor]:
+                        sinks.append(predecessor)
+                    heappush(
+                        nodes,
+                        (
+                            in_degrees[predecessor] - out_degrees[predecessor],
+                            predecessor,
+                        ),
+                    )
+
+        while len(head) + len(tail) < n_nodes:
+            if sinks:
+                node = sinks.pop()
+                if not is_removed[node]:
+                    tail.append(node)
+                    remove(node)
+            elif sources:
+                node = sources.pop()
+                if not is_removed[node]:
+                    head.append(node)
+                    remove(node)
+            else:
+                delta, node = heappop(nodes)
+                if not is_removed[node] and delta == (
+                    in_degrees[node] - out_degrees[node]
+                ):
+                    head.append(node)
+                    remove(node)
+
+        order = head + tail[::-1]
+        edges = {
+            (node, successor)
+            for node, node_successors in enumerate(successors)
+            for successor in node_successors
+        }
+        for _ in range(MAX_SWAP_PASSES):
+            swapped = False
+            for i in range(n_nodes - 1):
+                first, second = order[i], order[i + 1]
+                if (second, first) in edges and (first, second) not in edges:
+                    order[i], order[i + 1] = second, first
+                    swapped = True
+
+            if not swapped:
+                break
+
+        positions = [0] * n_nodes
+        for position, node in enumerate(order):
+            positions[node] = position
+
+        feedbacks = sum(
+            positions[successor] < positions[node]
+            for node, node_successors in enumerate(successors)
+            for successor in node_successors
+        )
+        return order, feedbacks
+
+    def get_disc_desc(self, disc_desc: Sequence[Sequence]) -> list[Sequence]:
+        """Return the descriptions of the disciplines in the optimized order.
+
+        Args:
+            disc_desc: The descriptions of the disciplines in initial order.
+
+        Returns:
+            The descriptions of the disciplines in the optimized order.
+        """
+        return [disc_desc[index] for index in self.order.tolist()]
+
+    def get_groups(self) -> DataFrame:
+        """Return the numbers of feedback couplings of the groups.
+
+        Returns:
+            The size, the initial and optimized numbers of feedback couplings
+            and the ordering method of each group of strongly coupled disciplines,
+            numbered from 1 as in :attr:`.CouplingGraph.strongly_coupled_groups`.
+        """
+        from pandas import DataFrame
+
+        return DataFrame(
+            [
+                (index + 1, size, initial_feedbacks, feedbacks, method)
+                for index, size, initial_feedbacks, feedbacks, method in self.__groups
+            ],
+            columns=[
+                "Group",
+                "Disciplines",
+                "Initial feedbacks",
+                "Optimized feedbacks",
+                "Method",
+            ],
+        )
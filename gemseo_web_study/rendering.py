@@ -0,0 +1,243 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The rendering of the diagrams of a study in the background.
+
+The diagrams are rendered by the worker pool
+while the last rendered version remains available.
+
+A new version of a diagram is identified by a generation number,
+incremented when the data it depends on change.
+The rendering is debounced:
+it is submitted once the data have not changed for a given delay
+so that successive edits, e.g. typing the names of variables,
+do not submit renderings made obsolete by the next edit.
+The rendering of a superseded generation is cancelled if it is still queued
+and its result is ignored otherwise.
+
+The debouncing delay can be set with the environment variable
+``GEMSEO_WEB_STUDY_DEBOUNCE_DELAY`` in seconds.
+"""
+
+from __future__ import annotations
+
+import os
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import ClassVar
+from typing import Final
+
+from gemseo_web_study.jobs import JOB_POOL
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from gemseo_web_study.jobs import Job
+    from gemseo_web_study.study import Study
+
+DEBOUNCE_DELAY: Final[float] = float(
+    os.environ.get("GEMSEO_WEB_STUDY_DEBOUNCE_DELAY", 0.5)
+)
+"""The default debouncing delay in seconds."""
+
+
+class BackgroundRenderer:
+    """The rendering of the diagrams of a study in the background, debounced.
+
+    A diagram is a stage of the study that can be evaluated by the worker pool.
+    It is rendered once requested with :meth:`.request`
+    and then each time its data change, when :meth:`.poll` is called.
+    """
+
+    KEY_STAGES: ClassVar[dict[str, str]] = {
+        "n2_image": "hash",
+        "n2_html": "hash",
+        "xdsm_html": "scenario_key",
+    }
+    """The names of the diagrams bound to the stages identifying their versions."""
+
+    debounce_delay: float
+    """The time in seconds for which the data must not change before rendering."""
+
+    study: Study
+    """The study."""
+
+    __change_times: dict[str, float]
+    """The times of the last changes of the data of the diagrams."""
+
+    __errors: dict[str, Exception | None]
+    """The errors raised when rendering the last generations of the diagrams."""
+
+    __generations: dict[str, int]
+    """The generations of the diagrams."""
+
+    __jobs: dict[str, tuple[int, Job]]
+    """The jobs rendering the diagrams with the generations they render."""
+
+    __keys: dict[str, Hashable]
+    """The keys identifying the versions of the diagrams."""
+
+    __rendered_generations: dict[str, int]
+    """The last rendered generations of the diagrams, successfully or not."""
+
+    __results: dict[str, tuple[int, Any]]
+    """The last successfully rendered generations of the diagrams and their values."""
+
+    def __init__(self, study: Study, debounce_delay: float = DEBOUNCE_DELAY) -> None:
+        """
+        Args:
+            study: The study.
+            debounce_delay: The time in seconds for which the data must not change
+                before rendering.
+        """  # noqa: D205 D212 D415
+        self.debounce_delay = debounce_delay
+        self.study = study
+        self.__change_times = {}
+        self.__errors = {}
+        self.__generations = {}
+        self.__jobs = {}
+        self.__keys = {}
+        self.__rendered_generations = {}
+        self.__results = {}
+
+    def is_requested(self, diagram: str) -> bool:
+        """Whether a diagram has been requested.
+
+        Args:
+            diagram: The name of the diagram.
+
+        Returns:
+            Whether the diagram has been requested.
+        """
+        return diagram in self.__generations
+
+    def request(self, diagram: str) -> int:
+        """Request the latest version of a diagram.
+
+        When the data of the diagram changed since the last request,
+        a new generation is started
+        and the rendering of the previous one is cancelled.
+
+        Args:
+            diagram: The name of the diagram, one of :attr:`.KEY_STAGES`.
+
+        Returns:
+            The generation of the diagram.
+        """
+        key = self.study.get(self.KEY_STAGES[diagram])
+        if diagram in self.__generations and key == self.__keys[diagram]:
+            return self.__generations[diagram]
+
+        self.__keys[diagram] = key
+        self.__generations[diagram] = self.__generations.get(diagram, 0) + 1
+        self.__change_times[diagram] = perf_counter()
+        if diagram in self.__jobs:
+            JOB_POOL.cancel(self.__jobs.pop(diagram)[1])
+
+        return self.__generations[diagram]
+
+    def get_delay(self, diagram: str) -> float:
+        """Return the remaining debouncing delay of a diagram.
+
+        Args:
+            diagram: The name of the diagram.
+
+        Returns:
+            The time in seconds before submitting the rendering of the diagram.
+        """
+        return max(
+            0.0,
+            self.__change_times[diagram] + self.debounce_delay - perf_counter(),
+        )
+
+    def is_up_to_date(self, diagram: str) -> bool:
+        """Whether the latest generation of a diagram has been rendered.
+
+        Args:
+            diagram: The name of the diagram.
+
+        Returns:
+            Whether the latest generation of the diagram has been rendered,
+            successfully or not.
+        """
+        return self.__rendered_generations.get(diagram) == self.__generations[diagram]
+
+    def get_result(self, diagram: str) -> tuple[int, Any] | None:
+        """Return the last successfully rendered version of a diagram.
+
+        Args:
+            diagram: The name of the diagram.
+
+        Returns:
+            The generation and the value of the last rendered version of the diagram,
+            if any.
+        """
+        return self.__results.get(diagram)
+
+    def get_error(self, diagram: str) -> Exception | None:
+        """Return the error raised when rendering the latest generation of a diagram.
+
+        Args:
+            diagram: The name of the diagram.
+
+        Returns:
+            The error, if any.
+        """
+        if not self.is_up_to_date(diagram):
+            return None
+
+        return self.__errors.get(diagram)
+
+    def poll(self, diagram: str, owner: Hashable = None) -> Job | None:
+        """Update the rendering of the latest generation of a diagram.
+
+        The rendering is submitted to the worker pool
+        once the debouncing delay has elapsed
+        and its result is stored when it is done,
+        provided that it renders the latest generation.
+
+        Args:
+            diagram: The name of the diagram.
+            owner: The identifier of the session rendering the diagram.
+
+        Returns:
+            The job rendering the latest generation of the diagram,
+            if submitted and not up to date before this call.
+
+        Raises:
+            RuntimeError: When the queue of the worker pool is full.
+        """
+        generation = self.__generations[diagram]
+        if diagram not in self.__jobs:
+            if self.is_up_to_date(diagram) or self.get_delay(diagram):
+                return None
+
+            self.__jobs[diagram] = (generation, self.study.submit(diagram, owner))
+
+        job_generation, job = self.__jobs[diagram]
+        if job.future.done():
+            del self.__jobs[diagram]
+            if job_generation == generation and not job.future.cancelled():
+                error = self.__errors[diagram] = job.future.exception()
+                if error is None:
+                    self.__results[diagram] = (generation, job.future.result())
+
+                self.__rendered_generations[diagram] = generation
+
+        return job
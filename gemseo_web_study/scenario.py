@@ -0,0 +1,126 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The creation of the disciplines and scenario of a study from their definitions.
+
+The definitions are made of names only
+so that they can be sent to other processes.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+
+    from gemseo.core.discipline import MDODiscipline
+    from gemseo.core.doe_scenario import DOEScenario
+    from gemseo.core.mdo_scenario import MDOScenario
+
+    from gemseo_web_study.study import DisciplineDescription
+
+CONSTRAINT_TYPES: Final[dict[str, str]] = {"inequality": "ineq", "equality": "eq"}
+"""The GEMSEO constraint types bound to the constraint types shown to the user."""
+
+
+@cache
+def get_formulations() -> tuple[str, ...]:
+    """Return the names of the available MDO formulations, once per process.
+
+    Returns:
+        The names of the MDO formulations.
+    """
+    from gemseo import get_available_formulations
+
+    return tuple(get_available_formulations())
+
+
+def create_disciplines(
+    disc_desc: Iterable[DisciplineDescription],
+) -> list[MDODiscipline]:
+    """Create scalable linear disciplines from their descriptions.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+
+    Returns:
+        The disciplines.
+    """
+    from gemseo.core.discipline import MDODiscipline
+    from gemseo.problems.scalable.linear.disciplines_generator import (
+        create_disciplines_from_desc,
+    )
+
+    return create_disciplines_from_desc(
+        disc_desc, grammar_type=MDODiscipline.GrammarType.SIMPLE
+    )
+
+
+def build_scenario(
+    disciplines: Sequence[MDODiscipline],
+    formulation: str,
+    objective: str,
+    maximize_objective: bool,
+    design_variables: Iterable[str],
+    constraints: Iterable[tuple[str, str]],
+    scenario_type: str = "MDO",
+    **formulation_options: Any,
+) -> MDOScenario | DOEScenario:
+    """Create a scenario.
+
+    Args:
+        disciplines: The disciplines.
+        formulation: The name of the MDO formulation.
+        objective: The name of the objective.
+        maximize_objective: Whether to maximize the objective.
+        design_variables: The names of the design variables.
+        constraints: The names of the constraints and their types,
+            i.e. the keys of :attr:`.CONSTRAINT_TYPES`.
+        scenario_type: The type of the scenario, either ``"MDO"`` or ``"DOE"``.
+        **formulation_options: The options of the MDO formulation.
+
+    Returns:
+        The scenario.
+    """
+    from gemseo import create_design_space
+    from gemseo import create_scenario
+    from gemseo.core.discipline import MDODiscipline
+
+    design_space = create_design_space()
+    for name in design_variables:
+        design_space.add_variable(name=name)
+
+    scenario = create_scenario(
+        design_space=design_space,
+        objective_name=objective,
+        maximize_objective=maximize_objective,
+        disciplines=disciplines,
+        formulation=formulation,
+        scenario_type=scenario_type,
+        grammar_type=MDODiscipline.GrammarType.SIMPLE,
+        **formulation_options,
+    )
+    for name, constraint_type in constraints:
+        scenario.add_constraint(name, constraint_type=CONSTRAINT_TYPES[constraint_type])
+
+    return scenario
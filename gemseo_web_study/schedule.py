@@ -0,0 +1,346 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The schedule of the execution of disciplines on parallel workers.
+
+The schedule is derived from the coupling graph only, without any discipline,
+as the sequence of tasks of an MDA chain:
+a group of strongly coupled disciplines is a task, executed by an MDA,
+and a discipline which is not strongly coupled is a task on its own.
+These tasks form the condensed graph of the couplings, which is acyclic.
+
+A task can be executed once the tasks producing its inputs are executed;
+the tasks of a same topological level can be executed concurrently.
+The cost of a task is the sum of the costs of its disciplines,
+1 by default,
+so that the cost of a group is the cost of an iteration of its MDA
+executing its disciplines one after the other.
+"""
+
+from __future__ import annotations
+
+from heapq import heappop
+from heapq import heappush
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from numpy.typing import NDArray
+
+    from gemseo_web_study.coupling_graph import CouplingGraph
+
+
+class ExecutionSchedule:
+    """The schedule of the execution of disciplines on parallel workers.
+
+    The tasks are identified by the labels of the strongly connected components
+    of the coupling graph.
+    """
+
+    costs: NDArray[float]
+    """The cost of each task."""
+
+    critical_path: list[int]
+    """The tasks of the most costly path of the condensed graph, in execution order."""
+
+    critical_path_cost: float
+    """The cost of the critical path, i.e. the minimum duration of the execution."""
+
+    levels: list[list[int]]
+    """The tasks of each topological level, which can be executed concurrently."""
+
+    tasks: list[list[int]]
+    """The indices of the disciplines of each task."""
+
+    total_cost: float
+    """The cost of all the tasks, i.e. the duration of the execution on one worker."""
+
+    __coupling_graph: CouplingGraph
+    """The coupling graph."""
+
+    __group_indices: NDArray[int]
+    """The index of the group of strongly coupled disciplines of each discipline."""
+
+    __bottom_costs: list[float]
+    """The cost of the most costly path from each task to the end of the execution."""
+
+    __predecessor_counts: list[int]
+    """The number of tasks producing the inputs of each task."""
+
+    __speedups: dict[int, float]
+    """The speedups bound to the numbers of workers, once computed."""
+
+    __successors: list[list[int]]
+    """The tasks consuming the outputs of each task."""
+
+    def __init__(
+        self, coupling_graph: CouplingGraph, costs: Mapping[str, float] | None = None
+    ) -> None:
+        """
+        Args:
+            coupling_graph: The coupling graph of the disciplines.
+            costs: The costs of the disciplines bound to their names;
+                the cost of a discipline missing from this mapping is 1.
+                If ``None``, all the costs are 1.
+
+        Raises:
+            ValueError: When a cost is negative.
+        """  # noqa: D205 D212 D415
+        from numpy import argsort
+        from numpy import bincount
+        from numpy import cumsum
+        from numpy import flatnonzero
+        from numpy import ones
+        from numpy import split
+        from numpy import unique
+
+        self.__coupling_graph = coupling_graph
+        self.__group_indices = coupling_graph.group_indices
+        discipline_costs = ones(coupling_graph.n_disciplines)
+        if costs:
+            if min(costs.values()) < 0:
+                msg = "The costs of the disciplines must be non-negative."
+                raise ValueError(msg)
+
+            for index, name in enumerate(coupling_graph.discipline_names):
+                discipline_costs[index] = costs.get(name, 1.0)
+
+        labels = coupling_graph.group_labels
+        n_tasks = coupling_graph.n_groups
+        order = argsort(labels, kind="stable")
+        sizes = bincount(labels, minlength=n_tasks)
+        self.tasks = [task.tolist() for task in split(order, cumsum(sizes)[:-1])]
+        self.costs = bincount(labels, weights=discipline_costs, minlength=n_tasks)
+        self.total_cost = float(self.costs.sum())
+
+        # The edges of the condensed graph, without duplicates.
+        adjacency = coupling_graph.adjacency.tocoo()
+        sources = labels[adjacency.row]
+        targets = labels[adjacency.col]
+        is_edge = sources != targets
+        edges = unique(sources[is_edge] * n_tasks + targets[is_edge])
+        sources, targets = edges // n_tasks, edges % n_tasks
+        positions = cumsum(bincount(sources, minlength=n_tasks))
+        self.__successors = [
+            successors.tolist() for successors in split(targets, positions[:-1])
+        ]
+        self.__predecessor_counts = bincount(targets, minlength=n_tasks).tolist()
+        self.__speedups = {}
+
+        task_levels = self.__compute_levels(sources, targets)
+        n_levels = int(task_levels.max()) + 1 if n_tasks else 0
+        self.levels = [
+            flatnonzero(task_levels == level).tolist() for level in range(n_levels)
+        ]
+        self.__compute_costs_to_end()
+        self.__compute_critical_path()
+
+    def __compute_levels(
+        self, sources: NDArray[int], targets: NDArray[int]
+    ) -> NDArray[int]:
+        """Compute the topological level of each task.
+
+        The level of a task is the number of edges
+        of the longest path of the condensed graph ending with this task.
+
+        Args:
+            sources: The tasks producing the variables of the edges.
+            targets: The tasks consuming the variables of the edges.
+
+        Returns:
+            The level of each task.
+        """
+        from numpy import bincount
+        from numpy import flatnonzero
+        from numpy import unique
+        from numpy import zeros
+
+        n_tasks = len(self.tasks)
+        predecessor_counts = bincount(targets, minlength=n_tasks)
+        levels = zeros(n_tasks, dtype=int)
+        # The edges sorted by source, as returned by unique.
+        positions = zeros(n_tasks + 1, dtype=int)
+        positions[1:] = bincount(sources, minlength=n_tasks).cumsum()
+        frontier = flatnonzero(predecessor_counts == 0)
+        level = 0
+        while frontier.size:
+            levels[frontier] = level
+            frontier_targets = targets[self.__get_edge_positions(positions, frontier)]
+            predecessor_counts -= bincount(frontier_targets, minlength=n_tasks)
+            frontier_targets = unique(frontier_targets)
+            frontier = frontier_targets[predecessor_counts[frontier_targets] == 0]
+            level += 1
+
+        return levels
+
+    @staticmethod
+    def __get_edge_positions(
+        positions: NDArray[int], tasks: NDArray[int]
+    ) -> NDArray[int]:
+        """Return the positions of the edges leaving tasks.
+
+        Args:
+            positions: The position of the first edge leaving each task,
+                followed by the number of edges.
+            tasks: The tasks.
+
+        Returns:
+            The positions of the edges leaving the tasks.
+        """
+        from numpy import arange
+        from numpy import repeat
+
+        starts = positions[tasks]
+        counts = positions[tasks + 1] - starts
+        offsets = repeat(starts - counts.cumsum() + counts, counts)
+        return arange(counts.sum()) + offsets
+
+    def __compute_costs_to_end(self) -> None:
+        """Compute the cost of the most costly path from each task to the end."""
+        costs = self.costs.tolist()
+        successors = self.__successors
+        bottom_costs = [0.0] * len(costs)
+        for level in reversed(self.levels):
+            for task in level:
+                bottom_costs[task] = costs[task] + max(
+                    (bottom_costs[successor] for successor in successors[task]),
+                    default=0.0,
+                )
+
+        self.__bottom_costs = bottom_costs
+
+    def __compute_critical_path(self) -> None:
+        """Compute the critical path and its cost."""
+        bottom_costs = self.__bottom_costs
+        if not bottom_costs:
+            self.critical_path = []
+            self.critical_path_cost = 0.0
+            return
+
+        sources = [
+            task for task, count in enumerate(self.__predecessor_counts) if not count
+        ]
+        task = max(sources, key=bottom_costs.__getitem__)
+        self.critical_path_cost = bottom_costs[task]
+        self.critical_path = [task]
+        while self.__successors[task]:
+            task = max(self.__successors[task], key=bottom_costs.__getitem__)
+            self.critical_path.append(task)
+
+    @property
+    def n_tasks(self) -> int:
+        """The number of tasks."""
+        return len(self.tasks)
+
+    @property
+    def max_concurrency(self) -> int:
+        """The maximum number of tasks of a level."""
+        return max(map(len, self.levels), default=0)
+
+    @property
+    def max_speedup(self) -> float:
+        """The speedup with an unlimited number of workers."""
+        if not self.critical_path_cost:
+            return 1.0
+
+        return self.total_cost / self.critical_path_cost
+
+    def get_task_name(self, task: int) -> str:
+        """Return the name of a task.
+
+        Args:
+            task: The task.
+
+        Returns:
+            The name of the discipline of the task
+            or the name of the group of strongly coupled disciplines,
+            numbered from 1 as in :attr:`.CouplingGraph.strongly_coupled_groups`.
+        """
+        coupling_graph = self.__coupling_graph
+        disciplines = self.tasks[task]
+        if len(disciplines) == 1:
+            return coupling_graph.discipline_names[disciplines[0]]
+
+        return f"Group {self.__group_indices[disciplines[0]] + 1}"
+
+    def get_makespan(self, n_workers: int) -> float:
+        """Return the duration of the execution on a number of workers.
+
+        The execution is simulated by a list scheduling:
+        whenever a worker is free,
+        it executes the ready task with the most costly path to the end.
+
+        Args:
+            n_workers: The number of workers.
+
+        Returns:
+            The duration of the execution.
+
+        Raises:
+            ValueError: When the number of workers is not positive.
+        """
+        if n_workers < 1:
+            msg = f"The number of workers must be positive, got {n_workers}."
+            raise ValueError(msg)
+
+        costs = self.costs.tolist()
+        bottom_costs = self.__bottom_costs
+        successors = self.__successors
+        predecessor_counts = list(self.__predecessor_counts)
+        ready = [
+            (-bottom_costs[task], task)
+            for task, count in enumerate(predecessor_counts)
+            if not count
+        ]
+        ready.sort()
+        running = []
+        time = 0.0
+        while ready or running:
+            while ready and len(running) < n_workers:
+                _, task = heappop(ready)
+                heappush(running, (time + costs[task], task))
+
+            time, task = heappop(running)
+            for successor in successors[task]:
+                predecessor_counts[successor] -= 1
+                if not predecessor_counts[successor]:
+                    heappush(ready, (-bottom_costs[successor], successor))
+
+        return time
+
+    def get_speedup(self, n_workers: int) -> float:
+        """Return the speedup of the execution on a number of workers.
+
+        Args:
+            n_workers: The number of workers.
+
+        Returns:
+            The ratio of the duration on one worker
+            to the duration on ``n_workers`` workers.
+
+        Raises:
+            ValueError: When the number of workers is not positive.
+        """
+        speedup = self.__speedups.get(n_workers)
+        if speedup is None:
+            makespan = self.get_makespan(n_workers)
+            speedup = self.total_cost / makespan if makespan else 1.0
+            self.__speedups[n_workers] = speedup
+
+        return speedup
@@ -0,0 +1,615 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""A GEMSEO study evaluated incrementally.
+
+A study is defined by its primary data,
+namely the descriptions of the disciplines and the definition of the scenario.
+Everything else is derived by stages
+(disciplines, input and output names, coupling graph, N2, scenario, XDSM)
+organized in a dependency graph.
+A stage is computed on demand
+and only recomputed when one of the data it depends on has changed.
+
+When a few disciplines change,
+the disciplines that did not change are reused
+and the coupling graph is updated incrementally.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from sys import intern
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import ClassVar
+from typing import Final
+
+from gemseo_web_study.cache import COUPLING_STRUCTURES
+from gemseo_web_study.cache import estimate_disciplines_size
+from gemseo_web_study.cache import hash_disc_desc
+from gemseo_web_study.formulation_cost import FormulationCostModel
+from gemseo_web_study.jobs import Job
+from gemseo_web_study.metrics import STAGE_METRICS
+from gemseo_web_study.n2 import get_n2_html
+from gemseo_web_study.n2 import get_n2_image
+from gemseo_web_study.n2 import get_n2_payload
+from gemseo_web_study.n2 import submit_n2_html
+from gemseo_web_study.n2 import submit_n2_image
+from gemseo_web_study.name_table import DisciplinesTable
+from gemseo_web_study.ordering import FeedbackOrdering
+from gemseo_web_study.scenario import build_scenario
+from gemseo_web_study.scenario import create_disciplines
+from gemseo_web_study.schedule import ExecutionSchedule
+from gemseo_web_study.summary import get_summary
+from gemseo_web_study.xdsm import get_xdsm_html
+from gemseo_web_study.xdsm import make_scenario_key
+from gemseo_web_study.xdsm import submit_xdsm_html
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+
+    from gemseo.core.coupling_structure import MDOCouplingStructure
+    from gemseo.core.discipline import MDODiscipline
+    from gemseo.core.mdo_scenario import MDOScenario
+    from pandas import DataFrame
+
+    from gemseo_web_study.coupling_graph import CouplingGraph
+
+DisciplineDescription = tuple[str, tuple[str, ...], tuple[str, ...]]
+"""The description of a discipline: its name, its input names and output names."""
+
+MAX_INCREMENTAL_UPDATES: Final[int] = 10
+"""The maximum number of changed disciplines to update the coupling graph
+incrementally."""
+
+
+def normalize_disc_desc(
+    disc_desc: Iterable[Iterable],
+) -> tuple[DisciplineDescription, ...]:
+    """Normalize the descriptions of the disciplines as nested tuples.
+
+    This allows to compare descriptions coming from the widgets
+    with descriptions loaded from JSON files, which are nested lists.
+    The names are interned
+    so that a variable shared by several disciplines is stored once.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+
+    Returns:
+        The descriptions of the disciplines as nested tuples.
+    """
+    return tuple(
+        (name, tuple(map(intern, input_names)), tuple(map(intern, output_names)))
+        for name, input_names, output_names in disc_desc
+    )
+
+
+class Study:
+    """A GEMSEO study evaluated incrementally.
+
+    The primary data are set with :meth:`.update`
+    and the stages are evaluated with :meth:`.get`.
+    """
+
+    INPUTS: ClassVar[dict[str, Any]] = {
+        "disc_desc": (),
+        "design_variables": (),
+        "formulation": "MDF",
+        "objective": "",
+        "maximize_objective": False,
+        "constraints": (),
+        "discipline_costs": (),
+    }
+    """The names of the primary data bound to their default values."""
+
+    STAGES: ClassVar[dict[str, tuple[str, ...]]] = {
+        "hash": ("disc_desc",),
+        "disciplines_table": ("disc_desc",),
+        "all_ios": ("disciplines_table",),
+        "coupling_graph": ("disc_desc",),
+        "disciplines": ("disc_desc",),
+        "n2_image": ("hash", "coupling_graph"),
+        "n2_payload": ("hash", "coupling_graph"),
+        "ordering": ("coupling_graph",),
+        "ordered_n2_payload": ("disc_desc", "ordering"),
+        "summary": ("hash", "disciplines_table", "coupling_graph"),
+        "schedule": ("coupling_graph", "discipline_costs"),
+        "cost_model": ("coupling_graph",),
+        "coupling_structure": ("hash", "disciplines"),
+        "n2_html": ("hash",),
+        "scenario": (
+            "disciplines",
+            "design_variables",
+            "formulation",
+            "objective",
+            "maximize_objective",
+            "constraints",
+        ),
+        "scenario_key": (
+            "hash",
+            "design_variables",
+            "formulation",
+            "objective",
+            "maximize_objective",
+            "constraints",
+        ),
+        "xdsm_html": ("scenario_key",),
+    }
+    """The names of the stages bound to the names of the data they depend on.
+
+    A stage depends on primary data and other stages.
+    """
+
+    JOB_STAGES: ClassVar[tuple[str, ...]] = ("n2_image", "n2_html", "xdsm_html")
+    """The names of the stages that can be evaluated by the worker pool."""
+
+    evaluations: dict[str, int]
+    """The number of evaluations of each stage."""
+
+    __coupling_graph: tuple[tuple[DisciplineDescription, ...], CouplingGraph] | None
+    """The last computed coupling graph with the disciplines descriptions, if any."""
+
+    __dependents: dict[str, set[str]]
+    """The names of the data bound to the names of the stages depending on them."""
+
+    __dirty: set[str]
+    """The names of the stages to be recomputed."""
+
+    __disciplines: dict[DisciplineDescription, list[MDODiscipline]]
+    """The last created disciplines bound to their descriptions."""
+
+    __inputs: dict[str, Any]
+    """The primary data."""
+
+    __values: dict[str, Any]
+    """The values of the stages."""
+
+    def __init__(self, **inputs: Any) -> None:
+        """
+        Args:
+            **inputs: The primary data of the study,
+                whose names are the keys of :attr:`.INPUTS`;
+                the missing ones are set to their default values.
+        """  # noqa: D205 D212 D415
+        self.__coupling_graph = None
+        self.__disciplines = {}
+        self.__inputs = dict(self.INPUTS)
+        self.__values = {}
+        self.__dirty = set(self.STAGES)
+        self.__dependents = defaultdict(set)
+        for stage, dependencies in self.STAGES.items():
+            for dependency in dependencies:
+                self.__dependents[dependency].add(stage)
+
+        self.evaluations = dict.fromkeys(self.STAGES, 0)
+        self.update(**inputs)
+
+    @property
+    def inputs(self) -> Mapping[str, Any]:
+        """The primary data of the study."""
+        return MappingProxyType(self.__inputs)
+
+    def update(self, **inputs: Any) -> set[str]:
+        """Update primary data and invalidate the stages depending on them.
+
+        Args:
+            **inputs: The primary data to update.
+
+        Returns:
+            The names of the stages invalidated by this update.
+
+        Raises:
+            KeyError: When a name is not the name of primary data.
+        """
+        invalidated = set()
+        for name, value in inputs.items():
+            if name not in self.INPUTS:
+                msg = f"{name} is not a primary data of the study."
+                raise KeyError(msg)
+
+            value = self.__normalize(name, value)
+            if value != self.__inputs[name]:
+                self.__inputs[name] = value
+                invalidated |= self.__invalidate(name)
+
+        return invalidated
+
+    @staticmethod
+    def __normalize(name: str, value: Any) -> Any:
+        """Normalize the value of primary data so that it can be compared.
+
+        Args:
+            name: The name of the primary data.
+            value: The value of the primary data.
+
+        Returns:
+            The normalized value.
+        """
+        if name == "disc_desc":
+            return normalize_disc_desc(value)
+
+        if name == "design_variables":
+            return tuple(value)
+
+        if name == "constraints":
+            if hasattr(value, "items"):
+                value = value.items()
+            return tuple(tuple(item) for item in value)
+
+        if name == "discipline_costs":
+            if hasattr(value, "items"):
+                value = value.items()
+            return tuple(
+                sorted((str(discipline), float(cost)) for discipline, cost in value)
+            )
+
+        return value
+
+    def __invalidate(self, name: str) -> set[str]:
+        """Mark the stages depending directly or not on some data as dirty.
+
+        Args:
+            name: The name of the data.
+
+        Returns:
+            The names of the stages marked as dirty.
+        """
+        invalidated = set()
+        names = [name]
+        while names:
+            for stage in self.__dependents[names.pop()]:
+                if stage not in invalidated:
+                    invalidated.add(stage)
+                    names.append(stage)
+
+        self.__dirty |= invalidated
+        for stage in invalidated:
+            self.__values.pop(stage, None)
+
+        return invalidated
+
+    def is_dirty(self, stage: str) -> bool:
+        """Whether a stage has to be computed.
+
+        Args:
+            stage: The name of the stage.
+
+        Returns:
+            Whether the stage has to be computed.
+        """
+        return stage in self.__dirty
+
+    def get(self, stage: str) -> Any:
+        """Return the value of a stage, computing it if it is dirty.
+
+        The stages it depends on are computed first if they are dirty.
+
+        Args:
+            stage: The name of the stage.
+
+        Returns:
+            The value of the stage.
+        """
+        if stage in self.__dirty:
+            for dependency in self.STAGES[stage]:
+                if dependency in self.STAGES:
+                    self.get(dependency)
+
+            with STAGE_METRICS.time(stage):
+                self.__values[stage] = getattr(self, f"_compute_{stage}")()
+
+            self.evaluations[stage] += 1
+            self.__dirty.discard(stage)
+
+        return self.__values[stage]
+
+    def submit(self, stage: str, owner: Hashable = None) -> Job:
+        """Submit the evaluation of a stage to the worker pool of the process.
+
+        The stages it depends on are computed first if they are dirty.
+        The value computed by the worker pool is cached
+        so that :meth:`.get` returns it without computing it.
+
+        Args:
+            stage: The name of the stage, one of :attr:`.JOB_STAGES`.
+            owner: The identifier of the session submitting the job.
+
+        Returns:
+            The job evaluating the stage,
+            already done when the stage is not dirty or its value is cached.
+
+        Raises:
+            ValueError: When the stage cannot be evaluated by the worker pool.
+            RuntimeError: When the queue of the worker pool is full.
+        """
+        if stage not in self.JOB_STAGES:
+            msg = f"The stage {stage} cannot be evaluated by the worker pool."
+            raise ValueError(msg)
+
+        if stage not in self.__dirty:
+            return Job.from_result(stage, self.__values[stage])
+
+        for dependency in self.STAGES[stage]:
+            if dependency in self.STAGES:
+                self.get(dependency)
+
+        if stage == "n2_image":
+            return submit_n2_image(
+                self.__values["hash"], self.__values["coupling_graph"], owner=owner
+            )
+
+        if stage == "n2_html":
+            return submit_n2_html(
+                self.__values["hash"], self.__inputs["disc_desc"], owner
+            )
+
+        return submit_xdsm_html(
+            self.__values["scenario_key"], self.__inputs["disc_desc"], owner
+        )
+
+    def _compute_hash(self) -> str:
+        """Compute the canonical hash of the descriptions of the disciplines.
+
+        Returns:
+            The hash of the descriptions of the disciplines.
+        """
+        return hash_disc_desc(self.__inputs["disc_desc"])
+
+    def _compute_disciplines_table(self) -> DisciplinesTable:
+        """Store the input and output names of the disciplines as identifiers.
+
+        Returns:
+            The table of the input and output names of the disciplines.
+        """
+        return DisciplinesTable(self.__inputs["disc_desc"])
+
+    def _compute_all_ios(self) -> tuple[list[str], list[str]]:
+        """Return the names of the inputs and outputs of all the disciplines.
+
+        Returns:
+            The sorted input names and the sorted output names.
+        """
+        disciplines_table = self.__values["disciplines_table"]
+        return (
+            disciplines_table.input_index.names,
+            disciplines_table.output_index.names,
+        )
+
+    def _compute_coupling_graph(self) -> CouplingGraph:
+        """Create the coupling graph of the disciplines from their names.
+
+        When at most :attr:`.MAX_INCREMENTAL_UPDATES` disciplines changed
+        since the last computation,
+        the last coupling graph is updated incrementally
+        and the couplings added and removed by the changes are stored in the graph.
+
+        Returns:
+            The coupling graph.
+        """
+        from gemseo_web_study.coupling_graph import CouplingGraph
+
+        disc_desc = self.__inputs["disc_desc"]
+        changed_indices = []
+        if self.__coupling_graph is not None:
+            last_disc_desc, coupling_graph = self.__coupling_graph
+            if len(last_disc_desc) == len(disc_desc):
+                changed_indices = [
+                    index
+                    for index, (last_desc, desc) in enumerate(
+                        zip(last_disc_desc, disc_desc)
+                    )
+                    if last_desc != desc
+                ]
+
+        if 0 < len(changed_indices) <= MAX_INCREMENTAL_UPDATES:
+            added_couplings = set()
+            removed_couplings = set()
+            for index in changed_indices:
+                name, input_names, output_names = disc_desc[index]
+                coupling_graph = coupling_graph.update_discipline(
+                    index, input_names, output_names, name
+                )
+                added_couplings.update(coupling_graph.added_couplings)
+                removed_couplings.update(coupling_graph.removed_couplings)
+
+            coupling_graph.added_couplings = sorted(added_couplings - removed_couplings)
+            coupling_graph.removed_couplings = sorted(
+                removed_couplings - added_couplings
+            )
+        else:
+            coupling_graph = CouplingGraph(disc_desc)
+
+        self.__coupling_graph = (disc_desc, coupling_graph)
+        return coupling_graph
+
+    def _compute_n2_image(self) -> bytes:
+        """Render the static N2 chart as a PNG image.
+
+        Returns:
+            The content of the PNG file.
+        """
+        return get_n2_image(self.__values["hash"], self.__values["coupling_graph"])
+
+    def _compute_n2_payload(self) -> str:
+        """Create the compact JSON description of the N2 chart.
+
+        Returns:
+            The JSON description of the N2 chart.
+        """
+        return get_n2_payload(self.__values["hash"], self.__values["coupling_graph"])
+
+    def _compute_ordering(self) -> FeedbackOrdering:
+        """Order the disciplines to minimize the feedback couplings.
+
+        Returns:
+            The order of the disciplines minimizing the feedback couplings.
+        """
+        return FeedbackOrdering(self.__values["coupling_graph"])
+
+    def _compute_ordered_n2_payload(self) -> str:
+        """Create the compact JSON description of the N2 chart in optimized order.
+
+        Returns:
+            The JSON description of the N2 chart
+            of the disciplines in the order minimizing the feedback couplings.
+        """
+        from gemseo_web_study.coupling_graph import CouplingGraph
+
+        disc_desc = self.__values["ordering"].get_disc_desc(self.__inputs["disc_desc"])
+        return get_n2_payload(hash_disc_desc(disc_desc), CouplingGraph(disc_desc))
+
+    def _compute_summary(self) -> DataFrame:
+        """Create the summary of the disciplines.
+
+        Returns:
+            The summary of the disciplines, with a row per discipline.
+        """
+        values = self.__values
+        return get_summary(
+            values["hash"], values["disciplines_table"], values["coupling_graph"]
+        )
+
+    def _compute_schedule(self) -> ExecutionSchedule:
+        """Schedule the execution of the disciplines on parallel workers.
+
+        Returns:
+            The schedule of the execution of the disciplines.
+        """
+        return ExecutionSchedule(
+            self.__values["coupling_graph"], dict(self.__inputs["discipline_costs"])
+        )
+
+    def _compute_cost_model(self) -> FormulationCostModel:
+        """Create the analytic cost model of the MDO formulations.
+
+        Returns:
+            The cost model of the MDO formulations.
+        """
+        return FormulationCostModel(self.__values["coupling_graph"])
+
+    def _compute_disciplines(self) -> list[MDODiscipline]:
+        """Create the disciplines from their descriptions.
+
+        The disciplines whose descriptions did not change
+        since the last computation are reused.
+
+        Returns:
+            The disciplines.
+        """
+        disc_desc = self.__inputs["disc_desc"]
+        last_disciplines = {
+            desc: list(disciplines) for desc, disciplines in self.__disciplines.items()
+        }
+        disciplines = [
+            last_disciplines[desc].pop() if last_disciplines.get(desc) else None
+            for desc in disc_desc
+        ]
+        new_disciplines = iter(
+            create_disciplines([
+                desc
+                for desc, discipline in zip(disc_desc, disciplines)
+                if discipline is None
+            ])
+        )
+        disciplines = [
+            next(new_disciplines) if discipline is None else discipline
+            for discipline in disciplines
+        ]
+        self.__disciplines = {}
+        for desc, discipline in zip(disc_desc, disciplines):
+            self.__disciplines.setdefault(desc, []).append(discipline)
+
+        return disciplines
+
+    def _compute_coupling_structure(self) -> MDOCouplingStructure:
+        """Create the coupling structure of the disciplines.
+
+        The coupling structure is shared with the other studies
+        having the same disciplines descriptions.
+
+        Returns:
+            The coupling structure.
+        """
+        from gemseo.core.coupling_structure import MDOCouplingStructure
+
+        return COUPLING_STRUCTURES.get_or_compute(
+            self.__values["hash"],
+            lambda: MDOCouplingStructure(self.__values["disciplines"]),
+            estimate_disciplines_size(self.__inputs["disc_desc"]),
+        )
+
+    def _compute_n2_html(self) -> str:
+        """Generate the standalone HTML file of the N2 diagram.
+
+        The coupling structure is only created
+        if the N2 diagram is not cached for the disciplines of the study.
+
+        Returns:
+            The source code of the HTML file.
+        """
+        return get_n2_html(
+            self.__values["hash"], lambda: self.get("coupling_structure")
+        )
+
+    def _compute_scenario(self) -> MDOScenario:
+        """Create the MDO scenario.
+
+        Returns:
+            The MDO scenario.
+        """
+        return build_scenario(
+            self.__values["disciplines"],
+            self.__inputs["formulation"],
+            self.__inputs["objective"],
+            self.__inputs["maximize_objective"],
+            self.__inputs["design_variables"],
+            self.__inputs["constraints"],
+        )
+
+    def _compute_scenario_key(self) -> tuple[Any, ...]:
+        """Compute the definition of the scenario identifying its XDSM diagram.
+
+        Returns:
+            The definition of the scenario.
+        """
+        return make_scenario_key(
+            self.__values["hash"],
+            self.__inputs["formulation"],
+            self.__inputs["objective"],
+            self.__inputs["maximize_objective"],
+            self.__inputs["design_variables"],
+            self.__inputs["constraints"],
+        )
+
+    def _compute_xdsm_html(self) -> str:
+        """Generate the standalone HTML file of the XDSM diagram.
+
+        The scenario is only created
+        if the XDSM diagram is not cached for the definition of the scenario.
+
+        Returns:
+            The source code of the HTML file.
+        """
+        return get_xdsm_html(
+            self.__values["scenario_key"], lambda: self.get("scenario")
+        )
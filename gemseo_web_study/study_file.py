@@ -0,0 +1,411 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The study files.
+
+A study file contains the primary data of a study only,
+the derived data being recomputed by the :class:`.Study`.
+It is a JSON document, optionally compressed with gzip,
+whose variable and discipline names are interned:
+they are stored once in ``names``
+and referred to by their positions in this list elsewhere:
+
+.. code-block:: json
+
+    {
+        "format": "gemseo_web_study",
+        "version": 2,
+        "names": ["A", "x", "y", "B", "z"],
+        "disciplines": [[0, [1], [2]], [3, [2], [4]]],
+        "design_variables": [1],
+        "formulation": "MDF",
+        "objective": 4,
+        "maximize_objective": false,
+        "constraints": [[2, "inequality"]],
+        "discipline_costs": [[3, 2.5]]
+    }
+
+The objective is ``null`` when it is not defined.
+The costs of the disciplines are optional.
+
+The legacy study files (version 1),
+which have no format
+and contain the values of the ``#``-prefixed keys of the session state,
+can still be read; their values are validated as well.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Final
+
+from gemseo_web_study.scenario import CONSTRAINT_TYPES
+from gemseo_web_study.study import Study
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+FORMAT_NAME: Final[str] = "gemseo_web_study"
+"""The name of the format of the study files."""
+
+FORMAT_VERSION: Final[int] = 2
+"""The version of the format of the study files written by this package."""
+
+_GZIP_MAGIC_NUMBER: Final[bytes] = b"\x1f\x8b"
+"""The first bytes of a gzip file."""
+
+
+def _is_names(value: Any) -> bool:
+    """Return whether a value of a study file is a list of names.
+
+    Args:
+        value: The value.
+
+    Returns:
+        Whether the value is a list of strings.
+    """
+    return isinstance(value, list) and all(isinstance(name, str) for name in value)
+
+
+def inputs_from_session_state(state: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the primary data of a study from the content of a legacy study file.
+
+    A legacy study file contains the values of the ``#``-prefixed keys
+    of the session state of the former versions of the web interface;
+    only the primary data whose keys are in this content are returned.
+
+    Args:
+        state: The content of the legacy study file.
+
+    Returns:
+        The primary data of the study.
+
+    Raises:
+        ValueError: When a value of the legacy study file is malformed.
+    """
+    disc_desc = state.get("#disc_desc", [])
+    if not isinstance(disc_desc, list) or not all(
+        isinstance(desc, list)
+        and len(desc) == 3
+        and isinstance(desc[0], str)
+        and _is_names(desc[1])
+        and _is_names(desc[2])
+        for desc in disc_desc
+    ):
+        msg = "The disciplines of the legacy study file are malformed."
+        raise ValueError(msg)
+
+    if not _is_names(state.get("#Design variables", [])):
+        msg = "The design variables of the legacy study file are malformed."
+        raise ValueError(msg)
+
+    if not isinstance(state.get("#mdo formulation", ""), str):
+        msg = "The MDO formulation of the legacy study file is not a string."
+        raise ValueError(msg)  # noqa: TRY004
+
+    if not isinstance(state.get("#maximize_objective", False), bool):
+        msg = "The objective sense of the legacy study file is not a boolean."
+        raise ValueError(msg)  # noqa: TRY004
+
+    constraints = state.get("#constraints", {})
+    if isinstance(constraints, dict):
+        constraints = [list(item) for item in constraints.items()]
+
+    if not isinstance(constraints, list) or not all(
+        isinstance(constraint, list)
+        and len(constraint) == 2
+        and isinstance(constraint[0], str)
+        and constraint[1] in CONSTRAINT_TYPES
+        for constraint in constraints
+    ):
+        msg = "The constraints of the legacy study file are malformed."
+        raise ValueError(msg)
+
+    inputs = {}
+    for name, key in (
+        ("disc_desc", "#disc_desc"),
+        ("design_variables", "#Design variables"),
+        ("formulation", "#mdo formulation"),
+        ("maximize_objective", "#maximize_objective"),
+        ("constraints", "#constraints"),
+    ):
+        if key in state:
+            inputs[name] = state[key]
+
+    if "#objective_index" in state:
+        objective_index = state["#objective_index"]
+        all_outputs = state.get("#all_outputs", [])
+        if (
+            not isinstance(objective_index, int)
+            or isinstance(objective_index, bool)
+            or objective_index < 0
+            or not _is_names(all_outputs)
+        ):
+            msg = "The objective of the legacy study file is malformed."
+            raise ValueError(msg)
+
+        objective = ""
+        if objective_index < len(all_outputs):
+            objective = all_outputs[objective_index]
+        inputs["objective"] = objective
+
+    return inputs
+
+
+def study_to_dict(study: Study) -> dict[str, Any]:
+    """Convert a study into the content of a study file.
+
+    Args:
+        study: The study.
+
+    Returns:
+        The content of the study file.
+    """
+    positions = {}
+
+    def intern(name: str) -> int:
+        """Return the position of a name in the table of names, adding it if needed.
+
+        Args:
+            name: The name.
+
+        Returns:
+            The position of the name.
+        """
+        return positions.setdefault(name, len(positions))
+
+    inputs = study.inputs
+    disciplines = [
+        [
+            intern(name),
+            [intern(input_name) for input_name in input_names],
+            [intern(output_name) for output_name in output_names],
+        ]
+        for name, input_names, output_names in inputs["disc_desc"]
+    ]
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "names": list(positions),
+        "disciplines": disciplines,
+        "design_variables": [intern(name) for name in inputs["design_variables"]],
+        "formulation": inputs["formulation"],
+        "objective": intern(inputs["objective"]) if inputs["objective"] else None,
+        "maximize_objective": inputs["maximize_objective"],
+        "constraints": [
+            [intern(name), constraint_type]
+            for name, constraint_type in inputs["constraints"]
+        ],
+        "discipline_costs": [
+            [intern(name), cost] for name, cost in inputs["discipline_costs"]
+        ],
+    }
+
+
+def dump_study(study: Study, compress: bool = False) -> bytes:
+    """Serialize a study into the content of a study file.
+
+    Args:
+        study: The study.
+        compress: Whether to compress the study file with gzip.
+
+    Returns:
+        The content of the study file.
+    """
+    data = json.dumps(study_to_dict(study), separators=(",", ":")).encode()
+    if compress:
+        # A null modification time makes the file depend on the study only.
+        return gzip.compress(data, mtime=0)
+
+    return data
+
+
+def study_from_dict(data: Mapping[str, Any]) -> Study:
+    """Create a study from the content of a study file.
+
+    Args:
+        data: The content of the study file, possibly a legacy one.
+
+    Returns:
+        The study.
+
+    Raises:
+        ValueError: When the content is not a valid study.
+    """
+    if not isinstance(data, dict):
+        msg = "A study file must contain a JSON object."
+        raise ValueError(msg)  # noqa: TRY004
+
+    if "format" not in data:
+        return Study(**inputs_from_session_state(data))
+
+    if data["format"] != FORMAT_NAME:
+        msg = f"The format {data['format']!r} is not the format of a study file."
+        raise ValueError(msg)
+
+    version = data.get("version")
+    if not isinstance(version, int) or not 2 <= version <= FORMAT_VERSION:
+        msg = (
+            f"The version {version!r} of the study file is not supported; "
+            "a study file with a format must have a version "
+            f"between 2 and {FORMAT_VERSION}, the legacy study files having no format."
+        )
+        raise ValueError(msg)
+
+    names = data.get("names", [])
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        msg = "The names of a study file must be a list of strings."
+        raise ValueError(msg)
+
+    def get_name(position: Any, field: str) -> str:
+        """Return a name from its position in the table of names.
+
+        Args:
+            position: The position of the name.
+            field: The field of the study file referring to the name.
+
+        Returns:
+            The name.
+
+        Raises:
+            ValueError: When the position is not a valid one.
+        """
+        if not isinstance(position, int) or not 0 <= position < len(names):
+            msg = f"The {field} of the study file refer to an unknown name."
+            raise ValueError(msg)
+
+        return names[position]
+
+    def get_names(positions: Any, field: str) -> tuple[str, ...]:
+        """Return names from their positions in the table of names.
+
+        Args:
+            positions: The positions of the names.
+            field: The field of the study file referring to the names.
+
+        Returns:
+            The names.
+
+        Raises:
+            ValueError: When the positions are not a list of valid positions.
+        """
+        if not isinstance(positions, list):
+            msg = f"The {field} of the study file are malformed."
+            raise ValueError(msg)  # noqa: TRY004
+
+        return tuple(get_name(position, field) for position in positions)
+
+    def get_items(field: str, n_values: int) -> list[list]:
+        """Return the items of a field of the study file.
+
+        Args:
+            field: The field of the study file.
+            n_values: The number of values of an item.
+
+        Returns:
+            The items.
+
+        Raises:
+            ValueError: When the items are not lists of ``n_values`` values.
+        """
+        items = data.get(field, [])
+        if not isinstance(items, list) or not all(
+            isinstance(item, list) and len(item) == n_values for item in items
+        ):
+            msg = f"The {field} of the study file are malformed."
+            raise ValueError(msg)
+
+        return items
+
+    disc_desc = tuple(
+        (
+            get_name(name, "disciplines"),
+            get_names(input_names, "disciplines"),
+            get_names(output_names, "disciplines"),
+        )
+        for name, input_names, output_names in get_items("disciplines", 3)
+    )
+    constraints = tuple(
+        (get_name(name, "constraints"), constraint_type)
+        for name, constraint_type in get_items("constraints", 2)
+    )
+    for _, constraint_type in constraints:
+        if constraint_type not in CONSTRAINT_TYPES:
+            msg = f"The constraint type {constraint_type!r} is not supported."
+            raise ValueError(msg)
+
+    discipline_costs = tuple(
+        (get_name(name, "discipline costs"), cost)
+        for name, cost in get_items("discipline_costs", 2)
+    )
+    for _, cost in discipline_costs:
+        if not isinstance(cost, (int, float)) or cost < 0:
+            msg = f"The discipline cost {cost!r} is not a non-negative number."
+            raise ValueError(msg)
+
+    objective = data.get("objective")
+    return Study(
+        disc_desc=disc_desc,
+        design_variables=get_names(
+            data.get("design_variables", []), "design_variables"
+        ),
+        formulation=str(data.get("formulation", Study.INPUTS["formulation"])),
+        objective="" if objective is None else get_name(objective, "objective"),
+        maximize_objective=bool(data.get("maximize_objective", False)),
+        constraints=constraints,
+        discipline_costs=discipline_costs,
+    )
+
+
+def read_study(file: str | Path | IO[bytes]) -> Study:
+    """Read a study from a study file.
+
+    The gzip-compressed study files are detected from their first bytes
+    and decompressed while being read.
+
+    Args:
+        file: The path to the study file or a binary file-like object.
+
+    Returns:
+        The study.
+
+    Raises:
+        ValueError: When the file is not a valid study file.
+    """
+    if isinstance(file, (str, Path)):
+        with Path(file).open("rb") as stream:
+            return read_study(stream)
+
+    magic_number = file.read(len(_GZIP_MAGIC_NUMBER))
+    file.seek(-len(magic_number), 1)
+    try:
+        if magic_number == _GZIP_MAGIC_NUMBER:
+            with gzip.GzipFile(fileobj=file) as stream:
+                data = json.load(stream)
+        else:
+            data = json.load(file)
+    except (OSError, EOFError, UnicodeDecodeError, json.JSONDecodeError) as error:
+        msg = f"The study file cannot be decoded: {error}"
+        raise ValueError(msg) from error
+
+    return study_from_dict(data)
@@ -0,0 +1,151 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The state of the web interface for a study.
+
+The state holds the study and the data being edited in the pages,
+e.g. the disciplines without inputs or outputs yet
+and the constraints whose names are not selected yet,
+which are not part of the study.
+
+The widgets write only their changes to the state
+which updates the study;
+the pages read only the fields they need.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import ClassVar
+
+from gemseo_web_study.rendering import BackgroundRenderer
+from gemseo_web_study.study import Study
+from gemseo_web_study.study import normalize_disc_desc
+
+if TYPE_CHECKING:
+    from gemseo_web_study.study import DisciplineDescription
+
+
+class StudyState:
+    """The state of the web interface for a study, shared by the pages of a session.
+
+    The fields are read as attributes and written with :meth:`.update`;
+    the primary data of the study other than the disciplines and the constraints,
+    e.g. ``"formulation"``, are written with :meth:`.update` too.
+    """
+
+    FIELDS: ClassVar[dict[str, Any]] = {
+        "disc_table": (),
+        "constraint_rows": (),
+        "disciplines_editor": "Form",
+        "disciplines_page_size": 25,
+        "disciplines_page": 1,
+    }
+    """The names of the fields bound to their default values."""
+
+    constraint_rows: tuple[tuple[str, str], ...]
+    """The names and types of the constraints being edited.
+
+    The name is empty when the constraint is not selected yet.
+    """
+
+    disc_table: tuple[DisciplineDescription, ...]
+    """The descriptions of the disciplines being edited.
+
+    Only the disciplines with inputs and outputs are part of the study.
+    """
+
+    disciplines_editor: str
+    """The name of the editor of the disciplines."""
+
+    disciplines_page: int
+    """The page of the table of disciplines, starting at 1."""
+
+    disciplines_page_size: int
+    """The number of disciplines per page of the table of disciplines."""
+
+    renderer: BackgroundRenderer
+    """The rendering of the diagrams of the study in the background."""
+
+    study: Study
+    """The study."""
+
+    def __init__(self, study: Study | None = None) -> None:
+        """
+        Args:
+            study: The study.
+                If ``None``, use an empty study.
+        """  # noqa: D205 D212 D415
+        self.study = Study() if study is None else study
+        self.renderer = BackgroundRenderer(self.study)
+        for name, value in self.FIELDS.items():
+            setattr(self, name, value)
+
+        inputs = self.study.inputs
+        self.disc_table = inputs["disc_desc"]
+        self.constraint_rows = inputs["constraints"]
+
+    def update(self, **changes: Any) -> set[str]:
+        """Update fields and primary data of the study.
+
+        The disciplines with inputs and outputs of :attr:`.disc_table`
+        and the selected constraints of :attr:`.constraint_rows`
+        are passed to the study.
+
+        Args:
+            **changes: The new values of the fields and primary data.
+
+        Returns:
+            The names of the fields and primary data that changed.
+
+        Raises:
+            KeyError: When a name is neither a field nor a primary data
+                other than the disciplines and the constraints.
+        """
+        changed = set()
+        study_inputs = {}
+        for name, value in changes.items():
+            if name == "disc_table":
+                value = normalize_disc_desc(value)
+                study_inputs["disc_desc"] = tuple(
+                    desc for desc in value if desc[1] and desc[2]
+                )
+            elif name == "constraint_rows":
+                value = tuple((str(row[0] or ""), row[1]) for row in value)
+                study_inputs["constraints"] = tuple(
+                    {name: type_ for name, type_ in value if name}.items()
+                )
+            elif name in Study.INPUTS and name not in {"disc_desc", "constraints"}:
+                study_inputs[name] = value
+                continue
+            elif name not in self.FIELDS:
+                msg = f"{name} is neither a field of the state nor a primary data."
+                raise KeyError(msg)
+
+            if value != getattr(self, name):
+                setattr(self, name, value)
+                changed.add(name)
+
+        previous_inputs = dict(self.study.inputs)
+        self.study.update(**study_inputs)
+        inputs = self.study.inputs
+        changed.update(
+            name for name in study_inputs if inputs[name] != previous_inputs[name]
+        )
+        return changed
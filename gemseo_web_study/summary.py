@@ -0,0 +1,189 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The summary of the disciplines of a study.
+
+The summary is a table with a row per discipline
+whose columns are Arrow arrays built from the arrays of a :class:`.DisciplinesTable`
+and of a :class:`.CouplingGraph`:
+the input and output names are lists of strings
+instead of strings formatted for each discipline,
+followed by the numbers of inputs, outputs and coupling variables
+and by the group of strongly coupled disciplines.
+
+The summary is cached by study hash,
+so that the pages only slice the rows of the page to show.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Final
+
+from gemseo_web_study.cache import LRUCache
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+    from pandas import DataFrame
+    from pyarrow import ListArray
+
+    from gemseo_web_study.coupling_graph import CouplingGraph
+    from gemseo_web_study.name_table import DisciplinesTable
+
+SUMMARIES: Final[LRUCache] = LRUCache(name="summaries")
+"""The summaries of the disciplines bound to the hash of the study."""
+
+NAME: Final[str] = "Name"
+"""The column of the names of the disciplines."""
+
+INPUTS: Final[str] = "Inputs"
+"""The column of the sorted input names."""
+
+OUTPUTS: Final[str] = "Outputs"
+"""The column of the sorted output names."""
+
+N_INPUTS: Final[str] = "Number of inputs"
+"""The column of the numbers of inputs."""
+
+N_OUTPUTS: Final[str] = "Number of outputs"
+"""The column of the numbers of outputs."""
+
+N_COUPLING_INPUTS: Final[str] = "Coupling inputs"
+"""The column of the numbers of inputs produced by other disciplines."""
+
+N_COUPLING_OUTPUTS: Final[str] = "Coupling outputs"
+"""The column of the numbers of outputs consumed by other disciplines."""
+
+SELF_COUPLED: Final[str] = "Self-coupled"
+"""The column of whether the disciplines are self-coupled."""
+
+GROUP: Final[str] = "Group"
+"""The column of the groups of strongly coupled disciplines, starting at 1.
+
+It is empty for the disciplines which are not strongly coupled.
+"""
+
+
+def create_summary(table: DisciplinesTable, coupling_graph: CouplingGraph) -> DataFrame:
+    """Create the summary of disciplines.
+
+    Args:
+        table: The input and output names of the disciplines.
+        coupling_graph: The coupling graph of the disciplines.
+
+    Returns:
+        The summary of the disciplines, with a row per discipline.
+    """
+    import pyarrow as pa
+    from numpy import diff
+    from pandas import ArrowDtype
+
+    producers, consumers, variables = coupling_graph.couplings
+    is_edge = producers != consumers
+    sizes = (table.n_disciplines, len(coupling_graph.variable_names))
+    group_indices = coupling_graph.group_indices
+    summary = pa.table({
+        NAME: pa.array(table.discipline_names, pa.string()),
+        INPUTS: _create_names_array(table, table.input_ids, table.input_offsets),
+        OUTPUTS: _create_names_array(table, table.output_ids, table.output_offsets),
+        N_INPUTS: pa.array(diff(table.input_offsets)),
+        N_OUTPUTS: pa.array(diff(table.output_offsets)),
+        N_COUPLING_INPUTS: pa.array(
+            _count_variables(consumers[is_edge], variables[is_edge], *sizes)
+        ),
+        N_COUPLING_OUTPUTS: pa.array(
+            _count_variables(producers[is_edge], variables[is_edge], *sizes)
+        ),
+        SELF_COUPLED: pa.array(coupling_graph.self_coupled),
+        GROUP: pa.array(group_indices + 1, mask=group_indices < 0),
+    })
+    return summary.to_pandas(types_mapper=ArrowDtype)
+
+
+def _create_names_array(
+    table: DisciplinesTable, ids: NDArray[int], offsets: NDArray[int]
+) -> ListArray:
+    """Create the Arrow array of the sorted names of the variables of disciplines.
+
+    Args:
+        table: The input and output names of the disciplines.
+        ids: The identifiers of the names of the disciplines one after the other.
+        offsets: The positions of the names of the disciplines in ``ids``.
+
+    Returns:
+        The sorted names of the variables of each discipline.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from numpy import arange
+    from numpy import diff
+    from numpy import lexsort
+    from numpy import repeat
+
+    names = pa.array(table.names.names, pa.string())
+    ranks = pc.rank(names, sort_keys="ascending").to_numpy()
+    disciplines = repeat(arange(len(offsets) - 1), diff(offsets))
+    sorted_ids = ids[lexsort((ranks[ids], disciplines))]
+    return pa.ListArray.from_arrays(pa.array(offsets), names.take(sorted_ids))
+
+
+def _count_variables(
+    disciplines: NDArray[int],
+    variables: NDArray[int],
+    n_disciplines: int,
+    n_variables: int,
+) -> NDArray[int]:
+    """Count the distinct variables of each discipline.
+
+    Args:
+        disciplines: The indices of the disciplines.
+        variables: The indices of the variables bound to the disciplines,
+            possibly duplicated.
+        n_disciplines: The number of disciplines.
+        n_variables: The number of variables.
+
+    Returns:
+        The number of distinct variables of each discipline.
+    """
+    from numpy import bincount
+    from numpy import int64
+    from numpy import unique
+
+    pairs = unique(disciplines.astype(int64) * n_variables + variables)
+    return bincount(pairs // n_variables, minlength=n_disciplines)
+
+
+def get_summary(
+    study_hash: str, table: DisciplinesTable, coupling_graph: CouplingGraph
+) -> DataFrame:
+    """Return the summary of the disciplines of a study, creating it if not cached.
+
+    Args:
+        study_hash: The hash of the descriptions of the disciplines of the study.
+        table: The input and output names of the disciplines.
+        coupling_graph: The coupling graph of the disciplines.
+
+    Returns:
+        The summary of the disciplines, with a row per discipline.
+    """
+    summary = SUMMARIES.get(study_hash)
+    if summary is None:
+        summary = create_summary(table, coupling_graph)
+        SUMMARIES.set(study_hash, summary, int(summary.memory_usage(deep=True).sum()))
+
+    return summary
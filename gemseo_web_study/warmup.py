@@ -0,0 +1,72 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The warm-up of a server process.
+
+The discovery of the GEMSEO plugins and formulations
+and the import of the heavy modules
+are done once per process in a background thread
+so that the first page is rendered without waiting for them
+and the sessions started later do not pay for them.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import cache
+from threading import Thread
+
+from gemseo_web_study.scenario import get_formulations
+
+LOGGER = logging.getLogger(__name__)
+
+_reported_pages: set[str] = set()
+"""The names of the pages whose first render has been reported."""
+
+
+def warm_up() -> None:
+    """Import the heavy modules and discover the GEMSEO formulations."""
+    import matplotlib.figure  # noqa: F401
+    import pandas  # noqa: F401
+
+    get_formulations()
+    from gemseo_web_study import coupling_graph  # noqa: F401
+
+
+@cache
+def start_warm_up() -> Thread:
+    """Start the warm-up of the process in a background thread, once per process.
+
+    Returns:
+        The thread warming up the process.
+    """
+    thread = Thread(target=warm_up, name="gemseo_web_study_warm_up", daemon=True)
+    thread.start()
+    return thread
+
+
+def report_first_render(page: str, duration: float) -> None:
+    """Log the duration of the first render of a page in the process.
+
+    Args:
+        page: The name of the page.
+        duration: The duration of the render in seconds.
+    """
+    if page not in _reported_pages:
+        _reported_pages.add(page)
+        LOGGER.info("First render of the %s page in %.3f s.", page, duration)
@@ -0,0 +1,279 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The XDSM diagrams of a study.
+
+The XDSM diagrams are cached by scenario definition,
+i.e. the hash of the disciplines, the formulation, the objective,
+the design variables and the constraints.
+
+GEMSEO writes the XDSM to a file;
+it is written to a scratch directory removed right after reading it.
+The scratch directories left by a killed server process are removed
+at the first generation of an XDSM diagram.
+
+The XDSM diagrams can be generated by the worker pool of the server process,
+e.g. the XDSM diagrams of several formulations in parallel.
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Final
+
+from gemseo_web_study.cache import LRUCache
+from gemseo_web_study.jobs import JOB_POOL
+from gemseo_web_study.jobs import Job
+from gemseo_web_study.scenario import build_scenario
+from gemseo_web_study.scenario import create_disciplines
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+    from gemseo.core.mdo_scenario import MDOScenario
+
+    from gemseo_web_study.study import DisciplineDescription
+
+SCRATCH_PREFIX: Final[str] = "gemseo_web_study_"
+"""The prefix of the names of the scratch directories."""
+
+STALE_SCRATCH_AGE: Final[float] = 3600.0
+"""The age in seconds from which a scratch directory is considered as stale."""
+
+XDSM_HTML: Final[LRUCache] = LRUCache(name="xdsm_html")
+"""The XDSM HTML files bound to the definitions of the scenarios."""
+
+
+def make_scenario_key(
+    study_hash: str,
+    formulation: str,
+    objective: str,
+    maximize_objective: bool,
+    design_variables: Iterable[str],
+    constraints: Iterable[tuple[str, str]],
+) -> tuple[Any, ...]:
+    """Create the key identifying the XDSM diagram of a scenario.
+
+    Args:
+        study_hash: The hash of the descriptions of the disciplines.
+        formulation: The name of the MDO formulation.
+        objective: The name of the objective.
+        maximize_objective: Whether to maximize the objective.
+        design_variables: The names of the design variables.
+        constraints: The names of the constraints and their types.
+
+    Returns:
+        The key of the XDSM diagram.
+    """
+    return (
+        study_hash,
+        formulation,
+        objective,
+        maximize_objective,
+        tuple(design_variables),
+        tuple(tuple(constraint) for constraint in constraints),
+    )
+
+
+@cache
+def remove_stale_scratch_directories() -> None:
+    """Remove the scratch directories older than :attr:`.STALE_SCRATCH_AGE`.
+
+    This is done once per process.
+    """
+    oldest_time = time.time() - STALE_SCRATCH_AGE
+    for path in Path(tempfile.gettempdir()).glob(f"{SCRATCH_PREFIX}*"):
+        try:
+            if path.is_dir() and path.stat().st_mtime < oldest_time:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            continue
+
+
+@contextmanager
+def scratch_directory() -> Iterator[Path]:
+    """Create a scratch directory removed when leaving the context.
+
+    Yields:
+        The path to the scratch directory.
+    """
+    remove_stale_scratch_directories()
+    with tempfile.TemporaryDirectory(prefix=SCRATCH_PREFIX) as directory_path:
+        yield Path(directory_path)
+
+
+def generate_xdsm_html(scenario: MDOScenario) -> str:
+    """Generate the standalone HTML file of the XDSM diagram of a scenario.
+
+    Args:
+        scenario: The scenario.
+
+    Returns:
+        The source code of the HTML file.
+    """
+    with scratch_directory() as directory_path:
+        scenario.xdsmize(directory_path=directory_path)
+        return (directory_path / "xdsm.html").read_text(encoding="utf-8")
+
+
+def get_xdsm_html(
+    scenario_key: tuple[Any, ...], get_scenario: Callable[[], MDOScenario]
+) -> str:
+    """Return the XDSM diagram of a scenario, generating it if it is not cached.
+
+    Args:
+        scenario_key: The definition of the scenario.
+        get_scenario: The function returning the scenario,
+            only called when the XDSM diagram is not cached.
+
+    Returns:
+        The source code of the HTML file.
+    """
+    html = XDSM_HTML.get(scenario_key)
+    if html is None:
+        html = generate_xdsm_html(get_scenario())
+        XDSM_HTML.set(scenario_key, html, len(html))
+
+    return html
+
+
+def _generate_formulation_xdsm_html(
+    disc_desc: Sequence[DisciplineDescription],
+    formulation: str,
+    objective: str,
+    maximize_objective: bool,
+    design_variables: Sequence[str],
+    constraints: Sequence[tuple[str, str]],
+) -> str:
+    """Generate the XDSM diagram of a scenario from its definition.
+
+    This function is executed in a worker process.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+        formulation: The name of the MDO formulation.
+        objective: The name of the objective.
+        maximize_objective: Whether to maximize the objective.
+        design_variables: The names of the design variables.
+        constraints: The names of the constraints and their types.
+
+    Returns:
+        The source code of the HTML file.
+    """
+    scenario = build_scenario(
+        create_disciplines(disc_desc),
+        formulation,
+        objective,
+        maximize_objective,
+        design_variables,
+        constraints,
+    )
+    return generate_xdsm_html(scenario)
+
+
+def submit_xdsm_html(
+    scenario_key: tuple[Any, ...],
+    disc_desc: Sequence[DisciplineDescription],
+    owner: Hashable = None,
+) -> Job:
+    """Submit the generation of the XDSM diagram of a scenario to the worker pool.
+
+    Args:
+        scenario_key: The definition of the scenario
+            created by :func:`.make_scenario_key`.
+        disc_desc: The descriptions of the disciplines.
+        owner: The identifier of the session submitting the job.
+
+    Returns:
+        The job generating the HTML file, already done when it is cached.
+
+    Raises:
+        RuntimeError: When the queue of the worker pool is full.
+    """
+    html = XDSM_HTML.get(scenario_key)
+    if html is not None:
+        return Job.from_result(("xdsm_html", scenario_key), html)
+
+    return JOB_POOL.submit(
+        ("xdsm_html", scenario_key),
+        _generate_formulation_xdsm_html,
+        disc_desc,
+        *scenario_key[1:],
+        owner=owner,
+        callback=lambda html: XDSM_HTML.set(scenario_key, html, len(html)),
+    )
+
+
+def compare_formulations(
+    disc_desc: Sequence[DisciplineDescription],
+    study_hash: str,
+    formulations: Iterable[str],
+    objective: str,
+    maximize_objective: bool,
+    design_variables: Sequence[str],
+    constraints: Sequence[tuple[str, str]],
+    owner: Hashable = None,
+) -> dict[str, Job]:
+    """Submit the XDSM diagrams of a scenario for several MDO formulations.
+
+    The diagrams that are not cached are generated in parallel by the worker pool;
+    the failure of a formulation does not prevent the others from being generated.
+
+    Args:
+        disc_desc: The descriptions of the disciplines.
+        study_hash: The hash of the descriptions of the disciplines.
+        formulations: The names of the MDO formulations.
+        objective: The name of the objective.
+        maximize_objective: Whether to maximize the objective.
+        design_variables: The names of the design variables.
+        constraints: The names of the constraints and their types.
+        owner: The identifier of the session submitting the jobs.
+
+    Returns:
+        For each formulation,
+        the job generating the source code of the HTML file of the XDSM diagram,
+        failed with a ``RuntimeError`` when the queue of the worker pool is full.
+    """
+    jobs = {}
+    for formulation in formulations:
+        scenario_key = make_scenario_key(
+            study_hash,
+            formulation,
+            objective,
+            maximize_objective,
+            design_variables,
+            constraints,
+        )
+        try:
+            jobs[formulation] = submit_xdsm_html(scenario_key, disc_desc, owner)
+        except RuntimeError as error:
+            # The jobs already submitted are kept as the queue may not be full later.
+            jobs[formulation] = Job.from_error(("xdsm_html", scenario_key), error)
+
+    return jobs
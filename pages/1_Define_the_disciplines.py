@@ -19,23 +19,99 @@
 #    OTHER AUTHORS   - MACROSCOPIC CHANGES
 from __future__ import annotations
 
+from math import ceil
+
+import pandas as pd
 import streamlit as st
+from gemseo_web_study.disciplines_io import FILE_FORMATS
+from gemseo_web_study.disciplines_io import join_names
+from gemseo_web_study.disciplines_io import read_disciplines
+from gemseo_web_study.disciplines_io import split_names
 from streamlit_tags import st_tags
 
-from pages import handle_session_state, create_disciplines, handle_disciplines_summary
+from pages._common.helpers import get_state
+from pages._common.helpers import get_study
+from pages._common.helpers import handle_diagnostics
+from pages._common.helpers import handle_disciplines_summary
+from pages._common.helpers import has_disc_desc
+from pages._common.helpers import start_diagnostics
+
+EDITORS = ["Form", "Table"]
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+MAX_SHOWN_COUPLINGS = 20
+
+
+def import_disciplines() -> None:
+    """Imports the disciplines from the uploaded file and shows them in the table."""
+    uploaded_file = st.session_state["Disciplines file"]
+    if uploaded_file is None:
+        return
 
+    try:
+        disc_desc = read_disciplines(uploaded_file)
+    except (ValueError, KeyError, ImportError) as err:
+        st.error(f"The disciplines cannot be imported: {err}")
+        return
+
+    get_state().update(
+        disc_table=disc_desc, disciplines_editor="Table", disciplines_page=1
+    )
+
+
+def handle_disciplines_import() -> None:
+    """Handles the import of the disciplines from a file."""
+    with st.expander("Import disciplines from a file"):
+        st.markdown(
+            "The file has the columns *name*, *inputs* and *outputs*; "
+            "the names of the inputs and outputs are separated by commas."
+        )
+        st.file_uploader(
+            "Disciplines file",
+            type=list(FILE_FORMATS),
+            key="Disciplines file",
+            on_change=import_disciplines,
+        )
 
-def handle_disciplines_number() -> int:
+
+def handle_disciplines_editor() -> str:
+    """Handles the choice of the editor of the disciplines.
+
+    The form has widgets for each discipline
+    while the table shows the disciplines page by page.
+
+    Returns:
+        The name of the editor.
+    """
+    state = get_state()
+    editor = st.radio(
+        "Disciplines editor",
+        EDITORS,
+        index=EDITORS.index(state.disciplines_editor),
+        horizontal=True,
+    )
+    state.update(disciplines_editor=editor)
+    return editor
+
+
+def handle_disciplines_number() -> None:
     """Handle the widget that defines the number of disciplines.
 
-    Stores the
+    The disciplines added to the study have no inputs and outputs.
     """
-    key = "#Number of disciplines"
-    key_val = key + "_val"
-    value = st.session_state.get(key_val, 2)
-    value = st.slider(
-        "The number of disciplines", min_value=1, max_value=20, value=value)
-    st.session_state[key_val] = value
+    state = get_state()
+    disc_table = state.disc_table
+    nb_disc = st.number_input(
+        "The number of disciplines", min_value=1, value=len(disc_table) or 2, step=1
+    )
+    if nb_disc != len(disc_table):
+        state.update(
+            disc_table=disc_table[:nb_disc]
+            + tuple(
+                (f"Discipline_{i}", (), ()) for i in range(len(disc_table), nb_disc)
+            )
+        )
 
 
 def handle_disciplines_description() -> None:
@@ -46,61 +122,111 @@ def handle_disciplines_description() -> None:
     and discipline name.
 
     """
-    disc_desc = []
-    nb_disc = st.session_state["#Number of disciplines_val"]
-    for i in range(nb_disc):
+    state = get_state()
+    disc_table = []
+    for i, (name, inputs, outputs) in enumerate(state.disc_table):
         st.divider()
-        key = f"#Disc_{i}_name"
-        value = st.session_state.get(key, f"Discipline_{i}")
-        name = st.text_input("Discipline Name", value=value, key=f"Disc_{i}_name")
-        st.session_state[key] = name
-
-        key = f"#Disc_inputs_{i}"
-        value = st.session_state.get(key, [])
+        name = st.text_input("Discipline Name", value=name, key=f"Disc_{i}_name")
         inputs = st_tags(
             label=f"Discipline {i} Inputs:",
             text="Press enter to add more",
-            value=value,
-            key=key,
+            value=list(inputs),
+            key=f"Disc_inputs_{i}",
         )
-
-        key = f"#Disc_outputs_{i}"
-        value = st.session_state.get(key, [])
         outputs = st_tags(
             label=f"Discipline {i} Outputs:",
             text="Press enter to add more",
-            value=value,
-            key=key,
+            value=list(outputs),
+            key=f"Disc_outputs_{i}",
         )
-        if inputs and outputs:
-            disc_desc.append((name, tuple(inputs), tuple(outputs)))
-    st.session_state["#disc_desc"] = tuple(disc_desc)
-
+        disc_table.append((name, inputs, outputs))
+    state.update(disc_table=disc_table)
 
-@st.cache_data
-def get_all_ios(disc_desc):
-    all_outputs = set()
-    all_inputs = set()
-    for _, input_names, output_names in disc_desc:
-        all_inputs.update(input_names)
-        all_outputs.update(output_names)
 
-    return sorted(all_inputs), sorted(all_outputs)
+def handle_disciplines_table() -> None:
+    """Handles the disciplines description in a table.
 
-
-def handle_all_ios():
-    disc_desc = st.session_state.get("#disc_desc")
-    if disc_desc is not None:
-        all_inputs, all_outputs = get_all_ios(disc_desc)
-        st.session_state["#all_outputs"] = all_outputs
-        st.session_state["#all_inputs"] = all_inputs
+    Only the disciplines of the current page are sent to the browser.
+    The disciplines without inputs or outputs are kept in the table
+    but are not part of the study.
+    """
+    state = get_state()
+    disc_table = state.disc_table
+    columns = st.columns(2)
+    page_size = columns[0].selectbox(
+        "Disciplines per page",
+        PAGE_SIZES,
+        index=PAGE_SIZES.index(state.disciplines_page_size),
+    )
+    n_pages = max(ceil(len(disc_table) / page_size), 1)
+    page = columns[1].number_input(
+        f"Page (out of {n_pages})",
+        min_value=1,
+        max_value=n_pages,
+        value=min(state.disciplines_page, n_pages),
+    )
+    state.update(disciplines_page_size=page_size, disciplines_page=page)
+
+    start = (page - 1) * page_size
+    stop = start + page_size
+    data_frame = pd.DataFrame(
+        {
+            "Name": [name for name, _, _ in disc_table[start:stop]],
+            "Inputs": [join_names(inputs) for _, inputs, _ in disc_table[start:stop]],
+            "Outputs": [
+                join_names(outputs) for _, _, outputs in disc_table[start:stop]
+            ],
+        },
+        dtype=str,
+    )
+    # The key changes with the disciplines of the page
+    # so that the edits already applied to them are not applied again.
+    edited_data_frame = st.data_editor(
+        data_frame,
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        key=f"Disciplines table {page_size} {page} {hash(disc_table[start:stop])}",
+    )
+    rows = tuple(
+        (name, split_names(inputs), split_names(outputs))
+        for name, inputs, outputs in edited_data_frame.itertuples(index=False)
+        if isinstance(name, str) and name.strip()
+    )
+    state.update(disc_table=disc_table[:start] + rows + disc_table[stop:])
+
+
+def handle_coupling_changes() -> None:
+    """Shows the couplings added and removed by the last edit of the disciplines."""
+    if not has_disc_desc():
+        return
+
+    coupling_graph = get_study().get("coupling_graph")
+    for title, couplings in (
+        ("Added couplings", coupling_graph.added_couplings),
+        ("Removed couplings", coupling_graph.removed_couplings),
+    ):
+        if couplings:
+            st.markdown(f"**{title}:** {len(couplings)}")
+            st.markdown(
+                "\n".join(
+                    f"- {variable}: {producer} → {consumer}"
+                    for producer, consumer, variable in couplings[:MAX_SHOWN_COUPLINGS]
+                )
+            )
+            if len(couplings) > MAX_SHOWN_COUPLINGS:
+                st.caption(f"Only the first {MAX_SHOWN_COUPLINGS} are shown.")
 
 
 # Main display sequence
-handle_session_state()
+start_diagnostics()
 st.title("Disciplines defintion")
-handle_disciplines_number()
-handle_disciplines_description()
-create_disciplines()
-handle_all_ios()
+handle_disciplines_import()
+if handle_disciplines_editor() == "Form":
+    handle_disciplines_number()
+    handle_disciplines_description()
+else:
+    handle_disciplines_table()
 handle_disciplines_summary()
+handle_coupling_changes()
+handle_diagnostics("disciplines")
@@ -19,104 +19,288 @@
 #    OTHER AUTHORS   - MACROSCOPIC CHANGES
 from __future__ import annotations
 
-import tempfile
-from os.path import join
+import os
+from typing import TYPE_CHECKING
 
+import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
-from gemseo import MDODiscipline
-from gemseo.core.coupling_structure import MDOCouplingStructure
-from gemseo.problems.scalable.linear.disciplines_generator import create_disciplines_from_desc
-from matplotlib.pyplot import gcf
+from gemseo_web_study.name_table import NameIndex
+from gemseo_web_study.ordering import MAX_EXACT_SIZE
 
-from pages import handle_session_state
+from pages._common.helpers import PAGE_SIZE
+from pages._common.helpers import finish_renders
+from pages._common.helpers import get_state
+from pages._common.helpers import get_study
+from pages._common.helpers import handle_diagnostics
+from pages._common.helpers import handle_page
+from pages._common.helpers import handle_render
+from pages._common.helpers import has_disc_desc
+from pages._common.helpers import show_n2_chart
+from pages._common.helpers import start_diagnostics
 
+if TYPE_CHECKING:
+    from pages._common.helpers import Render
 
-@st.cache_data
-def create_mdo_disciplines(disc_desc) -> list[MDODiscipline]:
-    """Creates the disciplines instances."""
 
-    disciplines = create_disciplines_from_desc(
-        disc_desc, grammar_type=MDODiscipline.GrammarType.SIMPLE
+def show_n2_html(source_code: str, key: str) -> None:
+    """Shows the interactive N2 diagram.
+
+    Args:
+        source_code: The source code of the HTML file.
+        key: The key unique to the version of the diagram.
+    """
+    st.download_button(
+        "Download N2 standalone HTML file", source_code, file_name="N2.html", key=key
     )
-    st.session_state["disciplines"] = disciplines
-    return disciplines
+    components.html(source_code, width=800, height=800)
 
 
-def create_disciplines() -> None:
-    disc_desc = st.session_state.get("#disc_desc")
-    try:
-        if disc_desc is not None:
-            disciplines = create_mdo_disciplines(disc_desc)
-            st.session_state["disciplines"] = disciplines
+def show_n2_image(image: bytes, key: str) -> None:
+    """Shows the static N2 diagram.
 
-    except (ValueError, TypeError):
-        if "disciplines" in st.session_state:
-            del st.session_state["disciplines"]
+    Args:
+        image: The content of the PNG file.
+        key: The key unique to the version of the diagram.
+    """
+    st.download_button("Download N2 image", image, file_name="N2.png", key=key)
+    st.image(image, width=800)
 
 
-def generate_html(coupling_structure) -> str:
-    """Generates the HTML file.
+def handle_n2_genration() -> Render | None:
+    """Handles the generation of the N2.
 
-    Args:
-        _disciplines: The disciplines instances.
-        disc_desc: The disciplines descriptions.
+    From the disciplines tab, creates an N2 diagram in the page if the inputs are ready.
+    The interactive N2 chart is drawn by the browser from the N2 payload of the study;
+    the other formats are updated in the background when the inputs change.
+
+    Only the HTML format requires the disciplines to be created;
+    the other formats are drawn from the coupling graph.
+
+    Returns:
+        The render of the N2 diagram, if any.
     """
-    tmpdir = tempfile.mkdtemp()
-    tmp_file = join(tmpdir, "n2.png")
-    tmp_html = join(tmpdir, "n2.html")
+    if has_disc_desc():
+        renderer = get_state().renderer
+        diagram_format = st.selectbox(
+            "N2 diagram format",
+            ["interactive", "HTML", "basic"],
+            key="N2 diagram format",
+        )
+        if diagram_format == "interactive":
+            st.caption(
+                "Scroll to zoom, drag to pan, double-click to reset the view "
+                "and hover a cell to show its coupling variables."
+            )
+            show_n2_chart(get_study().get("n2_payload"), key="N2 chart")
+            return None
 
-    coupling_structure.plot_n2_chart(file_path=tmp_file, show_data_names=True,
-                                     save=True, show=False, show_html=False
-                                     )
-    with open(tmp_html, encoding="utf-8") as html_file:  #
-        return html_file.read()
+        if diagram_format == "HTML" and (
+            st.button("Generate N2", type="primary") or renderer.is_requested("n2_html")
+        ):
+            return handle_render("n2_html", "N2 diagram", show_n2_html)
 
+        return handle_render("n2_image", "N2 diagram", show_n2_image)
 
-@st.cache_data
-def create_coupling_structure(disc_desc: list) -> MDOCouplingStructure:
-    """Generates the HTML file.
+    st.error("Disciplines are not ready, please check the Disciplines tab.")
+    return None
 
-    Args:
-        _disciplines: The disciplines instances.
-        disc_desc: The disciplines descriptions.
+
+def handle_coupling_analysis() -> None:
+    """Handles the summary of the coupling analysis.
+
+    The analysis is made from the names of the inputs and outputs only.
     """
-    disciplines = st.session_state["disciplines"]
-    return MDOCouplingStructure(disciplines)
+    coupling_graph = get_study().get("coupling_graph")
+    names = coupling_graph.discipline_names
+    groups = coupling_graph.strongly_coupled_groups
+    with st.expander("Coupling analysis"):
+        st.markdown(f"**Groups of strongly coupled disciplines:** {len(groups)}")
+        for i, group in enumerate(groups):
+            st.markdown(f"- Group {i + 1}: {', '.join(names[j] for j in group)}")
+        st.markdown(
+            "**Strong couplings:** " + ", ".join(coupling_graph.strong_couplings)
+        )
+        st.markdown("**Weak couplings:** " + ", ".join(coupling_graph.weak_couplings))
 
 
-def handle_n2_genration() -> None:
-    """Handles the generation of the N2.
+def handle_discipline_costs() -> None:
+    """Handles the costs of the disciplines used to schedule their execution.
 
-    From the disciplines tab, creates an N2 diagram in the page if the inputs are ready.
+    The cost of the disciplines matching a glob pattern can be set at once,
+    e.g. the disciplines matching ``aero_*``.
     """
-    if "disciplines" in st.session_state:
-        disciplines = st.session_state["disciplines"]
-        format = st.selectbox(
-            "N2 diagram format", ["HTML", "basic"], index=1, key="N2 diagram format"
+    costs = dict(get_study().inputs["discipline_costs"])
+    index = NameIndex(get_study().get("coupling_graph").discipline_names)
+    columns = st.columns([3, 1])
+    pattern = columns[0].text_input(
+        "Disciplines",
+        key="Costs pattern",
+        help="A glob pattern such as aero_*; all the disciplines match an empty one.",
+    )
+    cost = columns[1].number_input("Cost", min_value=0.0, value=1.0, key="Cost")
+    matches = index.search(pattern, NameIndex.GLOB)
+    columns = st.columns(2)
+    if columns[0].button(
+        f"Set the cost of the {len(matches)} matching disciplines",
+        disabled=not matches,
+    ):
+        costs.update(dict.fromkeys(matches, cost))
+        costs = {name: cost for name, cost in costs.items() if cost != 1}
+        get_state().update(discipline_costs=costs)
+    if columns[1].button("Reset the costs", disabled=not costs):
+        costs = {}
+        get_state().update(discipline_costs=costs)
+    st.caption(
+        f"The cost of the disciplines is 1 except for {len(costs)} of them; "
+        "the cost of a group of strongly coupled disciplines is the sum of their costs."
+    )
+
+
+def handle_execution_schedule() -> None:
+    """Handles the schedule of the execution of the disciplines on parallel workers.
+
+    The groups of strongly coupled disciplines are executed by MDAs
+    and the tasks of a same level can be executed concurrently.
+    """
+    with st.expander("Parallel execution schedule"):
+        handle_discipline_costs()
+        schedule = get_study().get("schedule")
+        n_workers = st.number_input(
+            "Number of workers",
+            min_value=1,
+            value=os.cpu_count() or 1,
+            key="Number of workers",
+        )
+        columns = st.columns(4)
+        columns[0].metric("Levels", len(schedule.levels))
+        columns[1].metric(
+            "Maximum concurrency",
+            schedule.max_concurrency,
+            help="The maximum number of tasks of a level.",
+        )
+        columns[2].metric(
+            "Critical path cost",
+            f"{schedule.critical_path_cost:g}",
+            help=f"The minimum duration of the execution; "
+            f"the cost of all the tasks is {schedule.total_cost:g}.",
+        )
+        columns[3].metric(
+            f"Speedup on {n_workers} workers",
+            f"{schedule.get_speedup(n_workers):.2f}",
+            help=f"At most {schedule.max_speedup:.2f} with unlimited workers.",
+        )
+        st.markdown(
+            "**Critical path:** "
+            + " → ".join(map(schedule.get_task_name, schedule.critical_path))
         )
-        disc_desc = st.session_state["#disc_desc"]
-        coupling_structure = create_coupling_structure(disc_desc)
-        if format == "HTML" and st.button("Generate N2", type="primary"):
+        worker_counts = [1]
+        while worker_counts[-1] < schedule.max_concurrency:
+            worker_counts.append(min(worker_counts[-1] * 2, schedule.max_concurrency))
+        speedups = [schedule.get_speedup(count) for count in worker_counts]
+        st.dataframe(
+            pd.DataFrame({
+                "Workers": worker_counts,
+                "Duration": [schedule.total_cost / speedup for speedup in speedups],
+                "Speedup": speedups,
+                "Efficiency": [
+                    speedup / count for speedup, count in zip(speedups, worker_counts)
+                ],
+            }),
+            hide_index=True,
+        )
+        rows = [
+            (level + 1, task)
+            for level, tasks in enumerate(schedule.levels)
+            for task in tasks
+        ]
+        st.markdown("**Tasks by level**, the tasks of a level running concurrently:")
+        start = handle_page("Page", len(rows), "Schedule page")
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    (
+                        level,
+                        schedule.get_task_name(task),
+                        len(schedule.tasks[task]),
+                        schedule.costs[task],
+                    )
+                    for level, task in rows[start : start + PAGE_SIZE]
+                ],
+                columns=["Level", "Task", "Disciplines", "Cost"],
+            ),
+            hide_index=True,
+        )
+
 
-            source_code = generate_html(coupling_structure)
-            st.download_button(
-                "Download N2 standalone HTML file", source_code, file_name="N2.html"
+def save_disciplines_order() -> None:
+    """Saves the order of the disciplines minimizing the feedback couplings.
+
+    The disciplines without inputs or outputs, which are not part of the study,
+    remain at their positions in the table of disciplines.
+    """
+    state = get_state()
+    study = state.study
+    disc_desc = study.get("ordering").get_disc_desc(study.inputs["disc_desc"])
+    disc_table = list(state.disc_table)
+    positions = [
+        position
+        for position, (_, inputs, outputs) in enumerate(disc_table)
+        if inputs and outputs
+    ]
+    for position, desc in zip(positions, disc_desc):
+        disc_table[position] = desc
+
+    state.update(disc_table=disc_table)
+
+
+def handle_n2_ordering() -> None:
+    """Handles the order of the disciplines minimizing the feedback couplings.
+
+    A feedback coupling is below the diagonal of the N2 chart.
+    """
+    with st.expander("N2 ordering"):
+        study = get_study()
+        ordering = study.get("ordering")
+        columns = st.columns(2)
+        columns[0].metric(
+            "Feedback couplings",
+            ordering.initial_feedbacks,
+            help="The couplings from a discipline to a discipline placed before it, "
+            "below the diagonal of the N2 chart.",
+        )
+        columns[1].metric(
+            "Feedback couplings in optimized order",
+            ordering.feedbacks,
+            delta=ordering.feedbacks - ordering.initial_feedbacks,
+            delta_color="inverse",
+        )
+        groups = ordering.get_groups()
+        if not groups.empty:
+            st.markdown(
+                "**Groups of strongly coupled disciplines**, "
+                f"ordered exactly up to {MAX_EXACT_SIZE} disciplines:"
             )
-            components.html(source_code, width=800, height=800)
-        else:
-            coupling_structure._MDOCouplingStructure__draw_n2_chart(
-                file_path="", show_data_names=True, save=False, show=False,
-                fig_size=(8, 8))
+            start = handle_page("Page", len(groups), "Ordering page")
+            st.dataframe(groups.iloc[start : start + PAGE_SIZE], hide_index=True)
 
-            st.pyplot(gcf())
+        if ordering.feedbacks == ordering.initial_feedbacks:
+            st.caption(
+                "The order of the disciplines has no removable feedback coupling."
+            )
+            return
 
-    else:
-        st.error("Disciplines are not ready, please check the Disciplines tab.")
+        if st.checkbox("Show the N2 chart in optimized order", key="Show ordered N2"):
+            show_n2_chart(study.get("ordered_n2_payload"), key="Ordered N2 chart")
+
+        st.button(
+            "Save the optimized order of the disciplines",
+            on_click=save_disciplines_order,
+            help="The order of the disciplines is the order of the study file.",
+        )
 
 
-# this is to keep the widget values between pages
-handle_session_state()
+start_diagnostics()
 st.title("N2 diagram generation")
 # Main display sequence
 st.markdown(
@@ -125,6 +309,11 @@ The N2 (pronounce "N square") diagram represents the coupling between the discip
 """.format("https://gemseo.readthedocs.io/en/stable/mdo/coupling.html")
 )
 
-if "disciplines" not in st.session_state and "#disc_desc" in st.session_state:
-    create_disciplines()
-handle_n2_genration()
+if has_disc_desc():
+    handle_coupling_analysis()
+    handle_execution_schedule()
+    handle_n2_ordering()
+render = handle_n2_genration()
+if render is not None:
+    finish_renders(render)
+handle_diagnostics("n2")
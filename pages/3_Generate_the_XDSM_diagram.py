@@ -19,165 +19,466 @@
 #    OTHER AUTHORS   - MACROSCOPIC CHANGES
 from __future__ import annotations
 
-import tempfile
-from os.path import join
+import os
 from typing import TYPE_CHECKING
 
+import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
-from gemseo import MDODiscipline
-from gemseo import create_design_space
-from gemseo import create_scenario
-from gemseo import get_available_formulations
+from gemseo_web_study.dry_run import COLUMNS
+from gemseo_web_study.dry_run import DOE
+from gemseo_web_study.dry_run import GAUSS_SEIDEL
+from gemseo_web_study.dry_run import JACOBI_PROCESSES
+from gemseo_web_study.dry_run import MDA_SETTINGS
+from gemseo_web_study.dry_run import MODES
+from gemseo_web_study.dry_run import WALL_TIME
+from gemseo_web_study.dry_run import submit_dry_runs
+from gemseo_web_study.formulation_cost import CONSISTENCY_CONSTRAINTS
+from gemseo_web_study.formulation_cost import DEFAULT_MDA_ITERATIONS
+from gemseo_web_study.formulation_cost import EVALUATIONS_PER_ITERATION
+from gemseo_web_study.formulation_cost import FORMULATION
+from gemseo_web_study.formulation_cost import FORMULATIONS as COST_MODEL_FORMULATIONS
+from gemseo_web_study.formulation_cost import MDA_UNKNOWNS
+from gemseo_web_study.formulation_cost import OPTIMIZATION_VARIABLES
+from gemseo_web_study.formulation_cost import REMARK
+from gemseo_web_study.formulation_cost import VIABLE
+from gemseo_web_study.name_table import NameIndex
+from gemseo_web_study.scenario import CONSTRAINT_TYPES
+from gemseo_web_study.scenario import get_formulations
+from gemseo_web_study.xdsm import compare_formulations
 
-from pages import handle_session_state, create_disciplines, handle_disciplines_summary
+from pages._common.helpers import PAGE_SIZE
+from pages._common.helpers import finish_renders
+from pages._common.helpers import get_session_id
+from pages._common.helpers import get_state
+from pages._common.helpers import get_study
+from pages._common.helpers import handle_diagnostics
+from pages._common.helpers import handle_disciplines_summary
+from pages._common.helpers import handle_page
+from pages._common.helpers import handle_render
+from pages._common.helpers import has_disc_desc
+from pages._common.helpers import start_diagnostics
+from pages._common.helpers import wait_for_jobs
 
 if TYPE_CHECKING:
-    from gemseo.core.mdo_scenario import MDOScenario
+    from collections.abc import Sequence
 
-CTYPES = ["inequality", "equality"]
+    from pages._common.helpers import Render
 
+CTYPES = list(CONSTRAINT_TYPES)
 
-def handle_design_variables() -> None:
-    """Handles the design variables."""
-    all_inputs = st.session_state["#all_inputs"]
-    key = "#Design variables"
-    design_variables = st.multiselect(
-        "Design variables", options=all_inputs, default=st.session_state.get(key, [])
+
+def handle_name_search(
+    label: str, index: NameIndex, key: str
+) -> tuple[list[str], list[str]]:
+    """Handles the search of names in an index, page by page.
+
+    Only the names of the current page are sent to the browser.
+
+    Args:
+        label: The label of the names.
+        index: The index of the names.
+        key: The prefix of the keys of the widgets.
+
+    Returns:
+        The names of the current page and all the names matching the search.
+    """
+    columns = st.columns([3, 1, 1])
+    pattern = columns[0].text_input(
+        f"Search the {label}",
+        key=f"{key} pattern",
+        help="A prefix, a substring or a glob pattern such as g_*.",
     )
-    st.session_state[key] = design_variables
+    mode = columns[1].selectbox("Search mode", NameIndex.MODES, key=f"{key} mode")
+    matches = index.search(pattern, mode)
+    with columns[2]:
+        start = handle_page("Page", len(matches), f"{key} page")
+    st.caption(f"{len(matches)} of the {len(index)} {label} match the search.")
+    return matches[start : start + PAGE_SIZE], matches
+
+
+def handle_design_variables() -> None:
+    """Handles the design variables.
+
+    The inputs are searched page by page
+    and all the inputs matching the search can be selected at once.
+    The selection of the page is kept in the session state
+    so that the widget is not recreated when the selection changes.
+    """
+    state = get_state()
+    index = state.study.get("disciplines_table").input_index
+    st.markdown("**Design variables**")
+    page_names, matches = handle_name_search("inputs", index, "Design variables")
+    selected = [
+        name for name in state.study.inputs["design_variables"] if name in index
+    ]
+    key = "Design variables"
+    if st.session_state.get(f"{key} options") == page_names:
+        # The names selected in the page at the previous run.
+        selected = replace_page_selection(selected, page_names, st.session_state[key])
+
+    columns = st.columns(2)
+    if columns[0].button(f"Select the {len(matches)} matching inputs"):
+        selected = list(dict.fromkeys(selected + matches))
+    if columns[1].button("Deselect the matching inputs"):
+        matches = set(matches)
+        selected = [name for name in selected if name not in matches]
+
+    selected_names = set(selected)
+    st.session_state[key] = [name for name in page_names if name in selected_names]
+    st.session_state[f"{key} options"] = page_names
+    st.multiselect(key, page_names, key=key)
+    st.caption(f"{len(selected)} design variables are selected.")
+    state.update(design_variables=selected)
+
+
+def replace_page_selection(
+    selected: list[str], page_names: list[str], page_selection: list[str]
+) -> list[str]:
+    """Replace the names of a page in a selection.
+
+    Args:
+        selected: The selected names.
+        page_names: The names of the page.
+        page_selection: The selected names of the page.
+
+    Returns:
+        The selected names.
+    """
+    page_names = set(page_names)
+    return [name for name in selected if name not in page_names] + page_selection
 
 
 def handle_formulation() -> None:
-    """Handles the MDO formulation."""
-    formulations_key = "formulations_list"
-    if formulations_key in st.session_state:
-        formulations = st.session_state[formulations_key]
-    else:
-        formulations = get_available_formulations()
-        st.session_state[formulations_key] = formulations
+    """Handles the MDO formulation and shows the estimate of its cost."""
+    state = get_state()
+    formulations = list(get_formulations())
+    formulation = state.study.inputs["formulation"]
+    if formulation not in formulations:
+        formulation = "MDF"
+    left, right = st.columns([3, 1])
+    with left:
+        formulation = st.selectbox(
+            "MDO Formulation",
+            formulations,
+            index=formulations.index(formulation),
+            key="MDO formulation",
+        )
+    with right:
+        mda_iterations = int(
+            st.number_input(
+                "Estimated MDA iterations",
+                min_value=1,
+                value=DEFAULT_MDA_ITERATIONS,
+                key="Estimated MDA iterations",
+            )
+        )
+    state.update(formulation=formulation)
+    handle_formulation_costs(formulation, formulations, mda_iterations)
+
+
+def handle_formulation_costs(
+    formulation: str, formulations: Sequence[str], mda_iterations: int
+) -> None:
+    """Shows the analytic costs of the MDO formulations.
 
-    key = "#MDO formulation index"
-    index = st.session_state.get(key, formulations.index("MDF"))
-    formulation = st.selectbox(
-        "MDO Formulation", formulations, index=index, key="MDO formulation"
+    Args:
+        formulation: The name of the selected MDO formulation.
+        formulations: The names of the available MDO formulations.
+        mda_iterations: The estimated number of iterations of an MDA.
+    """
+    study = get_study()
+    inputs = study.inputs
+    cost_model = study.get("cost_model")
+    costs = cost_model.get_costs(
+        inputs["design_variables"],
+        inputs["constraints"],
+        mda_iterations,
+        [name for name in formulations if name in COST_MODEL_FORMULATIONS],
     )
-    st.session_state[key] = formulations.index(formulation)
-    st.session_state["#mdo formulation"] = formulation
+    if costs.empty:
+        return
+
+    selected_costs = costs[costs[FORMULATION] == formulation]
+    if selected_costs.empty:
+        st.caption(f"The cost of the {formulation} formulation is not estimated.")
+    else:
+        selected_costs = selected_costs.iloc[0]
+        columns = st.columns(4)
+        for column, name in zip(
+            columns,
+            (
+                OPTIMIZATION_VARIABLES,
+                CONSISTENCY_CONSTRAINTS,
+                MDA_UNKNOWNS,
+                EVALUATIONS_PER_ITERATION,
+            ),
+        ):
+            column.metric(name, int(selected_costs[name]))
+
+        if not selected_costs[VIABLE]:
+            st.warning(f"{formulation}: {selected_costs[REMARK]}")
+
+    viable_costs = costs[costs[VIABLE]]
+    if not viable_costs.empty:
+        st.caption(
+            f"Cheapest viable formulation: **{viable_costs[FORMULATION].iloc[0]}**, "
+            "by number of discipline evaluations per iteration."
+        )
+
+    with st.expander("Formulation costs"):
+        st.dataframe(costs, hide_index=True, use_container_width=True)
+        mda_sizes = cost_model.get_mda_sizes()
+        if not mda_sizes.empty:
+            st.markdown(
+                "Sizes of the MDAs of the groups of strongly coupled disciplines"
+            )
+            start = handle_page("Page", len(mda_sizes), "MDA sizes page")
+            st.dataframe(
+                mda_sizes.iloc[start : start + PAGE_SIZE],
+                hide_index=True,
+                use_container_width=True,
+            )
 
 
 def handle_objective() -> None:
-    """Handles the objective function and its maximization."""
-    key = "#objective_index"
-    all_outputs = st.session_state["#all_outputs"]
-    objective = st.selectbox(
-        "Objective function name",
-        all_outputs,
-        index=st.session_state.get(key, 0),
-        key="objective",
-    )
-    st.session_state[key] = all_outputs.index(objective)
-    key = "#maximize_objective"
+    """Handles the objective function and its maximization.
+
+    The outputs are searched page by page,
+    the objective function being proposed first when it is not in the page.
+    """
+    state = get_state()
+    index = state.study.get("disciplines_table").output_index
+    st.markdown("**Objective**")
+    page_names, _ = handle_name_search("outputs", index, "Objective")
+    objective = st.session_state.get("objective") or state.study.inputs["objective"]
+    if objective in index:
+        if objective not in page_names:
+            page_names = [objective, *page_names]
+        st.session_state["objective"] = objective
+    else:
+        st.session_state.pop("objective", None)
+    objective = st.selectbox("Objective function name", page_names, key="objective")
     maximize_objective = st.checkbox(
-        "maximize_objective", value=st.session_state.get(key, False)
+        "maximize_objective", value=state.study.inputs["maximize_objective"]
     )
-    st.session_state[key] = maximize_objective
+    state.update(objective=objective or "", maximize_objective=maximize_objective)
 
 
 def handle_constraints() -> None:
-    """Handles the constraints definition."""
-    key = "#Number of constraints"
-    nb_cstr = st.slider(
-        "Number of constraints",
-        min_value=0,
-        max_value=20,
-        value=st.session_state.get(key, 0),
-        key="Constraints slider",
-    )
-    st.session_state[key] = nb_cstr
-
-    constraints = {}
-    all_outputs = st.session_state["#all_outputs"]
-    for i in range(nb_cstr):
-        st.divider()
-        key = f"#Constraint {i + 1}"
-        c_index = st.session_state.get(key)
-        constr = st.selectbox(f"Constraint {i + 1}", all_outputs,
-                              index=c_index, key="c_" + key)
-        if constr is not None:
-            st.session_state[key] = all_outputs.index(constr)
-
-        key = f"#constr_type{i}"
-        c_type_index = st.session_state.get(key, 0)
-        c_type = st.selectbox(
-            "Constraint type",
-            CTYPES,
-            index=c_type_index,
-            key="c_" + key,
+    """Handles the constraints definition.
+
+    The outputs matching a search are added as constraints of a given type at once,
+    e.g. all the outputs matching ``g_*`` as inequality constraints,
+    or removed from the constraints;
+    the type of a constraint is changed by adding it again.
+    The constraints are shown page by page.
+    """
+    state = get_state()
+    index = state.study.get("disciplines_table").output_index
+    st.markdown("**Constraints**")
+    _, matches = handle_name_search("outputs", index, "Constraints")
+    columns = st.columns(3)
+    c_type = columns[0].selectbox("Constraint type", CTYPES, key="Constraints type")
+    constraint_rows = tuple(row for row in state.constraint_rows if row[0] in index)
+    if columns[1].button(f"Add the {len(matches)} matching outputs"):
+        constraint_types = dict(constraint_rows)
+        constraint_types.update(dict.fromkeys(matches, c_type))
+        constraint_rows = tuple(constraint_types.items())
+    if columns[2].button("Remove the matching constraints"):
+        matches = set(matches)
+        constraint_rows = tuple(row for row in constraint_rows if row[0] not in matches)
+
+    state.update(constraint_rows=constraint_rows)
+    if constraint_rows:
+        start = handle_page(
+            "Constraints page", len(constraint_rows), "Constraints table"
         )
-        if c_type is not None:
-            st.session_state[key] = CTYPES.index(c_type)
+        st.dataframe(
+            pd.DataFrame(
+                constraint_rows[start : start + PAGE_SIZE], columns=["Name", "Type"]
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+    st.caption(f"{len(constraint_rows)} constraints are defined.")
+
 
-        if constr:
-            constraints[constr] = c_type
-    st.session_state["#constraints"] = constraints
+def handle_scenario() -> Render | None:
+    """Handles the MDO scenario.
 
+    The XDSM diagram is generated when the user asks for it
+    and then updated in the background when the scenario is modified.
 
-def handle_scenario() -> MDOScenario | None:
-    """Handles the MDO scenario."""
-    design_variables = st.session_state["#Design variables"]
-    obj_index = st.session_state["#objective_index"]
-    objective = st.session_state["#all_outputs"][obj_index]
-    if not (objective and design_variables):
+    Returns:
+        The render of the XDSM diagram, if any.
+    """
+    state = get_state()
+    study = state.study
+    if not (study.inputs["objective"] and study.inputs["design_variables"]):
         st.error("Please select an objective and design variables")
-    disciplines = st.session_state["disciplines"]
-    scenario = None
-    if not disciplines:
+    if not has_disc_desc():
         st.error("Please select the disciplines.")
-    elif st.button("Generate XDSM", type="primary"):
-        design_space = create_design_space()
-        for name in design_variables:
-            design_space.add_variable(name=name)
-        try:
-            scenario = create_scenario(
-                design_space=design_space,
-                objective_name=objective,
-                maximize_objective=st.session_state["#maximize_objective"],
-                disciplines=disciplines,
-                formulation=st.session_state["#mdo formulation"],
-                grammar_type=MDODiscipline.GrammarType.SIMPLE,
+    elif st.button("Generate XDSM", type="primary") or state.renderer.is_requested(
+        "xdsm_html"
+    ):
+        return handle_render("xdsm_html", "XDSM diagram", show_xdsm)
+    return None
+
+
+def show_xdsm(source_code: str, key: str) -> None:
+    """Shows the XDSM diagram.
+
+    Args:
+        source_code: The source code of the HTML file.
+        key: The key unique to the version of the diagram.
+    """
+    st.download_button(
+        "Download XDSM standalone HTML file",
+        source_code,
+        file_name="xdsm.html",
+        key=key,
+    )
+    components.html(source_code, width=1280, height=1024)
+
+
+def handle_formulations_comparison() -> None:
+    """Handles the comparison of the XDSM diagrams of all the MDO formulations.
+
+    The XDSM diagrams are generated in parallel by the worker pool, side by side.
+    """
+    st.divider()
+    st.subheader("Formulations comparison")
+    if not st.button("Generate the XDSM of all the formulations"):
+        return
+
+    study = get_study()
+    inputs = study.inputs
+    jobs = compare_formulations(
+        inputs["disc_desc"],
+        study.get("hash"),
+        get_formulations(),
+        inputs["objective"],
+        inputs["maximize_objective"],
+        inputs["design_variables"],
+        inputs["constraints"],
+        get_session_id(),
+    )
+    wait_for_jobs(jobs)
+    formulations = list(jobs)
+    for i in range(0, len(formulations), 2):
+        for column, formulation in zip(st.columns(2), formulations[i : i + 2]):
+            with column:
+                st.markdown(f"**{formulation}**")
+                future = jobs[formulation].future
+                if future.exception() is not None:
+                    st.error(str(future.exception()))
+                else:
+                    components.html(future.result(), height=600, scrolling=True)
+
+
+def handle_dry_runs() -> None:
+    """Handles the dry runs of the scenario with the scalable disciplines.
+
+    The dry runs of the selected MDO formulations with the selected MDA settings
+    are executed one after the other by the worker pool
+    and compared in a table sorted by wall time.
+    """
+    st.divider()
+    st.subheader("Dry run")
+    st.markdown(
+        "Execute the scenario with the scalable disciplines "
+        "to compare the costs of the MDO formulations and of the MDA settings."
+    )
+    study = get_study()
+    inputs = study.inputs
+    formulations = list(get_formulations())
+    formulation = inputs["formulation"]
+    selected_formulations = st.multiselect(
+        "MDO formulations",
+        formulations,
+        default=[formulation] if formulation in formulations else [],
+        key="Dry run formulations",
+    )
+    mda_settings = st.multiselect(
+        "MDA settings",
+        MDA_SETTINGS,
+        default=[GAUSS_SEIDEL, JACOBI_PROCESSES],
+        key="Dry run MDA settings",
+    )
+    columns = st.columns(3)
+    with columns[0]:
+        mode = st.selectbox("Mode", MODES, key="Dry run mode")
+    with columns[1]:
+        n_iterations = int(
+            st.number_input(
+                "Number of samples" if mode == DOE else "Maximum number of iterations",
+                min_value=1,
+                max_value=50,
+                value=5,
+                key="Dry run iterations",
+            )
+        )
+    with columns[2]:
+        n_processes = int(
+            st.number_input(
+                "Number of threads or processes",
+                min_value=2,
+                max_value=max(2, os.cpu_count() or 2),
+                value=min(4, max(2, os.cpu_count() or 2)),
+                key="Dry run processes",
             )
-            cmap = {"inequality": "ineq", "equality": "eq"}
-            constraints = st.session_state["#constraints"]
-            for constr, ctype in constraints.items():
-                scenario.add_constraint(constr, constraint_type=cmap[ctype])
-        except Exception as err:
-            st.error(str(err))  # noqa: G200
-            return None
-    return scenario
-
-
-def generate_xdsm(scenario: MDOScenario) -> None:
-    """Generates the XDSM diagram."""
-    tmpdir = tempfile.mkdtemp()
-    scenario.xdsmize(directory_path=tmpdir)
-    tmp_html = join(tmpdir, "xdsm.html")
-    with open(tmp_html, encoding="utf-8") as html_file:
-        source_code = html_file.read()
-        st.download_button(
-            "Download XDSM standalone HTML file", source_code, file_name="xdsm.html"
         )
-        components.html(source_code, width=1280, height=1024)
 
+    if not selected_formulations or not mda_settings:
+        return
+
+    if not st.button("Execute the dry runs"):
+        return
+
+    try:
+        job = submit_dry_runs(
+            inputs["disc_desc"],
+            study.get("hash"),
+            selected_formulations,
+            mda_settings,
+            inputs["objective"],
+            inputs["maximize_objective"],
+            inputs["design_variables"],
+            inputs["constraints"],
+            n_processes,
+            mode,
+            n_iterations,
+            get_session_id(),
+        )
+    except RuntimeError as err:
+        st.warning(str(err))
+        return
+
+    wait_for_jobs({"Dry runs": job})
+    if job.future.exception() is not None:
+        st.error(str(job.future.exception()))
+        return
+
+    results = pd.DataFrame(job.future.result(), columns=COLUMNS)
+    st.dataframe(
+        results.sort_values(WALL_TIME, na_position="last"),
+        hide_index=True,
+        use_container_width=True,
+    )
+    st.caption(
+        "The dry runs are executed one after the other "
+        "so that their wall times can be compared; "
+        "the MDA settings have no effect on the formulations without MDA "
+        "except IDF, which executes the disciplines in parallel."
+    )
 
-st.title("XDSM Generation")
-handle_session_state()
 
-if "disciplines" not in st.session_state and "#disc_desc" in st.session_state:
-    create_disciplines()
+start_diagnostics()
+st.title("XDSM Generation")
 
 # Main display sequence
-if "disciplines" in st.session_state:
+if has_disc_desc():
     st.markdown(
         """
     The XDSM (eXtended Design Structure Matrix) diagram represents MDO process.
@@ -190,8 +491,12 @@ if "disciplines" in st.session_state:
     handle_formulation()
     handle_objective()
     handle_constraints()
-    scenario = handle_scenario()
-    if scenario is not None:
-        generate_xdsm(scenario)
+    render = handle_scenario()
+    handle_formulations_comparison()
+    handle_dry_runs()
+    if render is not None:
+        finish_renders(render)
 else:
     st.error("Disciplines are not ready, please check the Disciplines tab")
+
+handle_diagnostics("xdsm")
@@ -0,0 +1,397 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+# Contributors:
+#    INITIAL AUTHORS - API and implementation and/or documentation
+#        :author: Francois Gallard
+#    OTHER AUTHORS   - MACROSCOPIC CHANGES
+"""The helpers shared by the pages."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import marshal
+import pstats
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+from math import ceil
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+
+import streamlit as st
+import streamlit.components.v1 as components
+from gemseo_web_study import Study
+from gemseo_web_study import StudyState
+from gemseo_web_study.jobs import JOB_POOL
+from gemseo_web_study.jobs import Job
+from gemseo_web_study.metrics import METRICS_FILE
+from gemseo_web_study.metrics import STAGE_METRICS
+from gemseo_web_study.metrics import get_cache_statistics
+from gemseo_web_study.metrics import write_metrics
+from gemseo_web_study.summary import GROUP
+from gemseo_web_study.summary import N_COUPLING_INPUTS
+from gemseo_web_study.summary import N_COUPLING_OUTPUTS
+from gemseo_web_study.summary import SELF_COUPLED
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+Render = tuple[str, str, Callable[[Any, str], None], Any, Any]
+"""A diagram being rendered: its name, its name to display, the function showing it,
+the placeholder of its status and the placeholder of its versions."""
+
+PAGE_SIZE = 50
+"""The number of items per page of the tables and of the searches."""
+
+SUMMARY_COLUMNS = {
+    N_COUPLING_INPUTS: st.column_config.NumberColumn(
+        help="The number of inputs produced by other disciplines."
+    ),
+    N_COUPLING_OUTPUTS: st.column_config.NumberColumn(
+        help="The number of outputs consumed by other disciplines."
+    ),
+    SELF_COUPLED: st.column_config.CheckboxColumn(
+        help="Whether an input of the discipline is also one of its outputs."
+    ),
+    GROUP: st.column_config.NumberColumn(
+        help="The group of strongly coupled disciplines, "
+        "as in the coupling analysis of the N2 page."
+    ),
+}
+"""The configuration of the columns of the disciplines summary."""
+
+_n2_chart = components.declare_component(
+    "n2_chart", path=str(Path(__file__).parents[1] / "n2_chart")
+)
+"""The component drawing the N2 chart in the browser."""
+
+
+def get_state() -> StudyState:
+    """Returns the state of the study of the session, shared by the pages.
+
+    Returns:
+        The state of the study.
+    """
+    state = st.session_state.get("study_state")
+    if state is None:
+        state = st.session_state["study_state"] = StudyState()
+
+    return state
+
+
+def get_study() -> Study:
+    """Returns the study of the session.
+
+    Only the stages of the study depending on data that changed since the last
+    rerun will be recomputed.
+
+    Returns:
+        The study.
+    """
+    return get_state().study
+
+
+def get_session_id() -> str | None:
+    """Returns the identifier of the session.
+
+    Returns:
+        The identifier of the session, if any.
+    """
+    context = get_script_run_ctx()
+    return None if context is None else context.session_id
+
+
+def describe_job(job: Job) -> str:
+    """Describes the status of a job of the worker pool.
+
+    Args:
+        job: The job.
+
+    Returns:
+        The description of the status of the job.
+    """
+    if job.status == Job.QUEUED:
+        return (
+            f"queued at position {JOB_POOL.get_position(job)} "
+            f"of {JOB_POOL.n_queued_jobs}"
+        )
+
+    return f"running for {job.elapsed_time:.0f} s"
+
+
+def wait_for_jobs(jobs: Mapping[str, Job]) -> None:
+    """Waits for jobs of the worker pool, showing whether they are queued or running.
+
+    Args:
+        jobs: The jobs bound to the names to display.
+    """
+    placeholder = st.empty()
+    while pending := {name: job for name, job in jobs.items() if not job.future.done()}:
+        placeholder.info(
+            "  \n".join(f"{name}: {describe_job(job)}" for name, job in pending.items())
+        )
+        wait(
+            [job.future for job in pending.values()],
+            timeout=0.5,
+            return_when=FIRST_COMPLETED,
+        )
+
+    placeholder.empty()
+
+
+def handle_render(diagram: str, name: str, show: Callable[[Any, str], None]) -> Render:
+    """Shows the last rendered version of a diagram and requests its latest version.
+
+    The latest version is rendered in the background
+    and shown by :func:`.finish_renders` at the end of the page,
+    the last rendered version remaining displayed meanwhile.
+
+    Args:
+        diagram: The name of the diagram.
+        name: The name of the diagram to display.
+        show: The function showing a version of the diagram
+            from its value and a key unique to the version.
+
+    Returns:
+        The render to finish.
+    """
+    renderer = get_state().renderer
+    renderer.request(diagram)
+    status = st.empty()
+    container = st.empty()
+    result = renderer.get_result(diagram)
+    if result is not None:
+        with container.container():
+            show(result[1], f"{diagram} {result[0]}")
+
+    return diagram, name, show, status, container
+
+
+def finish_renders(*renders: Render) -> None:
+    """Waits for the latest versions of diagrams, showing the status of their rendering.
+
+    The rendering waits for the debouncing delay,
+    so that it is not submitted while the data are being edited,
+    as an edit interrupts the run of the page.
+
+    Args:
+        *renders: The renders returned by :func:`.handle_render`.
+    """
+    renderer = get_state().renderer
+    pending = list(renders)
+    while pending:
+        futures = []
+        timeout = 0.5
+        for render in list(pending):
+            diagram, name, show, status, container = render
+            try:
+                job = renderer.poll(diagram, get_session_id())
+            except RuntimeError as err:
+                status.warning(str(err))
+                pending.remove(render)
+                continue
+
+            if job is not None and not job.future.done():
+                status.info(f"Updating the {name}: {describe_job(job)}")
+                futures.append(job.future)
+            elif renderer.is_up_to_date(diagram):
+                pending.remove(render)
+                status.empty()
+                error = renderer.get_error(diagram)
+                if error is not None:
+                    status.error(str(error))
+                elif job is not None:
+                    generation, value = renderer.get_result(diagram)
+                    with container.container():
+                        show(value, f"{diagram} {generation}")
+            else:
+                status.info(f"Updating the {name}: waiting for the edits to end")
+                timeout = min(timeout, renderer.get_delay(diagram))
+
+        if futures:
+            wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        elif pending:
+            time.sleep(timeout)
+
+
+def show_n2_chart(payload: str, height: int = 800, key: str | None = None) -> None:
+    """Shows the interactive N2 chart drawn in the browser.
+
+    The zoom, the pan, the highlighting and the tooltips are handled by the browser,
+    so that they do not rerun the page.
+
+    Args:
+        payload: The N2 payload, see :func:`.create_n2_payload`.
+        height: The height of the chart in pixels.
+        key: The key of the component.
+    """
+    _n2_chart(payload=payload, height=height, key=key, default=None)
+
+
+def has_disc_desc() -> bool:
+    """Whether the study has disciplines with inputs and outputs.
+
+    Returns:
+        Whether the disciplines are described.
+    """
+    return bool(get_study().inputs["disc_desc"])
+
+
+def handle_page(label: str, n_items: int, key: str) -> int:
+    """Handles the choice of a page of items.
+
+    Args:
+        label: The label of the widget.
+        n_items: The number of items.
+        key: The key of the widget.
+
+    Returns:
+        The position of the first item of the page.
+    """
+    n_pages = max(ceil(n_items / PAGE_SIZE), 1)
+    if st.session_state.get(key, 1) > n_pages:
+        st.session_state[key] = n_pages
+    page = st.number_input(
+        f"{label} (out of {n_pages})", min_value=1, max_value=n_pages, key=key
+    )
+    return (page - 1) * PAGE_SIZE
+
+
+def handle_disciplines_summary() -> None:
+    """Shows the summary of the disciplines page by page.
+
+    The summary is computed once per study
+    and only the rows of the current page are sent to the browser.
+    """
+    st.divider()
+    st.subheader("Disciplines summary")
+    try:
+        if has_disc_desc():
+            summary = get_study().get("summary")
+            coupling_graph = get_study().get("coupling_graph")
+            columns = st.columns([3, 1])
+            columns[0].caption(
+                f"Disciplines: {len(summary)}, groups of strongly coupled "
+                f"disciplines: {len(coupling_graph.strongly_coupled_groups)}."
+            )
+            with columns[1]:
+                start = handle_page("Page", len(summary), "Disciplines summary page")
+            st.dataframe(
+                summary.iloc[start : start + PAGE_SIZE],
+                hide_index=True,
+                column_config=SUMMARY_COLUMNS,
+            )
+            st.divider()
+
+    except (ValueError, TypeError) as error:
+        st.error(f"The disciplines summary cannot be computed: {error}")
+
+
+def start_diagnostics() -> None:
+    """Starts recording the durations of the stages evaluated by the run of the page.
+
+    The run is profiled when it has been requested from the diagnostics panel.
+    """
+    STAGE_METRICS.start_run()
+    if st.session_state.pop("profile_next_run", False):
+        profiler = st.session_state["profiler"] = cProfile.Profile()
+        profiler.enable()
+
+
+def request_profile() -> None:
+    """Requests the profiling of the next run of the page."""
+    st.session_state["profile_next_run"] = True
+
+
+def handle_diagnostics(page: str) -> None:
+    """Handles the diagnostics of the run of the page.
+
+    The durations of the stages are written to the metrics file, if any,
+    and shown in a diagnostics panel
+    when the page is opened with the query parameter ``diagnostics``,
+    e.g. ``?diagnostics=1``.
+
+    Args:
+        page: The name of the page.
+    """
+    profiler = st.session_state.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        profiler.create_stats()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(30)
+        st.session_state["profile"] = (stream.getvalue(), marshal.dumps(profiler.stats))
+
+    durations = STAGE_METRICS.stop_run()
+    if METRICS_FILE:
+        write_metrics(METRICS_FILE, page, durations)
+
+    if "diagnostics" not in st.query_params:
+        return
+
+    with st.expander("Diagnostics", expanded=True):
+        st.markdown("**Stages evaluated by this run**")
+        st.dataframe(
+            [
+                {"Stage": stage, "Duration (ms)": 1000 * duration}
+                for stage, duration in durations.items()
+            ],
+            hide_index=True,
+        )
+        st.markdown("**Stages evaluated by the server**")
+        evaluations = get_study().evaluations
+        st.dataframe(
+            [
+                {
+                    "Stage": stage,
+                    "Evaluations": statistics["count"],
+                    "Mean duration (ms)": 1000
+                    * statistics["total"]
+                    / statistics["count"],
+                    "Maximum duration (ms)": 1000 * statistics["max"],
+                    "Evaluations in this session": evaluations.get(stage, 0),
+                }
+                for stage, statistics in STAGE_METRICS.statistics.items()
+            ],
+            hide_index=True,
+        )
+        st.markdown("**Caches of the server**")
+        st.dataframe(
+            [
+                {
+                    "Cache": name,
+                    "Hits": statistics["hits"],
+                    "Misses": statistics["misses"],
+                    "Entries": statistics["entries"],
+                    "Memory (MiB)": statistics["memory"] / 2**20,
+                }
+                for name, statistics in get_cache_statistics().items()
+            ],
+            hide_index=True,
+        )
+        st.markdown(
+            f"**Worker pool:** {JOB_POOL.n_running_jobs} running jobs "
+            f"and {JOB_POOL.n_queued_jobs} queued jobs "
+            f"for {JOB_POOL.max_workers} worker processes"
+        )
+        st.button("Profile a rerun", on_click=request_profile)
+        if "profile" in st.session_state:
+            text, data = st.session_state["profile"]
+            st.code(text)
+            st.download_button("Download the profile", data, file_name=f"{page}.prof")
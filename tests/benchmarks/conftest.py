@@ -0,0 +1,167 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""The fixtures of the benchmarks.
+
+The benchmarks are run only when the environment variable
+``GEMSEO_WEB_STUDY_BENCHMARKS`` is set to ``1``:
+
+.. code-block:: console
+
+    GEMSEO_WEB_STUDY_BENCHMARKS=1 pytest tests/benchmarks
+
+The durations are written to the JSON file
+``GEMSEO_WEB_STUDY_BENCHMARKS_OUTPUT`` (default: ``benchmark_results.json``)
+with the versions of the main dependencies.
+A benchmark fails when it has no threshold in ``thresholds.json``
+or when its duration exceeds its threshold
+multiplied by ``GEMSEO_WEB_STUDY_BENCHMARKS_TOLERANCE`` (default: 1),
+so that a slower upgrade of a dependency is detected.
+The studies larger than ``GEMSEO_WEB_STUDY_BENCHMARKS_MAX_DISCIPLINES``
+are skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+from importlib.metadata import version
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Final
+
+import pytest
+from gemseo_web_study.warmup import warm_up
+
+from tests.benchmarks.studies import DENSITIES
+from tests.benchmarks.studies import create_disc_desc
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from gemseo_web_study.study import DisciplineDescription
+
+ENABLED: Final[bool] = os.environ.get("GEMSEO_WEB_STUDY_BENCHMARKS") == "1"
+"""Whether to run the benchmarks."""
+
+OUTPUT: Final[Path] = Path(
+    os.environ.get("GEMSEO_WEB_STUDY_BENCHMARKS_OUTPUT", "benchmark_results.json")
+)
+"""The path to the file of the results of the benchmarks."""
+
+TOLERANCE: Final[float] = float(
+    os.environ.get("GEMSEO_WEB_STUDY_BENCHMARKS_TOLERANCE", 1)
+)
+"""The factor applied to the thresholds."""
+
+MAX_DISCIPLINES: Final[int] = int(
+    os.environ.get("GEMSEO_WEB_STUDY_BENCHMARKS_MAX_DISCIPLINES", 5000)
+)
+"""The maximum number of disciplines of the studies to benchmark."""
+
+THRESHOLDS: Final[dict[str, float]] = json.loads(
+    (Path(__file__).parent / "thresholds.json").read_text()
+)
+"""The maximum durations in seconds bound to the names of the benchmarks."""
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Skip the benchmarks when they are not enabled or the studies are too large."""
+    directory_path = Path(__file__).parent
+    for item in items:
+        if directory_path not in item.path.parents:
+            continue
+
+        if not ENABLED:
+            item.add_marker(
+                pytest.mark.skip(reason="Set GEMSEO_WEB_STUDY_BENCHMARKS=1 to run.")
+            )
+        elif item.callspec.params.get("n_disciplines", 0) > MAX_DISCIPLINES:
+            item.add_marker(pytest.mark.skip(reason="The study is too large."))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_up() -> None:
+    """Import the heavy modules before the first benchmark."""
+    warm_up()
+
+
+@pytest.fixture(scope="session")
+def benchmark_results() -> Iterator[list[dict[str, Any]]]:
+    """The results of the benchmarks, written to :attr:`.OUTPUT` at the end."""
+    results = []
+    yield results
+    if results:
+        OUTPUT.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "versions": {
+                        name: version(name)
+                        for name in ("gemseo", "streamlit", "numpy", "scipy")
+                    },
+                    "tolerance": TOLERANCE,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+
+@pytest.fixture
+def measure(
+    request: pytest.FixtureRequest, benchmark_results: list[dict[str, Any]]
+) -> Callable[..., Any]:
+    """A function measuring the duration of a function and checking its threshold.
+
+    The duration is the minimum duration of ``repeat`` calls.
+    """
+
+    def measure_(function: Callable[[], Any], repeat: int = 1) -> Any:
+        durations = []
+        for _ in range(repeat):
+            start = perf_counter()
+            result = function()
+            durations.append(perf_counter() - start)
+
+        name = request.node.name
+        duration = min(durations)
+        threshold = THRESHOLDS.get(name)
+        passed = threshold is not None and duration <= threshold * TOLERANCE
+        benchmark_results.append({
+            "name": name,
+            "duration": duration,
+            "threshold": threshold,
+            "passed": passed,
+        })
+        assert threshold is not None, f"{name} has no threshold in thresholds.json."
+        assert passed, (
+            f"{name} took {duration:.3f} s, "
+            f"more than the threshold of {threshold * TOLERANCE:.3f} s."
+        )
+
+        return result
+
+    return measure_
+
+
+@pytest.fixture
+def disc_desc(n_disciplines: int, density: str) -> tuple[DisciplineDescription, ...]:
+    """The descriptions of the disciplines of a synthetic study."""
+    return create_disc_desc(n_disciplines, DENSITIES[density])
@@ -0,0 +1,82 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Synthetic studies for the benchmarks."""
+
+from __future__ import annotations
+
+from random import Random
+from typing import TYPE_CHECKING
+from typing import Final
+
+if TYPE_CHECKING:
+    from gemseo_web_study.study import DisciplineDescription
+
+SIZES: Final[tuple[int, ...]] = (10, 100, 1000, 5000)
+"""The numbers of disciplines of the synthetic studies."""
+
+DENSITIES: Final[dict[str, int]] = {"sparse": 2, "dense": 8}
+"""The maximum numbers of coupling inputs per discipline bound to density names."""
+
+FEEDBACK_RATIO: Final[float] = 0.1
+"""The ratio of the coupling inputs produced by a downstream discipline.
+
+The other coupling inputs are produced by upstream disciplines.
+"""
+
+OBJECTIVE: Final[str] = "f"
+"""The name of the objective, an output of the last discipline."""
+
+CONSTRAINT: Final[str] = "g"
+"""The name of the constraint, an output of the last discipline."""
+
+
+def create_disc_desc(
+    n_disciplines: int, n_couplings: int, seed: int = 0
+) -> tuple[DisciplineDescription, ...]:
+    """Create the descriptions of the disciplines of a synthetic study.
+
+    The discipline ``i`` has the local input ``x_i``,
+    up to ``n_couplings`` coupling inputs ``y_j``
+    and the output ``y_i``;
+    the last discipline also has the outputs :attr:`.OBJECTIVE`
+    and :attr:`.CONSTRAINT`.
+
+    Args:
+        n_disciplines: The number of disciplines.
+        n_couplings: The maximum number of coupling inputs per discipline.
+        seed: The seed of the random number generator choosing the couplings.
+
+    Returns:
+        The descriptions of the disciplines.
+    """
+    generator = Random(seed)
+    disc_desc = []
+    for i in range(n_disciplines):
+        inputs = {f"x_{i}": None}
+        for _ in range(n_couplings if i else 0):
+            if generator.random() < FEEDBACK_RATIO:
+                j = generator.randrange(n_disciplines)
+            else:
+                j = generator.randrange(i)
+            if j != i:
+                inputs[f"y_{j}"] = None
+
+        outputs = (f"y_{i}",)
+        if i == n_disciplines - 1:
+            outputs += (OBJECTIVE, CONSTRAINT)
+
+        disc_desc.append((f"discipline_{i}", tuple(inputs), outputs))
+
+    return tuple(disc_desc)
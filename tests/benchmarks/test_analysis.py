@@ -0,0 +1,120 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Benchmarks of the analysis of the disciplines."""
+
+from __future__ import annotations
+
+import pytest
+from gemseo.core.coupling_structure import MDOCouplingStructure
+from gemseo_web_study import Study
+from gemseo_web_study.coupling_graph import CouplingGraph
+from gemseo_web_study.formulation_cost import FORMULATION
+from gemseo_web_study.formulation_cost import FORMULATIONS
+from gemseo_web_study.formulation_cost import FormulationCostModel
+from gemseo_web_study.name_table import DisciplinesTable
+from gemseo_web_study.ordering import FeedbackOrdering
+from gemseo_web_study.scenario import create_disciplines
+from gemseo_web_study.schedule import ExecutionSchedule
+from gemseo_web_study.summary import create_summary
+from numpy import flatnonzero
+
+from tests.benchmarks.studies import CONSTRAINT
+from tests.benchmarks.studies import DENSITIES
+from tests.benchmarks.studies import OBJECTIVE
+from tests.benchmarks.studies import SIZES
+
+pytestmark = [
+    pytest.mark.parametrize("n_disciplines", SIZES),
+    pytest.mark.parametrize("density", DENSITIES),
+]
+
+
+def test_all_ios(disc_desc, n_disciplines, measure):
+    """Benchmark the names of the inputs and outputs of all the disciplines."""
+    input_names, output_names = measure(
+        lambda: Study(disc_desc=disc_desc).get("all_ios"), repeat=3
+    )
+    assert len(input_names) == len({name for desc in disc_desc for name in desc[1]})
+    assert len(output_names) == n_disciplines + 2
+    assert {OBJECTIVE, CONSTRAINT} <= set(output_names)
+
+
+def test_coupling_graph(disc_desc, measure):
+    """Benchmark the coupling graph built from the names of the variables."""
+    coupling_graph = measure(
+        lambda: Study(disc_desc=disc_desc).get("coupling_graph"), repeat=3
+    )
+    input_names = {name for desc in disc_desc for name in desc[1]}
+    output_names = {name for desc in disc_desc for name in desc[2]}
+    assert coupling_graph.discipline_names == [desc[0] for desc in disc_desc]
+    assert coupling_graph.all_couplings == sorted(input_names & output_names)
+
+
+def test_summary(disc_desc, n_disciplines, measure):
+    """Benchmark the summary of the disciplines."""
+    table = DisciplinesTable(disc_desc)
+    coupling_graph = CouplingGraph(disc_desc)
+    summary = measure(lambda: create_summary(table, coupling_graph), repeat=3)
+    assert len(summary) == n_disciplines
+
+
+def test_schedule(disc_desc, measure):
+    """Benchmark the schedule of the execution of the disciplines on 8 workers."""
+    coupling_graph = CouplingGraph(disc_desc)
+    speedup = measure(
+        lambda: ExecutionSchedule(coupling_graph).get_speedup(8), repeat=3
+    )
+    assert 1.0 <= speedup <= 8.0
+
+
+def test_cost_model(disc_desc, measure):
+    """Benchmark the analytic costs of the MDO formulations."""
+    coupling_graph = CouplingGraph(disc_desc)
+    design_variables = coupling_graph.variable_names[:10].tolist()
+    costs = measure(
+        lambda: FormulationCostModel(coupling_graph).get_costs(design_variables, ()),
+        repeat=3,
+    )
+    assert sorted(costs[FORMULATION]) == sorted(FORMULATIONS)
+
+
+def test_ordering(disc_desc, n_disciplines, measure):
+    """Benchmark the order of the disciplines minimizing the feedback couplings."""
+    coupling_graph = CouplingGraph(disc_desc)
+    ordering = measure(lambda: FeedbackOrdering(coupling_graph), repeat=3)
+    assert sorted(ordering.order.tolist()) == list(range(n_disciplines))
+    assert ordering.feedbacks <= ordering.initial_feedbacks
+
+
+def test_create_disciplines(disc_desc, measure):
+    """Benchmark the creation of the disciplines."""
+    disciplines = measure(lambda: create_disciplines(disc_desc))
+    assert [discipline.name for discipline in disciplines] == [
+        desc[0] for desc in disc_desc
+    ]
+
+
+def test_coupling_structure(disc_desc, measure):
+    """Benchmark the creation of the coupling structure of the disciplines."""
+    disciplines = create_disciplines(disc_desc)
+    coupling_structure = measure(lambda: MDOCouplingStructure(disciplines))
+    coupling_graph = CouplingGraph(disc_desc)
+    assert {
+        discipline.name
+        for discipline in coupling_structure.strongly_coupled_disciplines
+    } == {
+        coupling_graph.discipline_names[index]
+        for index in flatnonzero(coupling_graph.strongly_coupled)
+    }
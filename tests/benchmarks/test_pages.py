@@ -0,0 +1,70 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Benchmarks of the runs of the pages of the web interface."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from gemseo_web_study import Study
+from gemseo_web_study import StudyState
+from streamlit.testing.v1 import AppTest
+
+from tests.benchmarks.studies import DENSITIES
+from tests.benchmarks.studies import OBJECTIVE
+from tests.benchmarks.studies import SIZES
+
+ROOT = Path(__file__).parents[2]
+
+pytestmark = [
+    pytest.mark.parametrize("n_disciplines", SIZES),
+    pytest.mark.parametrize("density", DENSITIES),
+    pytest.mark.parametrize(
+        "page",
+        [
+            "1_Define_the_disciplines",
+            "2_Generate_the_N2_diagram",
+            "3_Generate_the_XDSM_diagram",
+        ],
+    ),
+]
+
+
+@pytest.fixture
+def app(disc_desc, page) -> AppTest:
+    """The page of the web interface for a new session with a study."""
+    state = StudyState(
+        Study(disc_desc=disc_desc, design_variables=["x_0"], objective=OBJECTIVE)
+    )
+    state.update(disciplines_editor="Table")
+    app = AppTest.from_file(str(ROOT / "pages" / f"{page}.py"), default_timeout=600)
+    app.session_state["study_state"] = state
+    return app
+
+
+def test_run(app, measure):
+    """Benchmark the first run of a page in a session."""
+    measure(app.run)
+    assert not app.exception
+    assert not app.error
+
+
+def test_rerun(app, measure):
+    """Benchmark the rerun of a page without any change."""
+    app.run()
+    measure(app.run, repeat=3)
+    assert not app.exception
+    assert not app.error
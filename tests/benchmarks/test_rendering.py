@@ -0,0 +1,92 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Benchmarks of the rendering of the N2 and XDSM diagrams."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from gemseo.core.coupling_structure import MDOCouplingStructure
+from gemseo_web_study.coupling_graph import CouplingGraph
+from gemseo_web_study.formulation_cost import FORMULATIONS
+from gemseo_web_study.n2 import create_n2_payload
+from gemseo_web_study.n2 import generate_n2_html
+from gemseo_web_study.n2 import render_n2
+from gemseo_web_study.scenario import build_scenario
+from gemseo_web_study.scenario import create_disciplines
+from gemseo_web_study.xdsm import generate_xdsm_html
+
+from tests.benchmarks.studies import CONSTRAINT
+from tests.benchmarks.studies import DENSITIES
+from tests.benchmarks.studies import OBJECTIVE
+from tests.benchmarks.studies import SIZES
+
+pytestmark = [
+    pytest.mark.parametrize("n_disciplines", SIZES),
+    pytest.mark.parametrize("density", DENSITIES),
+]
+
+
+def test_static_n2(disc_desc, measure):
+    """Benchmark the rendering of the static N2 chart."""
+    coupling_graph = CouplingGraph(disc_desc)
+    image = measure(lambda: render_n2(coupling_graph))
+    assert image.startswith(b"\x89PNG")
+
+
+def test_n2_payload(disc_desc, measure):
+    """Benchmark the creation of the payload of the N2 chart drawn by the browser."""
+    coupling_graph = CouplingGraph(disc_desc)
+    payload = json.loads(measure(lambda: create_n2_payload(coupling_graph)))
+    assert payload["disciplines"] == coupling_graph.discipline_names
+    assert len(payload["sources"]) == len(payload["targets"])
+
+
+def test_html_n2(disc_desc, measure):
+    """Benchmark the generation of the interactive N2 chart."""
+    coupling_structure = MDOCouplingStructure(create_disciplines(disc_desc))
+    html = measure(lambda: generate_n2_html(coupling_structure))
+    assert html.startswith("<!DOCTYPE html>")
+    assert disc_desc[-1][0] in html
+
+
+@pytest.mark.parametrize("formulation", FORMULATIONS)
+def test_xdsm(disc_desc, formulation, measure):
+    """Benchmark the creation of a scenario and the generation of its XDSM diagram.
+
+    The IDF formulation uses the coupling variables as design variables
+    and the constraint of the BiLevel formulation is not supported
+    since it is not the output of a sub-scenario.
+    """
+    design_variables = ["x_0"]
+    if formulation == "IDF":
+        design_variables += CouplingGraph(disc_desc).all_couplings
+
+    constraints = [] if formulation == "BiLevel" else [(CONSTRAINT, "inequality")]
+    disciplines = create_disciplines(disc_desc)
+    html = measure(
+        lambda: generate_xdsm_html(
+            build_scenario(
+                disciplines,
+                formulation,
+                OBJECTIVE,
+                False,
+                design_variables,
+                constraints,
+            )
+        )
+    )
+    assert disc_desc[-1][0] in html
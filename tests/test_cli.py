@@ -0,0 +1,127 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the command line interface."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from gemseo_web_study.cli import get_study_name
+from gemseo_web_study.cli import main
+from gemseo_web_study.cli import render_studies
+from gemseo_web_study.cli import render_study
+from gemseo_web_study.study import Study
+from gemseo_web_study.study_file import dump_study
+
+DISC_DESC = (("A", ("x", "b"), ("a",)), ("B", ("a",), ("b", "f", "g")))
+
+
+def write_study(
+    file_path: Path, formulation: str = "MDF", compress: bool = False
+) -> Path:
+    """Write a study file.
+
+    Args:
+        file_path: The path to the study file.
+        formulation: The name of the MDO formulation.
+        compress: Whether to compress the study file.
+
+    Returns:
+        The path to the study file.
+    """
+    file_path.write_bytes(
+        dump_study(
+            Study(
+                disc_desc=DISC_DESC,
+                design_variables=["x"],
+                formulation=formulation,
+                objective="f",
+                constraints=[("g", "inequality")],
+            ),
+            compress=compress,
+        )
+    )
+    return file_path
+
+
+@pytest.mark.parametrize(
+    ("file_name", "name"),
+    [("study.json", "study"), ("study.json.gz", "study"), ("my.study.gz", "my")],
+)
+def test_get_study_name(file_name, name):
+    """Check the name of a study file without its extensions."""
+    assert get_study_name(Path(file_name)) == name
+
+
+def test_render_study(tmp_path):
+    """Check the files of the diagrams of a study."""
+    file_path = write_study(tmp_path / "study.json.gz", compress=True)
+    file_paths = render_study(file_path, tmp_path / "output")
+    directory_path = tmp_path / "output" / "study"
+    assert file_paths == [
+        directory_path / "n2.png",
+        directory_path / "n2.html",
+        directory_path / "xdsm.html",
+    ]
+    assert file_paths[0].read_bytes().startswith(b"\x89PNG")
+    assert "xdsm" in file_paths[2].read_text(encoding="utf-8").lower()
+
+
+def test_render_study_without_xdsm(tmp_path):
+    """Check that the XDSM diagram can be skipped."""
+    file_path = write_study(tmp_path / "study.json")
+    file_paths = render_study(file_path, tmp_path, n2=False, xdsm=False)
+    assert file_paths == []
+
+
+def test_render_study_error(tmp_path):
+    """Check that a study failing to render leaves no partial output."""
+    file_path = write_study(tmp_path / "study.json", formulation="IDF")
+    with pytest.raises(ValueError, match="needs coupling variables as design"):
+        render_study(file_path, tmp_path / "output")
+
+    assert not (tmp_path / "output").exists()
+
+
+def test_render_studies_with_same_names(tmp_path):
+    """Check that study files with the same names raise an error."""
+    (tmp_path / "a").mkdir()
+    file_paths = [tmp_path / "study.json", tmp_path / "a" / "study.json.gz"]
+    with pytest.raises(ValueError, match="The study files must have different names: "):
+        render_studies(file_paths, tmp_path)
+
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(file_path) for file_path in file_paths])
+
+    assert exit_info.value.code == 2
+
+
+def test_main(tmp_path):
+    """Check the exit status when a study fails and another one succeeds."""
+    output_directory = tmp_path / "output"
+    args = [
+        str(write_study(tmp_path / "mdf.json")),
+        str(write_study(tmp_path / "idf.json", formulation="IDF")),
+        "-o",
+        str(output_directory),
+        "-j",
+        "2",
+        "--no-n2",
+    ]
+    assert main(args) == 1
+    assert [path.name for path in (output_directory / "mdf").iterdir()] == ["xdsm.html"]
+    assert not (output_directory / "idf").exists()
+    assert main(args[:1] + args[2:]) == 0
@@ -0,0 +1,108 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the coupling graph."""
+
+from __future__ import annotations
+
+import pytest
+from gemseo.core.coupling_structure import MDOCouplingStructure
+from gemseo_web_study.coupling_graph import CouplingGraph
+from gemseo_web_study.scenario import create_disciplines
+from numpy import array_equal
+
+from tests.benchmarks.studies import create_disc_desc
+
+
+@pytest.fixture(params=[(10, 2, 0), (30, 8, 1), (50, 4, 2)], ids=str)
+def disc_desc(request):
+    """The descriptions of synthetic disciplines with a self-coupled discipline."""
+    return (*create_disc_desc(*request.param), ("S", ("s", "x_0"), ("s",)))
+
+
+def test_coupling_structure(disc_desc):
+    """Check that the couplings are the ones of the coupling structure of GEMSEO."""
+    coupling_graph = CouplingGraph(disc_desc)
+    disciplines = create_disciplines(disc_desc)
+    coupling_structure = MDOCouplingStructure(disciplines)
+    assert coupling_graph.all_couplings == sorted(coupling_structure.all_couplings)
+    assert coupling_graph.strong_couplings == sorted(
+        coupling_structure.strong_couplings
+    )
+    assert coupling_graph.weak_couplings == sorted(coupling_structure.weak_couplings)
+    assert coupling_graph.self_coupled.tolist() == [
+        coupling_structure.is_self_coupled(discipline) for discipline in disciplines
+    ]
+    assert sorted(
+        sorted(coupling_graph.discipline_names[index] for index in group)
+        for group in coupling_graph.strongly_coupled_groups
+    ) == sorted(
+        sorted(discipline.name for discipline in group)
+        for group in coupling_structure.get_strongly_coupled_disciplines(by_group=True)
+    )
+
+
+def test_group_indices(disc_desc):
+    """Check the index of the group of strongly coupled disciplines of each one."""
+    coupling_graph = CouplingGraph(disc_desc)
+    group_indices = coupling_graph.group_indices
+    for index, group in enumerate(coupling_graph.strongly_coupled_groups):
+        assert (group_indices[group] == index).all()
+
+    assert (group_indices[~coupling_graph.strongly_coupled] == -1).all()
+
+
+def test_get_coupling_variables():
+    """Check the variables produced by a discipline and consumed by another one."""
+    coupling_graph = CouplingGraph((
+        ("A", ("x",), ("y", "z")),
+        ("B", ("y", "z"), ("w",)),
+    ))
+    assert coupling_graph.get_coupling_variables(0, 1) == ["y", "z"]
+    assert coupling_graph.get_coupling_variables(1, 0) == []
+
+
+@pytest.mark.parametrize(
+    ("index", "input_names", "output_names"),
+    [
+        (3, ("x_3", "y_9", "new"), ("y_3",)),
+        (0, ("x_0",), ("y_0", "y_5")),
+        (5, (), ()),
+    ],
+)
+def test_update_discipline(disc_desc, index, input_names, output_names):
+    """Check that an updated graph is the graph of the updated descriptions."""
+    coupling_graph = CouplingGraph(disc_desc).update_discipline(
+        index, input_names, output_names
+    )
+    disc_desc = list(disc_desc)
+    disc_desc[index] = (disc_desc[index][0], input_names, output_names)
+    expected = CouplingGraph(disc_desc)
+    assert coupling_graph.all_couplings == expected.all_couplings
+    assert coupling_graph.strong_couplings == expected.strong_couplings
+    assert coupling_graph.weak_couplings == expected.weak_couplings
+    assert array_equal(coupling_graph.group_indices, expected.group_indices)
+    assert (coupling_graph.adjacency != expected.adjacency).nnz == 0
+
+
+def test_update_discipline_couplings():
+    """Check the couplings added and removed by the update of a discipline."""
+    coupling_graph = CouplingGraph((
+        ("A", ("x",), ("y",)),
+        ("B", ("y",), ("z",)),
+        ("C", ("w",), ("v",)),
+    )).update_discipline(1, ("v",), ("z",), "D")
+    assert coupling_graph.discipline_names == ["A", "D", "C"]
+    assert coupling_graph.added_couplings == [("C", "D", "v")]
+    assert coupling_graph.removed_couplings == [("A", "B", "y")]
@@ -0,0 +1,123 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the import of the disciplines from files."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from gemseo_web_study.disciplines_io import join_names
+from gemseo_web_study.disciplines_io import read_disciplines
+from gemseo_web_study.disciplines_io import records_to_disc_desc
+from gemseo_web_study.disciplines_io import split_names
+
+DISC_DESC = (("A", ("x", "y"), ("a",)), ("B", ("a",), ()))
+
+
+@pytest.mark.parametrize(
+    ("names", "expected"),
+    [
+        ("x, y;z  t", ("x", "y", "z", "t")),
+        ("", ()),
+        (None, ()),
+        (float("nan"), ()),
+        ([" x ", "", "y"], ("x", "y")),
+    ],
+)
+def test_split_names(names, expected):
+    """Check the split of the content of a cell into variable names."""
+    assert split_names(names) == expected
+
+
+def test_join_names():
+    """Check that the joined names can be split again."""
+    assert join_names(("x", "y")) == "x, y"
+    assert split_names(join_names(("x", "y"))) == ("x", "y")
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        [
+            {"name": "A", "inputs": "x, y", "outputs": "a"},
+            {" Name ": "B", "Inputs": ["a"], "Outputs": None},
+        ],
+        [("A", "x y", ["a"]), [" B ", "a", ""]],
+    ],
+)
+def test_records_to_disc_desc(records):
+    """Check the conversion of records into descriptions of disciplines."""
+    assert records_to_disc_desc(records) == DISC_DESC
+
+
+@pytest.mark.parametrize(
+    ("records", "message"),
+    [
+        ([{"name": "A", "inputs": "x"}], "The record 0 has no column outputs."),
+        ([("A", "x", "a"), ("B", "x")], r"The record 1 is not of the form \(name"),
+        ([(" ", "x", "a")], "The record 0 has no name."),
+        ([(float("nan"), "x", "a")], "The record 0 has no name."),
+        ([1, 2], r"The record 0 is not of the form \(name"),
+        (["abc"], r"The record 0 is not of the form \(name"),
+        ([("A", 1, "a")], "The inputs of the record 0 are not names."),
+        ([("A", "x", {"a": 1})], "The outputs of the record 0 are not names."),
+    ],
+)
+def test_records_to_disc_desc_error(records, message):
+    """Check that the wrong records raise an error."""
+    with pytest.raises(ValueError, match=message):
+        records_to_disc_desc(records)
+
+
+def test_read_csv(tmp_path):
+    """Check the reading of a CSV file."""
+    file_path = tmp_path / "disciplines.csv"
+    file_path.write_text('name,inputs,outputs\nA,"x, y",a\nB,a,\n', encoding="utf-8")
+    assert read_disciplines(file_path) == DISC_DESC
+    with file_path.open("rb") as file:
+        assert read_disciplines(file) == DISC_DESC
+
+
+def test_read_json(tmp_path):
+    """Check the reading of a JSON file whatever its extension."""
+    file_path = tmp_path / "disciplines.txt"
+    file_path.write_text(
+        json.dumps([
+            ["A", ["x", "y"], ["a"]],
+            {"name": "B", "inputs": "a", "outputs": []},
+        ]),
+        encoding="utf-8",
+    )
+    assert read_disciplines(file_path, ".JSON") == DISC_DESC
+    with file_path.open("rb") as file:
+        assert read_disciplines(file, "json") == DISC_DESC
+
+
+@pytest.mark.parametrize("content", [{"name": "A"}, 1])
+def test_read_json_without_list(tmp_path, content):
+    """Check that a JSON file without a list of records raises an error."""
+    file_path = tmp_path / "disciplines.json"
+    file_path.write_text(json.dumps(content), encoding="utf-8")
+    with pytest.raises(
+        ValueError, match=r"The JSON file does not contain a list of records\."
+    ):
+        read_disciplines(file_path)
+
+
+def test_unsupported_format(tmp_path):
+    """Check that an unsupported file format raises an error."""
+    with pytest.raises(ValueError, match="The file format 'txt' is not supported"):
+        read_disciplines(tmp_path / "disciplines.txt")
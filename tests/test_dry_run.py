@@ -0,0 +1,144 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the dry runs of the scenarios."""
+
+from __future__ import annotations
+
+import pytest
+from gemseo_web_study.dry_run import DISCIPLINE_CALLS
+from gemseo_web_study.dry_run import ERROR
+from gemseo_web_study.dry_run import EVALUATIONS
+from gemseo_web_study.dry_run import FORMULATION
+from gemseo_web_study.dry_run import GAUSS_SEIDEL
+from gemseo_web_study.dry_run import JACOBI
+from gemseo_web_study.dry_run import JACOBI_PROCESSES
+from gemseo_web_study.dry_run import JACOBI_THREADS
+from gemseo_web_study.dry_run import JACOBIAN_EVALUATIONS
+from gemseo_web_study.dry_run import MDA
+from gemseo_web_study.dry_run import MDA_ITERATIONS
+from gemseo_web_study.dry_run import OPTIMIZATION
+from gemseo_web_study.dry_run import WALL_TIME
+from gemseo_web_study.dry_run import _compare_dry_runs
+from gemseo_web_study.dry_run import dry_run
+from gemseo_web_study.dry_run import get_formulation_options
+from gemseo_web_study.dry_run import submit_dry_runs
+
+DISC_DESC = (("A", ("x", "b"), ("a",)), ("B", ("a",), ("b", "f", "g")))
+
+CONSTRAINTS = (("g", "inequality"),)
+
+
+@pytest.mark.parametrize(
+    ("formulation", "mda_settings", "expected"),
+    [
+        ("MDF", GAUSS_SEIDEL, {"inner_mda_name": "MDAGaussSeidel"}),
+        ("BiLevel", JACOBI, {"inner_mda_name": "MDAJacobi", "n_processes": 1}),
+        (
+            "MDF",
+            JACOBI_THREADS,
+            {"inner_mda_name": "MDAJacobi", "n_processes": 3, "use_threading": True},
+        ),
+        ("IDF", JACOBI_PROCESSES, {"n_processes": 3, "use_threading": False}),
+        ("IDF", GAUSS_SEIDEL, {"n_processes": 1}),
+        ("DisciplinaryOpt", JACOBI_THREADS, {}),
+    ],
+)
+def test_get_formulation_options(formulation, mda_settings, expected):
+    """Check the options of the MDO formulations implementing MDA settings."""
+    assert get_formulation_options(formulation, mda_settings, 3) == expected
+
+
+def test_unsupported_mda_settings():
+    """Check that unsupported MDA settings raise an error."""
+    with pytest.raises(
+        ValueError, match=r"The MDA settings 'Newton' are not supported\."
+    ):
+        get_formulation_options("MDF", "Newton", 1)
+
+    with pytest.raises(
+        ValueError, match=r"The MDA settings 'Newton' are not supported\."
+    ):
+        submit_dry_runs(DISC_DESC, "hash", ["MDF"], ["Newton"], "f", False, ["x"], ())
+
+
+@pytest.mark.parametrize("formulation", ["MDF", "IDF"])
+def test_dry_run_doe(formulation):
+    """Check the counters of a short DOE."""
+    result = dry_run(
+        DISC_DESC,
+        formulation,
+        "f",
+        False,
+        ["x"],
+        CONSTRAINTS,
+        get_formulation_options(formulation, GAUSS_SEIDEL, 1),
+        n_iterations=2,
+    )
+    assert result[WALL_TIME] > 0
+    assert result[EVALUATIONS] == 2
+    assert result[JACOBIAN_EVALUATIONS] == 0
+    if formulation == "MDF":
+        assert result[MDA_ITERATIONS] > 0
+        assert result[DISCIPLINE_CALLS] > 2 * len(DISC_DESC)
+    else:
+        assert result[MDA_ITERATIONS] == 0
+        assert result[DISCIPLINE_CALLS] == 2 * len(DISC_DESC)
+
+
+def test_dry_run_optimization():
+    """Check that a few iterations of an optimizer compute Jacobians."""
+    result = dry_run(
+        DISC_DESC,
+        "MDF",
+        "f",
+        False,
+        ["x"],
+        CONSTRAINTS,
+        get_formulation_options("MDF", GAUSS_SEIDEL, 1),
+        mode=OPTIMIZATION,
+        n_iterations=2,
+    )
+    assert 0 < result[EVALUATIONS] <= 2
+    assert result[JACOBIAN_EVALUATIONS] > 0
+
+
+def test_dry_run_invalid_mode():
+    """Check that an invalid mode raises an error."""
+    with pytest.raises(ValueError, match="The dry run mode 'foo' is not one of"):
+        dry_run(DISC_DESC, "MDF", "f", False, ["x"], (), {}, mode="foo")
+
+
+def test_compare_dry_runs():
+    """Check that a dry run fails independently of the others."""
+    results = _compare_dry_runs(
+        DISC_DESC,
+        "f",
+        False,
+        ["x"],
+        CONSTRAINTS,
+        [
+            ("MDF", GAUSS_SEIDEL, {"inner_mda_name": "MDAGaussSeidel"}),
+            ("MDF", JACOBI, {"inner_mda_name": "MDAFoo"}),
+        ],
+        "DOE",
+        2,
+    )
+    assert [(result[FORMULATION], result[MDA]) for result in results] == [
+        ("MDF", GAUSS_SEIDEL),
+        ("MDF", JACOBI),
+    ]
+    assert ERROR not in results[0]
+    assert results[0][EVALUATIONS] == 2
+    assert set(results[1]) == {FORMULATION, MDA, ERROR}
@@ -0,0 +1,168 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the analytic cost model of the MDO formulations."""
+
+from __future__ import annotations
+
+import pytest
+from gemseo_web_study.coupling_graph import CouplingGraph
+from gemseo_web_study.formulation_cost import CONSISTENCY_CONSTRAINTS
+from gemseo_web_study.formulation_cost import CONSTRAINTS
+from gemseo_web_study.formulation_cost import COUPLING_VARIABLES
+from gemseo_web_study.formulation_cost import DISCIPLINES
+from gemseo_web_study.formulation_cost import EVALUATIONS_PER_ITERATION
+from gemseo_web_study.formulation_cost import FORMULATION
+from gemseo_web_study.formulation_cost import FORMULATIONS
+from gemseo_web_study.formulation_cost import GROUP
+from gemseo_web_study.formulation_cost import MDA_UNKNOWNS
+from gemseo_web_study.formulation_cost import OPTIMIZATION_VARIABLES
+from gemseo_web_study.formulation_cost import REMARK
+from gemseo_web_study.formulation_cost import VIABLE
+from gemseo_web_study.formulation_cost import FormulationCostModel
+
+DISC_DESC = (
+    ("A", ("x", "b"), ("a",)),
+    ("B", ("a", "z"), ("b",)),
+    ("C", ("a", "b"), ("c",)),
+)
+
+DESIGN_VARIABLES = ("x", "z")
+
+CONSTRAINT_TYPES = (("c", "inequality"),)
+
+
+@pytest.fixture(scope="module")
+def cost_model() -> FormulationCostModel:
+    """The cost model of a study with a group of two strongly coupled disciplines."""
+    return FormulationCostModel(CouplingGraph(DISC_DESC))
+
+
+def test_sizes(cost_model):
+    """Check the sizes of the groups of strongly coupled disciplines."""
+    assert cost_model.n_disciplines == 3
+    assert cost_model.couplings == {"a", "b"}
+    assert cost_model.n_strongly_coupled == 2
+    assert cost_model.n_strong_couplings == 2
+    mda_sizes = cost_model.get_mda_sizes()
+    assert mda_sizes[GROUP].tolist() == [1]
+    assert mda_sizes[DISCIPLINES].tolist() == [2]
+    assert mda_sizes[COUPLING_VARIABLES].tolist() == [2]
+
+
+@pytest.mark.parametrize(
+    ("formulation", "expected"),
+    [
+        (
+            "MDF",
+            {
+                VIABLE: True,
+                OPTIMIZATION_VARIABLES: 2,
+                CONSISTENCY_CONSTRAINTS: 0,
+                CONSTRAINTS: 1,
+                MDA_UNKNOWNS: 2,
+                EVALUATIONS_PER_ITERATION: 3 + 2 * 4,
+            },
+        ),
+        (
+            "IDF",
+            {
+                VIABLE: False,
+                OPTIMIZATION_VARIABLES: 4,
+                CONSISTENCY_CONSTRAINTS: 2,
+                CONSTRAINTS: 3,
+                MDA_UNKNOWNS: 0,
+                EVALUATIONS_PER_ITERATION: 3,
+            },
+        ),
+        (
+            "BiLevel",
+            {
+                VIABLE: False,
+                OPTIMIZATION_VARIABLES: 2,
+                CONSISTENCY_CONSTRAINTS: 0,
+                CONSTRAINTS: 1,
+                MDA_UNKNOWNS: 2,
+                EVALUATIONS_PER_ITERATION: 2 * (3 + 2 * 4),
+            },
+        ),
+        (
+            "DisciplinaryOpt",
+            {
+                VIABLE: False,
+                OPTIMIZATION_VARIABLES: 2,
+                CONSISTENCY_CONSTRAINTS: 0,
+                CONSTRAINTS: 1,
+                MDA_UNKNOWNS: 0,
+                EVALUATIONS_PER_ITERATION: 3,
+            },
+        ),
+    ],
+)
+def test_estimate(cost_model, formulation, expected):
+    """Check the estimated cost of an MDO formulation."""
+    cost = cost_model.estimate(formulation, DESIGN_VARIABLES, CONSTRAINT_TYPES, 5)
+    assert cost[FORMULATION] == formulation
+    assert {name: cost[name] for name in expected} == expected
+
+
+def test_idf_with_coupling_design_variables(cost_model):
+    """Check that IDF is viable when the couplings are design variables."""
+    cost = cost_model.estimate("IDF", ("x", "z", "a", "b"), CONSTRAINT_TYPES)
+    assert cost[VIABLE]
+    assert cost[OPTIMIZATION_VARIABLES] == 4
+    assert cost[REMARK] == "The disciplines can be executed in parallel."
+
+
+def test_idf_without_coupling_design_variables(cost_model):
+    """Check that IDF is not viable when couplings are not design variables."""
+    cost = cost_model.estimate("IDF", ("x", "a"), CONSTRAINT_TYPES)
+    assert not cost[VIABLE]
+    assert cost[REMARK] == "1 coupling variables are not design variables."
+
+
+def test_bilevel_without_constraints(cost_model):
+    """Check that BiLevel is viable without constraints."""
+    assert cost_model.estimate("BiLevel", DESIGN_VARIABLES, ())[VIABLE]
+
+
+def test_disciplinary_opt_without_strong_couplings():
+    """Check that DisciplinaryOpt is viable without strong couplings."""
+    cost_model = FormulationCostModel(
+        CouplingGraph((("A", ("x",), ("a",)), ("B", ("a",), ("b",))))
+    )
+    assert cost_model.n_strongly_coupled == 0
+    assert cost_model.estimate("DisciplinaryOpt", ("x",), ())[VIABLE]
+
+
+def test_get_costs(cost_model):
+    """Check that the viable MDO formulations are sorted first by cost."""
+    costs = cost_model.get_costs(DESIGN_VARIABLES, CONSTRAINT_TYPES)
+    assert costs[FORMULATION].tolist() == ["MDF", "DisciplinaryOpt", "IDF", "BiLevel"]
+    assert sorted(costs[FORMULATION]) == sorted(FORMULATIONS)
+
+
+def test_get_costs_without_formulations(cost_model):
+    """Check the costs without MDO formulations."""
+    assert cost_model.get_costs(
+        DESIGN_VARIABLES, CONSTRAINT_TYPES, formulations=()
+    ).empty
+
+
+def test_unsupported_formulation(cost_model):
+    """Check that an unsupported MDO formulation raises an error."""
+    with pytest.raises(
+        ValueError, match=r"The cost model does not support the MDO formulation Foo\."
+    ):
+        cost_model.estimate("Foo", DESIGN_VARIABLES, CONSTRAINT_TYPES)
@@ -0,0 +1,122 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the pool of worker processes."""
+
+from __future__ import annotations
+
+import operator
+import time
+
+import pytest
+from gemseo_web_study.jobs import Job
+from gemseo_web_study.jobs import JobPool
+
+TIMEOUT = 60
+"""The maximum time to wait for a job, in seconds."""
+
+
+def test_job_from_result():
+    """Check a job created from a result."""
+    job = Job.from_result("key", 1)
+    assert job.status == Job.DONE
+    assert job.future.result() == 1
+    assert not job.elapsed_time
+
+
+def test_job_from_error():
+    """Check a job created from an error."""
+    job = Job.from_error("key", RuntimeError("foo"))
+    assert job.status == Job.DONE
+    with pytest.raises(RuntimeError, match="foo"):
+        job.future.result()
+
+
+def test_submit():
+    """Check the submission of jobs with the same key and different keys."""
+    pool = JobPool(1, max_queued_jobs=1)
+    results = []
+    running_job = pool.submit("sleep", time.sleep, 1, callback=results.append)
+    assert pool.submit("sleep", time.sleep, 2) is running_job
+    assert running_job.n_submissions == 2
+    assert running_job.status == Job.RUNNING
+    assert pool.n_running_jobs == 1
+
+    queued_job = pool.submit("add", operator.add, 1, 2)
+    assert queued_job.status == Job.QUEUED
+    assert pool.get_position(queued_job) == 1
+    assert pool.get_position(running_job) == 0
+    with pytest.raises(
+        RuntimeError,
+        match=r"The server is busy with 1 queued jobs, please retry later\.",
+    ):
+        pool.submit("sub", operator.sub, 1, 2)
+
+    assert queued_job.future.result(TIMEOUT) == 3
+    assert running_job.future.result(TIMEOUT) is None
+    assert results == [None]
+    assert pool.n_queued_jobs == pool.n_running_jobs == 0
+
+
+def test_cancel():
+    """Check that a queued job is cancelled when all its submissions are."""
+    pool = JobPool(1)
+    running_job = pool.submit("sleep", time.sleep, 1)
+    queued_job = pool.submit("add", operator.add, 1, 2)
+    assert pool.submit("add", operator.add, 1, 2) is queued_job
+    assert not pool.cancel(queued_job)
+    assert pool.n_queued_jobs == 1
+    assert pool.cancel(queued_job)
+    assert pool.n_queued_jobs == 0
+    assert queued_job.future.cancelled()
+    assert not pool.cancel(running_job)
+    running_job.future.result(TIMEOUT)
+
+
+def test_session_jobs():
+    """Check that a session cannot run more than its maximum number of jobs."""
+    pool = JobPool(2, max_session_jobs=1)
+    first_job = pool.submit("sleep", time.sleep, 1, owner="a")
+    second_job = pool.submit("add", operator.add, 1, 2, owner="a")
+    third_job = pool.submit("sub", operator.sub, 1, 2, owner="b")
+    assert first_job.status == Job.RUNNING
+    assert second_job.status == Job.QUEUED
+    assert third_job.future.result(TIMEOUT) == -1
+    assert second_job.future.result(TIMEOUT) == 3
+
+
+def test_error():
+    """Check that the error of a job fails the job and frees its worker."""
+    pool = JobPool(1)
+    job = pool.submit("truediv", operator.truediv, 1, 0)
+    with pytest.raises(ZeroDivisionError):
+        job.future.result(TIMEOUT)
+
+    assert pool.submit("add", operator.add, 1, 2).future.result(TIMEOUT) == 3
+
+
+def test_callback_error():
+    """Check that the error of a callback fails the job and frees its worker."""
+
+    def callback(result):
+        msg = "foo"
+        raise ValueError(msg)
+
+    pool = JobPool(1)
+    job = pool.submit("add", operator.add, 1, 2, callback=callback)
+    with pytest.raises(ValueError, match="foo"):
+        job.future.result(TIMEOUT)
+
+    assert pool.n_running_jobs == 0
+    assert pool.submit("add", operator.add, 1, 2).future.result(TIMEOUT) == 3
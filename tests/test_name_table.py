@@ -0,0 +1,110 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the tables and indices of names."""
+
+from __future__ import annotations
+
+import pytest
+from gemseo_web_study.name_table import DisciplinesTable
+from gemseo_web_study.name_table import NameIndex
+from gemseo_web_study.name_table import NameTable
+
+NAMES = ("g_1", "g_10", "g_2", "h", "x_g", "g_1")
+
+
+@pytest.fixture(scope="module")
+def name_index() -> NameIndex:
+    """An index of names."""
+    return NameIndex(NAMES)
+
+
+def test_name_table():
+    """Check that the names are stored once with consecutive identifiers."""
+    table = NameTable(("a", "b"))
+    assert table.intern("c") == 2
+    assert table.intern("a") == 0
+    assert table.intern_all(("d", "b", "d")) == [3, 1, 3]
+    assert table.names == ["a", "b", "c", "d"]
+    assert len(table) == 4
+    assert "d" in table
+    assert table.get_id("c") == 2
+    assert table.get_names([3, 0]) == ["d", "a"]
+    with pytest.raises(KeyError, match=r"e is not in the table\."):
+        table.get_id("e")
+
+
+def test_name_index(name_index):
+    """Check that the names are sorted without duplicates."""
+    assert name_index.names == ["g_1", "g_10", "g_2", "h", "x_g"]
+    assert len(name_index) == 5
+    assert "h" in name_index
+    assert name_index.get_position("g_2") == 2
+    assert name_index.get_position("y") is None
+
+
+@pytest.mark.parametrize(
+    ("pattern", "mode", "expected"),
+    [
+        ("", NameIndex.PREFIX, ["g_1", "g_10", "g_2", "h", "x_g"]),
+        ("g_1", NameIndex.PREFIX, ["g_1", "g_10"]),
+        ("g_", NameIndex.PREFIX, ["g_1", "g_10", "g_2"]),
+        ("z", NameIndex.PREFIX, []),
+        ("_g", NameIndex.SUBSTRING, ["x_g"]),
+        ("g", NameIndex.SUBSTRING, ["g_1", "g_10", "g_2", "x_g"]),
+        ("g_?", NameIndex.GLOB, ["g_1", "g_2"]),
+        ("g_*", NameIndex.GLOB, ["g_1", "g_10", "g_2"]),
+        ("*g", NameIndex.GLOB, ["x_g"]),
+        ("G_*", NameIndex.GLOB, []),
+    ],
+)
+def test_search(name_index, pattern, mode, expected):
+    """Check the search of the names matching a pattern."""
+    assert name_index.search(pattern, mode) == expected
+
+
+def test_get_page(name_index):
+    """Check the pages of the names matching a pattern."""
+    assert name_index.get_page("g", NameIndex.SUBSTRING, 1, 3) == (
+        ["g_1", "g_10", "g_2"],
+        4,
+    )
+    assert name_index.get_page("g", NameIndex.SUBSTRING, 2, 3) == (["x_g"], 4)
+    assert name_index.get_page("g", NameIndex.SUBSTRING, 3, 3) == ([], 4)
+
+
+def test_invalid_mode(name_index):
+    """Check that an invalid search mode raises an error."""
+    with pytest.raises(ValueError, match="The search mode 'regex' is not one of"):
+        name_index.search("g", "regex")
+
+
+def test_disciplines_table():
+    """Check the input and output names of the disciplines."""
+    table = DisciplinesTable((
+        ("A", ("x", "b"), ("a",)),
+        ("B", (), ("b", "c")),
+        ("C", ("a", "x"), ()),
+    ))
+    assert table.n_disciplines == 3
+    assert table.discipline_names == ["A", "B", "C"]
+    assert table.get_input_names(0) == ["x", "b"]
+    assert table.get_input_names(1) == []
+    assert table.get_input_names(2) == ["a", "x"]
+    assert table.get_output_names(1) == ["b", "c"]
+    assert table.get_output_names(2) == []
+    assert len(table.names) == 4
+    assert table.input_index.names == ["a", "b", "x"]
+    assert table.output_index.names == ["a", "b", "c"]
+    assert table.nbytes > 0
@@ -0,0 +1,139 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the order of the disciplines minimizing the feedback couplings."""
+
+from __future__ import annotations
+
+from itertools import permutations
+from random import Random
+
+import pytest
+from gemseo_web_study.coupling_graph import CouplingGraph
+from gemseo_web_study.ordering import EXACT
+from gemseo_web_study.ordering import HEURISTIC
+from gemseo_web_study.ordering import MAX_EXACT_SIZE
+from gemseo_web_study.ordering import FeedbackOrdering
+from numpy import array
+
+
+def create_random_disc_desc(n_disciplines, n_couplings, seed):
+    """Create the descriptions of disciplines with random couplings.
+
+    Args:
+        n_disciplines: The number of disciplines.
+        n_couplings: The number of coupling inputs per discipline.
+        seed: The seed of the random number generator.
+
+    Returns:
+        The descriptions of the disciplines.
+    """
+    generator = Random(seed)
+    return tuple(
+        (
+            f"D{i}",
+            tuple(f"y{generator.randrange(n_disciplines)}" for _ in range(n_couplings)),
+            (f"y{i}",),
+        )
+        for i in range(n_disciplines)
+    )
+
+
+def get_edges(coupling_graph):
+    """Return the couplings between different disciplines.
+
+    Args:
+        coupling_graph: The coupling graph.
+
+    Returns:
+        The producers and the consumers of the couplings.
+    """
+    adjacency = coupling_graph.adjacency.tocoo()
+    is_edge = adjacency.row != adjacency.col
+    return adjacency.row[is_edge], adjacency.col[is_edge]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_exact_ordering(seed):
+    """Check that the order minimizes the feedback couplings for small graphs."""
+    coupling_graph = CouplingGraph(create_random_disc_desc(7, 2, seed))
+    producers, consumers = get_edges(coupling_graph)
+    ordering = FeedbackOrdering(coupling_graph)
+    assert sorted(ordering.order.tolist()) == list(range(7))
+    assert ordering.feedbacks == FeedbackOrdering.count_feedbacks(
+        producers, consumers, ordering.order
+    )
+    assert ordering.feedbacks == min(
+        FeedbackOrdering.count_feedbacks(producers, consumers, array(order))
+        for order in permutations(range(7))
+    )
+
+
+def test_heuristic_ordering():
+    """Check the order of a group too large to be ordered exactly."""
+    n_disciplines = MAX_EXACT_SIZE + 4
+    disc_desc = tuple(
+        (
+            f"D{i}",
+            (f"y{(i - 1) % n_disciplines}", f"y{(i + 7) % n_disciplines}"),
+            (f"y{i}",),
+        )
+        for i in range(n_disciplines)
+    )
+    ordering = FeedbackOrdering(CouplingGraph(disc_desc))
+    assert sorted(ordering.order.tolist()) == list(range(n_disciplines))
+    assert ordering.feedbacks <= ordering.initial_feedbacks
+    groups = ordering.get_groups()
+    assert groups["Method"].tolist() == [HEURISTIC]
+    assert groups["Disciplines"].tolist() == [n_disciplines]
+
+
+def test_acyclic_ordering():
+    """Check that the disciplines of an acyclic graph are ordered without feedback."""
+    disc_desc = (
+        ("C", ("b",), ("c",)),
+        ("B", ("a",), ("b",)),
+        ("A", ("x",), ("a",)),
+    )
+    ordering = FeedbackOrdering(CouplingGraph(disc_desc))
+    assert ordering.initial_feedbacks == 2
+    assert ordering.feedbacks == 0
+    assert [desc[0] for desc in ordering.get_disc_desc(disc_desc)] == ["A", "B", "C"]
+    assert ordering.get_groups().empty
+
+
+def test_get_groups():
+    """Check the numbers of feedback couplings of the groups."""
+    disc_desc = (
+        ("B", ("a",), ("b",)),
+        ("A", ("b", "x"), ("a",)),
+        ("C", ("a",), ("c",)),
+    )
+    groups = FeedbackOrdering(CouplingGraph(disc_desc)).get_groups()
+    assert groups.to_dict("records") == [
+        {
+            "Group": 1,
+            "Disciplines": 2,
+            "Initial feedbacks": 1,
+            "Optimized feedbacks": 1,
+            "Method": EXACT,
+        }
+    ]
+
+
+def test_empty():
+    """Check the order of no discipline."""
+    ordering = FeedbackOrdering(CouplingGraph(()))
+    assert ordering.order.tolist() == []
+    assert ordering.feedbacks == ordering.initial_feedbacks == 0
@@ -0,0 +1,80 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the schedule of the execution of the disciplines."""
+
+from __future__ import annotations
+
+import pytest
+from gemseo_web_study.coupling_graph import CouplingGraph
+from gemseo_web_study.schedule import ExecutionSchedule
+
+CHAIN = (("A", ("x",), ("a",)), ("B", ("a",), ("b",)), ("C", ("b",), ("c",)))
+
+INDEPENDENT = tuple((f"D{i}", (f"x{i}",), (f"y{i}",)) for i in range(4))
+
+
+def test_chain():
+    """Check that a chain of disciplines cannot be executed concurrently."""
+    schedule = ExecutionSchedule(CouplingGraph(CHAIN))
+    assert schedule.n_tasks == 3
+    assert schedule.max_concurrency == 1
+    assert schedule.total_cost == schedule.critical_path_cost == 3
+    assert [schedule.get_task_name(task) for task in schedule.critical_path] == [
+        "A",
+        "B",
+        "C",
+    ]
+    assert schedule.get_speedup(4) == schedule.max_speedup == 1
+
+
+@pytest.mark.parametrize(("n_workers", "makespan"), [(1, 4), (2, 2), (3, 2), (8, 1)])
+def test_independent(n_workers, makespan):
+    """Check the execution of independent disciplines on parallel workers."""
+    schedule = ExecutionSchedule(CouplingGraph(INDEPENDENT))
+    assert schedule.levels == [[0, 1, 2, 3]]
+    assert schedule.get_makespan(n_workers) == makespan
+    assert schedule.get_speedup(n_workers) == 4 / makespan
+
+
+def test_group():
+    """Check that a group of strongly coupled disciplines is a single task."""
+    disc_desc = (
+        ("A", ("x", "b"), ("a",)),
+        ("B", ("a",), ("b",)),
+        ("C", ("a",), ("c",)),
+        ("D", ("x",), ("d",)),
+    )
+    schedule = ExecutionSchedule(CouplingGraph(disc_desc), {"B": 3.0, "D": 0.0})
+    names = {schedule.get_task_name(task) for task in range(schedule.n_tasks)}
+    assert names == {"Group 1", "C", "D"}
+    assert schedule.total_cost == 5
+    assert schedule.critical_path_cost == 5
+    assert schedule.max_speedup == 1
+    assert schedule.max_concurrency == 2
+
+
+def test_negative_cost():
+    """Check that a negative cost raises an error."""
+    with pytest.raises(
+        ValueError, match=r"The costs of the disciplines must be non-negative\."
+    ):
+        ExecutionSchedule(CouplingGraph(CHAIN), {"A": -1.0})
+
+
+def test_no_worker():
+    """Check that a number of workers lower than 1 raises an error."""
+    schedule = ExecutionSchedule(CouplingGraph(CHAIN))
+    with pytest.raises(ValueError, match="The number of workers must be positive"):
+        schedule.get_makespan(0)
@@ -0,0 +1,127 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the study."""
+
+from __future__ import annotations
+
+import pytest
+from gemseo_web_study import Study
+from gemseo_web_study.coupling_graph import CouplingGraph
+from gemseo_web_study.study import MAX_INCREMENTAL_UPDATES
+from numpy import array_equal
+
+from tests.benchmarks.studies import create_disc_desc
+
+DISC_DESC = (("A", ("x", "b"), ("a",)), ("B", ("a",), ("b", "f", "g")))
+
+
+def test_default_inputs():
+    """Check that the missing primary data are set to their default values."""
+    study = Study(disc_desc=DISC_DESC)
+    assert study.inputs["formulation"] == "MDF"
+    assert study.inputs["objective"] == ""
+    assert study.inputs["disc_desc"] == DISC_DESC
+
+
+def test_get():
+    """Check that a stage is computed once, with the stages it depends on."""
+    study = Study(disc_desc=DISC_DESC)
+    assert study.is_dirty("all_ios")
+    assert study.get("all_ios") == (["a", "b", "x"], ["a", "b", "f", "g"])
+    study.get("all_ios")
+    assert study.evaluations["all_ios"] == 1
+    assert study.evaluations["disciplines_table"] == 1
+    assert not study.is_dirty("all_ios")
+    assert study.is_dirty("coupling_graph")
+
+
+def test_update():
+    """Check that an update invalidates only the stages depending on the data."""
+    study = Study(disc_desc=DISC_DESC, objective="f", design_variables=["x"])
+    study.get("scenario_key")
+    study.get("coupling_graph")
+    invalidated = study.update(objective="g")
+    assert {"scenario_key", "xdsm_html", "scenario"} <= invalidated
+    assert "coupling_graph" not in invalidated
+    assert study.is_dirty("scenario_key")
+    assert not study.is_dirty("coupling_graph")
+    assert study.get("scenario_key")[2] == "g"
+
+
+def test_update_disc_desc():
+    """Check that a change of the disciplines invalidates the stages using them."""
+    study = Study(disc_desc=DISC_DESC)
+    invalidated = study.update(disc_desc=(*DISC_DESC, ("C", ("f",), ("h",))))
+    assert {"hash", "coupling_graph", "disciplines", "n2_html"} <= invalidated
+    assert "formulation" not in invalidated
+
+
+def test_update_same_value():
+    """Check that an update with equal values invalidates nothing."""
+    study = Study(disc_desc=DISC_DESC, constraints={"g": "inequality"})
+    study.get("hash")
+    assert not study.update(
+        disc_desc=[
+            [name, list(inputs), list(outputs)] for name, inputs, outputs in DISC_DESC
+        ],
+        constraints=[["g", "inequality"]],
+    )
+    assert not study.is_dirty("hash")
+
+
+def test_update_unknown_data():
+    """Check that updating data that are not primary data raises an error."""
+    with pytest.raises(KeyError, match=r"foo is not a primary data of the study\."):
+        Study().update(foo=1)
+
+
+@pytest.mark.parametrize("n_changes", [1, 3, MAX_INCREMENTAL_UPDATES + 1])
+def test_coupling_graph_update(n_changes):
+    """Check that the updated coupling graph is the graph of the new disciplines."""
+    disc_desc = list(create_disc_desc(40, 4))
+    study = Study(disc_desc=disc_desc)
+    study.get("coupling_graph")
+    for index in range(n_changes):
+        name, input_names, _ = disc_desc[index]
+        disc_desc[index] = (name, (*input_names, "y_39"), (f"z_{index}",))
+
+    study.update(disc_desc=disc_desc)
+    coupling_graph = study.get("coupling_graph")
+    expected = CouplingGraph(disc_desc)
+    assert coupling_graph.all_couplings == expected.all_couplings
+    assert coupling_graph.strong_couplings == expected.strong_couplings
+    assert array_equal(coupling_graph.group_indices, expected.group_indices)
+    assert (coupling_graph.adjacency != expected.adjacency).nnz == 0
+
+
+def test_coupling_graph_changes():
+    """Check the couplings added and removed by the last edit of the disciplines."""
+    study = Study(disc_desc=DISC_DESC)
+    study.get("coupling_graph")
+    study.update(disc_desc=(DISC_DESC[0], ("B", ("x",), ("b", "f", "g"))))
+    coupling_graph = study.get("coupling_graph")
+    assert coupling_graph.added_couplings == []
+    assert coupling_graph.removed_couplings == [("A", "B", "a")]
+
+
+def test_disciplines_reuse():
+    """Check that the disciplines whose descriptions did not change are reused."""
+    study = Study(disc_desc=DISC_DESC)
+    discipline_a, discipline_b = study.get("disciplines")
+    study.update(disc_desc=(DISC_DESC[0], ("B", ("a", "x"), ("b", "f", "g"))))
+    disciplines = study.get("disciplines")
+    assert disciplines[0] is discipline_a
+    assert disciplines[1] is not discipline_b
+    assert disciplines[1].name == "B"
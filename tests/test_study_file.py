@@ -0,0 +1,151 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the study files."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from io import BytesIO
+
+import pytest
+from gemseo_web_study import Study
+from gemseo_web_study.study_file import FORMAT_NAME
+from gemseo_web_study.study_file import FORMAT_VERSION
+from gemseo_web_study.study_file import dump_study
+from gemseo_web_study.study_file import read_study
+from gemseo_web_study.study_file import study_from_dict
+from gemseo_web_study.study_file import study_to_dict
+
+DISC_DESC = (("A", ("x", "b"), ("a",)), ("B", ("a",), ("b", "f", "g")))
+
+
+@pytest.fixture
+def study():
+    """A study with all its primary data."""
+    return Study(
+        disc_desc=DISC_DESC,
+        design_variables=["x"],
+        formulation="IDF",
+        objective="f",
+        maximize_objective=True,
+        constraints=[("g", "inequality"), ("b", "equality")],
+        discipline_costs={"B": 2.5},
+    )
+
+
+def test_study_to_dict(study):
+    """Check that the names are stored once and referred to by their positions."""
+    data = study_to_dict(study)
+    assert data["format"] == FORMAT_NAME
+    assert data["version"] == FORMAT_VERSION
+    assert len(data["names"]) == len(set(data["names"]))
+    names = data["names"]
+    assert [names[position] for position in data["design_variables"]] == ["x"]
+    assert names[data["objective"]] == "f"
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(tmp_path, study, compress):
+    """Check that a study read from a study file has the primary data written."""
+    content = dump_study(study, compress=compress)
+    assert content.startswith(b"\x1f\x8b") is compress
+    file_path = tmp_path / "study.json"
+    file_path.write_bytes(content)
+    assert read_study(file_path).inputs == study.inputs
+    assert read_study(BytesIO(content)).inputs == study.inputs
+
+
+def test_round_trip_without_objective():
+    """Check that a study without objective is written with a null objective."""
+    data = json.loads(dump_study(Study(disc_desc=DISC_DESC)))
+    assert data["objective"] is None
+    assert study_from_dict(data).inputs["objective"] == ""
+
+
+def test_legacy_study_file():
+    """Check that a legacy study file can be read."""
+    study = study_from_dict({
+        "#disc_desc": [["A", ["x", "b"], ["a"]], ["B", ["a"], ["b", "f", "g"]]],
+        "#Design variables": ["x"],
+        "#mdo formulation": "IDF",
+        "#maximize_objective": True,
+        "#constraints": {"g": "inequality"},
+        "#objective_index": 2,
+        "#all_outputs": ["a", "b", "f", "g"],
+    })
+    assert study.inputs["disc_desc"] == DISC_DESC
+    assert study.inputs["design_variables"] == ("x",)
+    assert study.inputs["formulation"] == "IDF"
+    assert study.inputs["maximize_objective"]
+    assert study.inputs["constraints"] == (("g", "inequality"),)
+    assert study.inputs["objective"] == "f"
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        ([], "A study file must contain a JSON object."),
+        ({"format": "foo"}, "The format 'foo' is not the format of a study file."),
+        ({"format": FORMAT_NAME}, "The version None of the study file"),
+        ({"format": FORMAT_NAME, "version": 1}, "The version 1 of the study file"),
+        (
+            {"format": FORMAT_NAME, "version": 2, "names": [1]},
+            "The names of a study file must be a list of strings.",
+        ),
+        (
+            {"format": FORMAT_NAME, "version": 2, "disciplines": [[0, [], []]]},
+            "The disciplines of the study file refer to an unknown name.",
+        ),
+        (
+            {"format": FORMAT_NAME, "version": 2, "names": ["A"], "disciplines": [0]},
+            "The disciplines of the study file are malformed.",
+        ),
+        (
+            {
+                "format": FORMAT_NAME,
+                "version": 2,
+                "names": ["g"],
+                "constraints": [[0, "foo"]],
+            },
+            "The constraint type 'foo' is not supported.",
+        ),
+        (
+            {
+                "format": FORMAT_NAME,
+                "version": 2,
+                "names": ["A"],
+                "discipline_costs": [[0, -1]],
+            },
+            "The discipline cost -1 is not a non-negative number.",
+        ),
+        ({"#disc_desc": [[1, 2, 3]]}, "The disciplines of the legacy study file"),
+        ({"#Design variables": "x"}, "The design variables of the legacy study file"),
+        ({"#mdo formulation": 1}, "The MDO formulation of the legacy study file"),
+        ({"#maximize_objective": "no"}, "The objective sense of the legacy study"),
+        ({"#constraints": {"g": "foo"}}, "The constraints of the legacy study file"),
+        ({"#objective_index": "0"}, "The objective of the legacy study file"),
+    ],
+)
+def test_invalid_study_file(data, message):
+    """Check that an invalid study file raises a ValueError."""
+    with pytest.raises(ValueError, match=message):
+        study_from_dict(data)
+
+
+def test_read_invalid_json():
+    """Check that reading a file which is not a JSON document raises a ValueError."""
+    with pytest.raises(ValueError):
+        read_study(BytesIO(gzip.compress(b"{")))
@@ -0,0 +1,108 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests of the state of the web interface for a study."""
+
+from __future__ import annotations
+
+import pytest
+from gemseo_web_study import Study
+from gemseo_web_study import StudyState
+
+DISC_DESC = (("A", ("x", "b"), ("a",)), ("B", ("a",), ("b", "f", "g")))
+
+
+def test_default_state():
+    """Check the default fields of the state of an empty study."""
+    state = StudyState()
+    assert state.study.inputs == Study.INPUTS
+    assert state.disc_table == ()
+    assert state.constraint_rows == ()
+    assert state.disciplines_editor == "Form"
+    assert state.disciplines_page == 1
+
+
+def test_state_from_study():
+    """Check that the edited data are initialized from the study."""
+    study = Study(disc_desc=DISC_DESC, constraints=[("g", "inequality")])
+    state = StudyState(study)
+    assert state.study is study
+    assert state.disc_table == DISC_DESC
+    assert state.constraint_rows == (("g", "inequality"),)
+
+
+def test_update():
+    """Check that only the changed fields and primary data are returned."""
+    state = StudyState(Study(disc_desc=DISC_DESC))
+    assert state.update(disciplines_page=2, formulation="IDF", objective="f") == {
+        "disciplines_page",
+        "formulation",
+        "objective",
+    }
+    assert state.disciplines_page == 2
+    assert state.study.inputs["formulation"] == "IDF"
+    assert state.update(disciplines_page=2, formulation="IDF") == set()
+
+
+def test_update_disc_table():
+    """Check that only the disciplines with inputs and outputs are in the study."""
+    state = StudyState()
+    disc_table = [["A", ["x", "b"], ["a"]], ["B", [], ["b"]], ["C", ["a"], []]]
+    assert state.update(disc_table=disc_table) == {"disc_table", "disc_desc"}
+    assert state.disc_table == (
+        ("A", ("x", "b"), ("a",)),
+        ("B", (), ("b",)),
+        ("C", ("a",), ()),
+    )
+    assert state.study.inputs["disc_desc"] == (("A", ("x", "b"), ("a",)),)
+
+    # Editing a discipline which is not part of the study leaves the study unchanged.
+    disc_table[1] = ["B", [], ["b", "c"]]
+    assert state.update(disc_table=disc_table) == {"disc_table"}
+
+    # The nested lists of the widgets are equal to the tuples of the state.
+    assert state.update(disc_table=disc_table) == set()
+
+
+def test_update_constraint_rows():
+    """Check that only the selected constraints are in the study."""
+    state = StudyState(Study(disc_desc=DISC_DESC))
+    rows = [["g", "inequality"], [None, "equality"], ["f", "equality"]]
+    assert state.update(constraint_rows=rows) == {"constraint_rows", "constraints"}
+    assert state.constraint_rows == (
+        ("g", "inequality"),
+        ("", "equality"),
+        ("f", "equality"),
+    )
+    assert state.study.inputs["constraints"] == (
+        ("g", "inequality"),
+        ("f", "equality"),
+    )
+
+    # Selecting the name of a constraint again keeps its last type.
+    rows[1] = ["g", "equality"]
+    state.update(constraint_rows=rows)
+    assert state.study.inputs["constraints"] == (
+        ("g", "equality"),
+        ("f", "equality"),
+    )
+
+
+@pytest.mark.parametrize("name", ["foo", "disc_desc", "constraints"])
+def test_update_unknown_field(name):
+    """Check that a name which cannot be updated raises an error."""
+    with pytest.raises(
+        KeyError, match=f"{name} is neither a field of the state nor a primary data"
+    ):
+        StudyState().update(**{name: ()})